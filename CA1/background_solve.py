@@ -0,0 +1,159 @@
+from solve import load_game
+from core.environment.packed_game import PackedGame
+from core.solvers.replay import Replay
+from core.solvers.search_stats import SearchStats
+import multiprocessing
+import signal
+import sys
+import threading
+import time
+import traceback
+from config import SOLVERS, TIME_LIMITS
+
+"""
+    Runs a solver in a separate process so the window that waits for it keeps handling events and drawing.
+    The worker streams its search counters a few times per second and every solution an anytime solver
+    (ARA*) improves on, so playback can start before the search ends.
+"""
+
+PROGRESS_INTERVAL = 0.2  # seconds between two progress messages
+CANCEL_GRACE_PERIOD = 2  # seconds a cancelled worker gets to stop its own child processes
+
+
+"""
+    Body of the worker process. Messages sent through 'connection':
+        ("game", PackedGame)                    the loaded map, sent once before the search starts
+        ("progress", {"expanded", "generated", "frontier", "peak_frontier", "visited", "elapsed"})
+        ("solution", path)                      a solution found before the search ends
+        ("done", path or None, stats dict, elapsed seconds)
+        ("error", traceback text)
+"""
+def solve_worker(connection, file_path, solver_mode, timeout, options):
+    """ terminate() raises SystemExit here, so solvers with worker processes (HDA*) get to stop them """
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    lock = threading.Lock()
+
+    def send(message):
+        with lock:
+            connection.send(message)
+
+    stats = SearchStats(solver_mode)
+    stats.on_solution = lambda path: send(("solution", list(path)))
+    finished = threading.Event()
+
+    def report_progress():
+        while not finished.wait(PROGRESS_INTERVAL):
+            send(("progress", {"expanded": stats.nodes_expanded, "generated": stats.nodes_generated,
+                               "frontier": stats.frontier, "peak_frontier": stats.peak_frontier,
+                               "visited": stats.peak_visited, "elapsed": stats.elapsed}))
+
+    threading.Thread(target=report_progress, daemon=True).start()
+    try:
+        game = load_game(file_path)
+        send(("game", PackedGame(game)))
+        t1 = time.time()
+        history = SOLVERS[solver_mode](game, timeout=timeout, stats=stats, **options)
+        elapsed = time.time() - t1
+        finished.set()
+        send(("done", None if history is None else list(history.path), stats.as_dict(), elapsed))
+    except Exception:
+        finished.set()
+        send(("error", traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+class BackgroundSolve:
+    def __init__(self, file_path, solver_mode, timeout=None, **options):
+        """
+        A solver run in a worker process. Call start(), then poll() once per frame; it never blocks.
+
+        After poll(), 'progress' holds the latest counters, 'replay' the best solution received so far as
+        a Replay (None until one arrives) and 'version' counts the solutions received, so the caller can
+        tell when to switch to a better one. 'game' is the map's PackedGame, built and sent by the worker
+        (None until it arrives; solutions always come after it). 'done' is set when the worker finished;
+        'stats' then holds the final SearchStats.as_dict() and 'error' a traceback if the solver raised.
+
+        Args:
+            file_path (str): Path of the map file.
+            solver_mode (str): A key of config.SOLVERS.
+            timeout (int, optional): Time limit in seconds. Defaults to TIME_LIMITS[solver_mode].
+            **options: Extra keyword arguments for the solver.
+        """
+        self.file_path = file_path
+        self.solver_mode = solver_mode
+        self.timeout = timeout or TIME_LIMITS[solver_mode]
+        self.options = options
+        """ Sent by the worker: loading a map can build its DistanceTable, which would freeze the window here """
+        self.game = None
+
+        self.process = None
+        self.connection = None
+        self.start_time = None
+        self.progress = {"expanded": 0, "generated": 0, "frontier": 0, "peak_frontier": 0, "visited": 0,
+                         "elapsed": 0.0}
+        self.replay = None
+        self.version = 0
+        self.done = False
+        self.stats = None
+        self.elapsed = None
+        self.error = None
+
+    def start(self):
+        """ Not a daemon: daemonic processes can't start the worker processes of HDA* """
+        self.connection, child_connection = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(target=solve_worker, args=(
+            child_connection, self.file_path, self.solver_mode, self.timeout, self.options))
+        self.process.start()
+        child_connection.close()
+        self.start_time = time.time()
+        return self
+
+    """ Seconds since start(), as seen by the caller """
+    @property
+    def wall_time(self):
+        return 0.0 if self.start_time is None else time.time() - self.start_time
+
+    def set_solution(self, path):
+        self.replay = Replay(self.game, path)
+        self.version += 1
+
+    """
+        Reads every message that arrived since the last call. Returns True when something changed.
+    """
+    def poll(self):
+        changed = False
+        while not self.done and self.connection.poll():
+            try:
+                message = self.connection.recv()
+            except EOFError:
+                self.done = True
+                self.error = f"The solver process exited unexpectedly (exit code {self.process.exitcode})."
+                break
+            changed = True
+            if message[0] == "game":
+                self.game = message[1]
+            elif message[0] == "progress":
+                self.progress = message[1]
+            elif message[0] == "solution":
+                self.set_solution(message[1])
+            elif message[0] == "done":
+                _, path, self.stats, self.elapsed = message
+                if path is not None and (self.replay is None or len("".join(path)) < len(self.replay.moves)):
+                    self.set_solution(path)
+                self.done = True
+            elif message[0] == "error":
+                self.error = message[1]
+                self.done = True
+        if self.done:
+            self.process.join()
+        return changed
+
+    def cancel(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(CANCEL_GRACE_PERIOD)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        self.done = True
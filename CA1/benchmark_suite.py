@@ -0,0 +1,195 @@
+from core.environment.map_generator import generate_map, write_map, MAX_MAP_SIZE
+from solve import solve
+from tester import run_benchmark, write_results, classify_result, BENCHMARK_OUTPUT_DIR
+import argparse
+import contextlib
+import csv
+import os
+import statistics
+from tabulate import tabulate
+from config import SOLVER_MODES
+
+SUITE_OUTPUT_DIR = os.path.join(BENCHMARK_OUTPUT_DIR, "scaling")
+SUITE_TIME_LIMIT = 30
+
+""" Every sweep changes one parameter of BASE_PARAMS and keeps the others """
+BASE_PARAMS = {"size": 20, "wall_density": 0.2, "a_snacks": 3, "b_snacks": 2, "ghosts": 2}
+SWEEPS = {
+    "size": [10, 20, 40, 80, 160, MAX_MAP_SIZE],
+    "wall_density": [0.0, 0.1, 0.2, 0.3, 0.4],
+    "a_snacks": [1, 2, 4, 6, 8],
+    "b_snacks": [0, 2, 4, 6],
+    "ghosts": [0, 2, 4, 8, 16],
+}
+""" Small crowded maps of the --check-macros run: (height, width, wall density, ghosts), with 2 A and 1 B snacks """
+MACRO_CHECK_MAPS = [(7, 9, 0.35, 2), (8, 8, 0.3, 3)]
+MACRO_CHECK_SOLVERS = ["A*", "IDA*", "IDS"]
+CURVE_METRICS = [("time", "Time (s)"), ("nodes_expanded", "Nodes expanded"), ("peak_rss_mb", "Peak RSS (MB)")]
+
+
+"""
+    Writes one map per (sweep, value, seed) to 'output_dir' and returns [(sweep, value, seed, path), ...].
+    Square maps of 'size' x 'size'; ghosts are split between horizontal and vertical ones.
+"""
+def generate_suite(output_dir, sweeps=SWEEPS, base_params=BASE_PARAMS, seeds=(0,)):
+    maps = []
+    for sweep, values in sweeps.items():
+        for value in values:
+            params = {**base_params, sweep: value}
+            for seed in seeds:
+                rows = generate_map(params["size"], params["size"], params["wall_density"], params["a_snacks"],
+                                    params["b_snacks"], (params["ghosts"] + 1) // 2, params["ghosts"] // 2, seed)
+                path = os.path.join(output_dir, f"{sweep}_{value}_seed{seed}.txt")
+                write_map(path, rows)
+                maps.append((sweep, value, seed, path))
+    return maps
+
+
+"""
+    Groups benchmark results into one point per (sweep, value, algorithm), with the medians over seeds of
+    time, expansions and peak memory. Unsolved runs count with what they used until they stopped.
+"""
+def scaling_curves(maps, results):
+    sweep_of = {path: (sweep, value) for sweep, value, _, path in maps}
+    groups = {}
+    for job in results:
+        sweep, value = sweep_of[job["map"]]
+        groups.setdefault((sweep, value, job["algorithm"]), []).append(job)
+
+    points = []
+    for (sweep, value, algorithm), jobs in groups.items():
+        point = {"sweep": sweep, "value": value, "algorithm": algorithm, "runs": len(jobs),
+                 "solved": sum(job["result"] == "Success" for job in jobs)}
+        metrics = {
+            "time": [job["time"] for job in jobs],
+            "nodes_expanded": [job["stats"]["nodes_expanded"] for job in jobs if job.get("stats")],
+            "peak_rss_mb": [job["peak_rss_mb"] for job in jobs if job["peak_rss_mb"] is not None],
+        }
+        for name, values in metrics.items():
+            point[name] = statistics.median(values) if values else None
+        points.append(point)
+    return points
+
+
+def write_curves(points, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "scaling.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["sweep", "value", "algorithm", "runs", "solved"]
+                                              + [name for name, _ in CURVE_METRICS])
+        writer.writeheader()
+        writer.writerows(points)
+    print(f"Scaling curves written to {output_dir}/scaling.csv")
+
+
+def print_curves(points):
+    for sweep in dict.fromkeys(point["sweep"] for point in points):
+        rows = [[point["value"], point["algorithm"], f"{point['solved']}/{point['runs']}", f"{point['time']:.2f}",
+                 "-" if point["nodes_expanded"] is None else f"{point['nodes_expanded']:.0f}",
+                 "-" if point["peak_rss_mb"] is None else f"{point['peak_rss_mb']:.1f}"]
+                for point in points if point["sweep"] == sweep]
+        print(f"Scaling with {sweep}:")
+        print(tabulate(rows, headers=[sweep, 'Algorithm', 'Solved', 'Time', 'Expanded', 'Peak RSS (MB)'],
+                       tablefmt='fancy_grid'))
+        print()
+
+
+"""
+    Draws one figure per sweep with time, expansions and memory against the swept value (log scale), one
+    line per algorithm. matplotlib is optional; without it only the CSV and the tables are produced.
+"""
+def plot_curves(points, output_dir):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, skipping the plots.")
+        return
+
+    for sweep in dict.fromkeys(point["sweep"] for point in points):
+        figure, axes = plt.subplots(1, len(CURVE_METRICS), figsize=(6 * len(CURVE_METRICS), 4))
+        for ax, (name, label) in zip(axes, CURVE_METRICS):
+            for algorithm in dict.fromkeys(point["algorithm"] for point in points):
+                curve = sorted((point["value"], point[name]) for point in points
+                               if point["sweep"] == sweep and point["algorithm"] == algorithm
+                               and point[name] is not None)
+                if curve:
+                    ax.plot(*zip(*curve), marker="o", label=algorithm)
+            ax.set_xlabel(sweep)
+            ax.set_ylabel(label)
+            ax.set_yscale("log")
+            ax.grid(True, alpha=0.3)
+        axes[0].legend()
+        figure.tight_layout()
+        figure.savefig(os.path.join(output_dir, f"scaling_{sweep}.png"))
+        plt.close(figure)
+    print(f"Plots written to {output_dir}/scaling_*.png")
+
+
+"""
+    Solves generated maps with unit-move A* and again with macro_actions=True in every MACRO_CHECK_SOLVERS
+    solver, and prints each map where the results differ: corridor macros must never change the length of a
+    shortest path. Returns the number of differences.
+"""
+def check_macro_actions(output_dir, seeds, time_limit=SUITE_TIME_LIMIT):
+    differences = checked = 0
+    for height, width, wall_density, ghosts in MACRO_CHECK_MAPS:
+        for seed in seeds:
+            try:
+                rows = generate_map(height, width, wall_density, 2, 1, (ghosts + 1) // 2, ghosts // 2, seed)
+            except ValueError:
+                continue
+            path = os.path.join(output_dir, f"macro_{height}x{width}_seed{seed}.txt")
+            write_map(path, rows)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                expected = classify_result(solve(path, "A*", time_limit)[0])
+                results = {mode: classify_result(solve(path, mode, time_limit, macro_actions=True)[0])
+                           for mode in MACRO_CHECK_SOLVERS}
+            if expected[0] == "Timeout":
+                continue
+            checked += 1
+            for mode, result in results.items():
+                if result != expected:
+                    differences += 1
+                    print(f"{path}: unit-move A* gives {expected}, {mode} with macro actions gives {result}")
+    print(f"Macro actions checked on {checked} maps: {differences} differences.")
+    return differences
+
+
+if __name__ == "__main__":
+    from multiprocessing import freeze_support
+    freeze_support()
+
+    parser = argparse.ArgumentParser(description="Run every solver on generated maps of growing difficulty.")
+    parser.add_argument("--sweeps", nargs="+", choices=list(SWEEPS), default=list(SWEEPS),
+                        help="parameters to sweep (default: all)")
+    for sweep, values in SWEEPS.items():
+        parser.add_argument(f"--{sweep.replace('_', '-')}", nargs="+", type=type(values[0]), default=values,
+                            help=f"values of the {sweep} sweep (default: {' '.join(map(str, values))})")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2], help="map seeds per value")
+    parser.add_argument("--solvers", nargs="+", choices=SOLVER_MODES, help="solvers to run (default: all)")
+    parser.add_argument("--time-limit", type=float, default=SUITE_TIME_LIMIT, help="time limit per run, in seconds")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--memory-limit", type=int, help="address space limit per worker, in MB")
+    parser.add_argument("--output-dir", default=SUITE_OUTPUT_DIR, help="where to write maps, results and curves")
+    parser.add_argument("--check-macros", action="store_true",
+                        help="instead of the sweeps, check that macro actions keep A*, IDA* and IDS optimal on small "
+                             "generated maps (one per seed and MACRO_CHECK_MAPS entry)")
+    args = parser.parse_args()
+
+    if args.check_macros:
+        raise SystemExit(1 if check_macro_actions(os.path.join(args.output_dir, "macro_maps"), args.seeds,
+                                                  args.time_limit) else 0)
+
+    sweeps = {sweep: getattr(args, sweep) for sweep in args.sweeps}
+    maps = generate_suite(os.path.join(args.output_dir, "maps"), sweeps, seeds=args.seeds)
+    print(f"Generated {len(maps)} maps in {args.output_dir}/maps")
+
+    results = run_benchmark([path for _, _, _, path in maps], args.solvers, args.workers, args.memory_limit,
+                            time_limit=args.time_limit)
+    write_results(results, args.output_dir)
+    points = scaling_curves(maps, results)
+    print()
+    print_curves(points)
+    write_curves(points, args.output_dir)
+    plot_curves(points, args.output_dir)
@@ -1,11 +1,7 @@
 """ 
-    import your solver functions here
+    Solvers are registered below by import path and only imported when they are used
 """
-from core.solvers.weighted_astar_solver import weighted_astar_solver
-from core.solvers.astar_solver import astar_solver
-from core.solvers.bfs_solver import bfs_solver
-from core.solvers.dfs_solver import dfs_solver
-from core.solvers.ids_solver import ids_solver
+from core.solvers.registry import SolverRegistry
 
 CELL_SIZE = 40
 AI_MODE_FPS = 3
@@ -13,6 +9,13 @@ PLAYER_MODE_FPS = 100
 PLAYER_SPEED = 5
 P2G_SPEED = 1  # AI speed (moves/sec)
 GHOST_MOVE_LIMIT = 2 # Maximum number of cells a ghost can move
+DISTANCE_CACHE_DIR = ".cache/distances" # Maze distance tables, stored per map file hash
+SOLUTION_CACHE_DIR = ".cache/solutions" # Solutions of AI mode and tester runs; None disables the cache
+SOLUTION_CACHE_MAX_BYTES = 16 * 1024 * 1024 # Least recently used solutions are evicted above this size
+SOLVE_SERVICE_HOST, SOLVE_SERVICE_PORT = "127.0.0.1", 8765 # Address of solve_service.py
+REPLAY_SEEK_FRAMES = 10 # Frames LEFT/RIGHT skip while watching a solution
+PROFILE_DIR = None # Set to a directory (e.g. "profiles") to profile AI mode solver runs there
+SHOW_FRAME_TIME = True # Measured FPS and render time in the corner of the window
 PLAYER_SIZE, FRUIT_SIZE, GHOST_SIZE = 40, 50, 40
 
 BLACK  = (0, 0, 0)
@@ -26,18 +29,22 @@ ROWS = 15
 COLS = 20
 
 
-SOLVER_MODES = ["BFS", "DFS", "IDS", "A*", "Weighted A*"]
+SOLVER_MODES = ["BFS", "DFS", "IDS", "A*", "Weighted A*", "IDA*", "ARA*", "HDA*"]
+PLAYER_MODES = ["Player", "Autopilot"] # Real time modes; Autopilot replans incrementally with D* Lite
 
 """
-    Add your solver functions to SOLVERS dictionary.
+    Add your solver functions to SOLVERS dictionary, as "module:function" import paths (or functions).
 """
-SOLVERS = {
-    SOLVER_MODES[0]: bfs_solver,
-    SOLVER_MODES[1]: dfs_solver,
-    SOLVER_MODES[2]: ids_solver,
-    SOLVER_MODES[3]: astar_solver,
-    SOLVER_MODES[4]: weighted_astar_solver
-}
+SOLVERS = SolverRegistry({
+    SOLVER_MODES[0]: "core.solvers.bfs_solver:bfs_solver",
+    SOLVER_MODES[1]: "core.solvers.dfs_solver:dfs_solver",
+    SOLVER_MODES[2]: "core.solvers.ids_solver:ids_solver",
+    SOLVER_MODES[3]: "core.solvers.astar_solver:astar_solver",
+    SOLVER_MODES[4]: "core.solvers.weighted_astar_solver:weighted_astar_solver",
+    SOLVER_MODES[5]: "core.solvers.ida_star_solver:ida_star_solver",
+    SOLVER_MODES[6]: "core.solvers.ara_star_solver:ara_star_solver",
+    SOLVER_MODES[7]: "core.solvers.hda_star_solver:hda_star_solver"
+})
 
 """
     Set your desired time limits.
@@ -47,9 +54,20 @@ TIME_LIMITS = {
     SOLVER_MODES[1]: 200,
     SOLVER_MODES[2]: 200,
     SOLVER_MODES[3]: 200,
-    SOLVER_MODES[4]: 200
+    SOLVER_MODES[4]: 200,
+    SOLVER_MODES[5]: 200,
+    SOLVER_MODES[6]: 200,
+    SOLVER_MODES[7]: 200
 }
 
+"""
+    Solvers of installed plugins (see core/solvers/registry.py) are added after the built-in ones.
+"""
+DEFAULT_TIME_LIMIT = 200
+for plugin_mode in SOLVERS.load_plugins():
+    SOLVER_MODES.append(plugin_mode)
+    TIME_LIMITS[plugin_mode] = DEFAULT_TIME_LIMIT
+
 
 def grid_to_pixel(x, y):
     return x * CELL_SIZE, y * CELL_SIZE
@@ -0,0 +1,148 @@
+import hashlib
+import os
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from .map_layout import MapLayout, wall_key
+
+UNREACHABLE = np.iinfo(np.uint16).max
+
+""" Maps with more free cells than this only keep BFS rows for the cells that are asked for (snacks, mostly) """
+MAX_ALL_PAIRS_CELLS = 2500
+
+MAX_CACHED_TABLES = 16
+_tables = OrderedDict()
+
+
+class DistanceTable:
+    def __init__(self, is_wall, sources=None, rows=None, layout=None):
+        """
+        Shortest maze distances between free cells, ignoring ghosts.
+
+        Every free cell that a row was computed for is a 'source'; rows[i, j] is the number of moves from
+        sources[i] to the j'th free cell (UNREACHABLE if there is no path). On maps with up to
+        MAX_ALL_PAIRS_CELLS free cells every free cell is a source, so any distance is a single lookup.
+        Bigger maps would not fit in memory that way; there, rows are computed by BFS the first time a
+        cell is asked for and kept afterwards. Moves are symmetric, so a row of either cell answers a query.
+
+        Args:
+            is_wall (list[list[bool]]): The map walls, as returned by MapLoader.load().
+            sources (np.ndarray, optional): Cell ids of precomputed rows (from a saved table).
+            rows (np.ndarray, optional): The precomputed rows, as uint16.
+            layout (MapLayout, optional): The layout of the map. Looked up by the walls by default.
+        """
+        layout = layout or MapLayout.for_walls(is_wall)
+        self.height = layout.height
+        self.width = layout.width
+        self.free_cells = layout.free_cells
+        self.cell_index = layout.cell_index
+        self.neighbors = layout.neighbors
+
+        self.row_of = {}
+        self.rows = []
+        if sources is not None:
+            for cell, row in zip(sources.tolist(), rows):
+                self.row_of[cell] = len(self.rows)
+                self.rows.append(row)
+        elif len(self.free_cells) <= MAX_ALL_PAIRS_CELLS:
+            for cell in self.free_cells.tolist():
+                self.get_row(cell)
+
+    def _bfs(self, source):
+        row = [UNREACHABLE] * len(self.free_cells)
+        start = int(self.cell_index[source])
+        row[start] = 0
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            d = row[i] + 1
+            for j in self.neighbors[i]:
+                if row[j] == UNREACHABLE:
+                    row[j] = d
+                    queue.append(j)
+        return np.array(row, dtype=np.uint16)
+
+    """
+        Returns the distances from 'cell' (row * width + col, must be free) to every free cell.
+    """
+    def get_row(self, cell):
+        index = self.row_of.get(cell)
+        if index is None:
+            index = self.row_of[cell] = len(self.rows)
+            self.rows.append(self._bfs(cell))
+        return self.rows[index]
+
+    def distance(self, cell_a, cell_b):
+        if cell_a not in self.row_of and cell_b in self.row_of:
+            cell_a, cell_b = cell_b, cell_a
+        return int(self.get_row(cell_a)[self.cell_index[cell_b]])
+
+    """
+        Returns a list d with d[cell] = distance from 'cell' to 'target' for every cell id of the map
+        (UNREACHABLE on walls), so searches can read it with plain list indexing.
+    """
+    def get_distances_to(self, target):
+        distances = np.full(self.height * self.width, UNREACHABLE, dtype=np.uint16)
+        distances[self.free_cells] = self.get_row(target)
+        return distances.tolist()
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        sources = np.array(list(self.row_of), dtype=np.int64)
+        rows = np.stack(self.rows) if self.rows else np.zeros((0, len(self.free_cells)), dtype=np.uint16)
+        with open(path, "wb") as f:
+            np.savez(f, sources=sources, rows=rows)
+
+    """
+        Returns the table of the map in 'file_path', loading it from 'cache_dir' when it was saved before.
+        Tables are stored under the SHA-1 of the map file, so editing a map invalidates its table.
+        Extra cells (e.g. snacks on big maps) get their rows precomputed and saved with the table.
+    """
+    @classmethod
+    def load_or_build(cls, file_path, is_wall, cache_dir, extra_cells=(), layout=None):
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        path = os.path.join(cache_dir, f"{digest}.npz")
+
+        table = None
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    table = cls(is_wall, data["sources"], data["rows"], layout)
+            except (OSError, ValueError, KeyError):
+                table = None
+
+        if table is None:
+            table = cls(is_wall, layout=layout)
+            for cell in extra_cells:
+                table.get_row(cell)
+            try:
+                table.save(path)
+            except OSError as e:
+                print(f"Could not save distance table to {path}: {e}")
+
+        cls.register(is_wall, table)
+        return table
+
+    @staticmethod
+    def register(is_wall, table):
+        key = wall_key(is_wall)
+        _tables[key] = table
+        _tables.move_to_end(key)
+        while len(_tables) > MAX_CACHED_TABLES:
+            _tables.popitem(last=False)
+
+    """
+        Returns the table registered for these walls (by MapLoader.load), building one if there is none.
+    """
+    @classmethod
+    def for_walls(cls, is_wall):
+        key = wall_key(is_wall)
+        table = _tables.get(key)
+        if table is None:
+            table = cls(is_wall)
+            cls.register(is_wall, table)
+        else:
+            _tables.move_to_end(key)
+        return table
@@ -1,6 +1,8 @@
 from copy import deepcopy
 from .ghost import Ghost
 from .snack import Snack
+from .ghost_schedule import GhostSchedule
+from .map_layout import MapLayout
 import math
 class PacmanGame:
     def __init__(self, is_wall, player, ghosts, snacks, move_direction=None):
@@ -24,6 +26,9 @@ class PacmanGame:
         self.height = len(is_wall)
         self.width = len(is_wall[0]) if self.height > 0 else 0
 
+        """ Integer cell ids, NumPy grids and move tables of the map, shared by every game on these walls """
+        self.layout = MapLayout.for_walls(is_wall)
+
     """
         It returns a pair of move_direction and information for dynamic objects of the game.
         Store this information and return it in solvers. It's used on the GUI feature.
@@ -50,7 +55,7 @@ class PacmanGame:
         Determines if player/ghost can go to (x, y) without hitting a wall or getting out of bounds
     """
     def is_valid(self, x, y):
-        return self.in_bounds(x, y) and not self.is_wall[x][y]
+        return self.layout.is_valid(x, y)
 
     """
         It determines if the game is finished or not.
@@ -88,6 +93,13 @@ class PacmanGame:
         return map_string + "╚" + "═" * width + "╝" + "\n"
     
 
+    """
+        Precomputes the positions of all ghosts for every time step, starting from the current state.
+        Searches use it to check ghost collisions with set lookups instead of moving Ghost objects.
+    """
+    def get_ghost_schedule(self):
+        return GhostSchedule(self)
+
     """
         Use this method (or any defined method by yourself) to explore next possible states of the game.
     """
@@ -97,36 +109,14 @@ class PacmanGame:
     def get_next_states(self):
 
         next_states = []
-        moves = {"U": (-1, 0), "D": (1, 0), "L": (0, -1), "R": (0, 1)}
 
         ghost_future_states = {}
         for i, ghost in enumerate(self.ghosts):
-            
-            next_pos = ghost.get_next_position()
-
-            if ghost.axis == 'H':
-                 dist_from_center = abs(next_pos[1] - ghost.center[1])
-            else: 
-                 dist_from_center = abs(next_pos[0] - ghost.center[0])
-
-            if not self.is_valid(*next_pos) or (ghost.radius is not None and dist_from_center > ghost.radius):
-                final_direction = -ghost.direction
-                if ghost.axis == 'H':
-                    final_pos = (ghost.x, ghost.y + final_direction)
-                else: 
-                    final_pos = (ghost.x + final_direction, ghost.y)
-            else:
-                final_pos = next_pos
-                final_direction = ghost.direction
-            
-            ghost_future_states[i] = (final_pos, final_direction)
+            ghost_future_states[i] = ghost.get_next_state(self.is_valid)
 
         px, py = self.player
-        for action, (p_dx, p_dy) in moves.items():
-            pacman_next_pos = (px + p_dx, py + p_dy)
-
-            if not self.is_valid(*pacman_next_pos):
-                continue
+        for action, cell in self.layout.moves[self.layout.to_cell(px, py)]:
+            pacman_next_pos = self.layout.to_position(cell)
 
             is_safe = True
             for i, ghost in enumerate(self.ghosts):
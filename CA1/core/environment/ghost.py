@@ -30,3 +30,25 @@ class Ghost:
         dx, dy = (0, self.direction) if self.is_horizontal() else (
             self.direction, 0)
         return (self.x + dx, self.y + dy)
+
+    """
+        Returns the (position, direction) pair of the ghost after one step. 'is_valid' tells if a cell is free;
+        the ghost turns back when it hits a wall or gets farther than 'radius' from its center.
+    """
+    def get_next_state(self, is_valid):
+        next_pos = self.get_next_position()
+
+        if self.is_horizontal():
+            dist_from_center = abs(next_pos[1] - self.center[1])
+        else:
+            dist_from_center = abs(next_pos[0] - self.center[0])
+
+        if not is_valid(*next_pos) or (self.radius is not None and dist_from_center > self.radius):
+            final_direction = -self.direction
+            if self.is_horizontal():
+                final_pos = (self.x, self.y + final_direction)
+            else:
+                final_pos = (self.x + final_direction, self.y)
+            return final_pos, final_direction
+
+        return next_pos, self.direction
@@ -0,0 +1,74 @@
+from copy import deepcopy
+from math import lcm
+
+
+"""
+    Simulates a ghost until its (position, direction) repeats. Returns the list of (x, y, direction) it goes
+    through and the index where its cycle starts (everything before it is only visited once).
+"""
+def ghost_orbit(ghost, is_valid):
+    ghost = deepcopy(ghost)
+    seen = {}
+    orbit = []
+    while (ghost.x, ghost.y, ghost.direction) not in seen:
+        seen[(ghost.x, ghost.y, ghost.direction)] = len(orbit)
+        orbit.append((ghost.x, ghost.y, ghost.direction))
+        (x, y), direction = ghost.get_next_state(is_valid)
+        ghost.set_state(x, y, direction)
+    return orbit, seen[(ghost.x, ghost.y, ghost.direction)]
+
+
+class GhostSchedule:
+    def __init__(self, game):
+        """
+        Precomputes where every ghost is at every time step of a map.
+
+        Ghosts don't react to Pacman, so their positions only depend on the number of steps taken. After a
+        (usually empty) prefix of 'cycle_start' steps, all ghosts together repeat every 'period' steps, the LCM
+        of their own cycle lengths. Time steps are numbered 0 .. len(self) - 1 and 'next_time' wraps the last
+        one back to 'cycle_start'.
+
+        Args:
+            game (PacmanGame): Provides the map layout and the ghosts at time 0.
+        """
+        self.width = game.width
+        self.layout = game.layout
+        orbits = [ghost_orbit(ghost, self.layout.is_valid) for ghost in game.ghosts]
+
+        self.cycle_start = max((start for _, start in orbits), default=0)
+        self.period = lcm(*(len(orbit) - start for orbit, start in orbits)) if orbits else 1
+        length = self.cycle_start + self.period
+
+        """ states[t][i] = (x, y, direction) of the i'th ghost at time step t """
+        self.states = [[] for _ in range(length)]
+        for orbit, start in orbits:
+            cycle = len(orbit) - start
+            for t in range(length):
+                index = t if t < start else start + (t - start) % cycle
+                self.states[t].append(orbit[index])
+
+        self.next_time = list(range(1, length)) + [self.cycle_start]
+
+        """ occupied[t]: cells holding a ghost at time t. swaps[t]: (from, to) moves that cross a ghost between t and t + 1 """
+        cells = [[self._to_cell(x, y) for x, y, _ in ghosts] for ghosts in self.states]
+        self.occupied = [frozenset(c for c in now if c >= 0) for now in cells]
+        self.swaps = [
+            frozenset((future, now) for now, future in zip(cells[t], cells[self.next_time[t]]) if now >= 0)
+            for t in range(length)
+        ]
+
+    def _to_cell(self, x, y):
+        return self.layout.to_cell(x, y) if self.layout.in_bounds(x, y) else -1
+
+    def __len__(self):
+        return len(self.states)
+
+    def get_positions(self, t):
+        return [(x, y) for x, y, _ in self.states[t]]
+
+    """
+        Tells if Pacman can move from 'cell' to 'next_cell' between time steps t and t + 1 without
+        landing on a ghost or swapping places with one.
+    """
+    def is_safe(self, t, cell, next_cell):
+        return next_cell not in self.occupied[self.next_time[t]] and (cell, next_cell) not in self.swaps[t]
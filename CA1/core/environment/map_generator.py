@@ -0,0 +1,137 @@
+import os
+import random
+from collections import deque
+
+MAX_MAP_SIZE = 200
+
+
+"""
+    Returns the free cells connected to 'start' (4-neighbourhood) without going through 'exclude',
+    as a set of (row, col).
+"""
+def connected_cells(grid, start, exclude=frozenset()):
+    height, width = len(grid), len(grid[0])
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if (0 <= nx < height and 0 <= ny < width and grid[nx][ny] != 'W' and (nx, ny) not in seen
+                    and (nx, ny) not in exclude):
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return seen
+
+
+"""
+    Carves corridors through inner walls until all free cells of 'grid' are connected, and returns them.
+
+    A breadth-first search grows from the area around the first free cell through walls and free cells
+    alike. Whenever it reaches a free cell outside the area, the walls on the way there are removed and that
+    cell's whole open area joins, so every area gets linked by a short corridor in one pass over the map.
+"""
+def connect_areas(grid):
+    height, width = len(grid), len(grid[0])
+    free = [(x, y) for x in range(height) for y in range(width) if grid[x][y] != 'W']
+    if not free:
+        return set()
+
+    area = connected_cells(grid, free[0])
+    parent = dict.fromkeys(area)
+    queue = deque(area)
+    while queue:
+        cell = queue.popleft()
+        x, y = cell
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            neighbour = (nx, ny)
+            if not (0 < nx < height - 1 and 0 < ny < width - 1) or neighbour in parent:
+                continue
+            parent[neighbour] = cell
+            if grid[nx][ny] == 'W':
+                queue.append(neighbour)
+                continue
+
+            corridor = cell
+            while corridor not in area:
+                grid[corridor[0]][corridor[1]] = ' '
+                area.add(corridor)
+                corridor = parent[corridor]
+            for joined in connected_cells(grid, neighbour, area):
+                area.add(joined)
+                parent.setdefault(joined, None)
+                queue.append(joined)
+    return area
+
+
+def generate_map(height, width, wall_density=0.2, a_snacks=3, b_snacks=2, h_ghosts=1, v_ghosts=1, seed=0):
+    """
+    Generates a random map in the text format MapLoader reads.
+
+    The map is surrounded by walls and every inner cell becomes a wall with probability 'wall_density'.
+    Separate open areas are then joined by carving corridors (see connect_areas), so the player can reach
+    every snack if the ghosts let it. The player, snacks and ghosts are then put on distinct random cells of
+    that area; ghosts prefer cells they can move from along their axis and are kept off the player's
+    neighbours. The same arguments always give the same map.
+
+    Args:
+        height (int): Number of rows, walls included (3 .. MAX_MAP_SIZE).
+        width (int): Number of columns, walls included (3 .. MAX_MAP_SIZE).
+        wall_density (float): Probability for an inner cell to be a wall.
+        a_snacks (int): Number of 'A' snacks.
+        b_snacks (int): Number of 'B' snacks.
+        h_ghosts (int): Number of horizontal ghosts.
+        v_ghosts (int): Number of vertical ghosts.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        list[str]: The rows of the map.
+    """
+    if not (3 <= height <= MAX_MAP_SIZE and 3 <= width <= MAX_MAP_SIZE):
+        raise ValueError(f"Map size must be between 3x3 and {MAX_MAP_SIZE}x{MAX_MAP_SIZE}, got {height}x{width}.")
+    if not 0 <= wall_density < 1:
+        raise ValueError(f"Wall density must be in [0, 1), got {wall_density}.")
+
+    rng = random.Random(seed)
+    grid = [['W'] * width for _ in range(height)]
+    for x in range(1, height - 1):
+        for y in range(1, width - 1):
+            if rng.random() >= wall_density:
+                grid[x][y] = ' '
+
+    area = connect_areas(grid)
+
+    items = 1 + a_snacks + b_snacks + h_ghosts + v_ghosts
+    if items > len(area):
+        raise ValueError(f"The map has {len(area)} open cells, not enough for {items} items. "
+                         f"Lower the wall density or the number of items.")
+
+    free = sorted(area)
+    rng.shuffle(free)
+    player = free.pop()
+    grid[player[0]][player[1]] = 'P'
+    near_player = {(player[0] + dx, player[1] + dy) for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))}
+
+    def can_move(cell, axis):
+        x, y = cell
+        steps = ((0, -1), (0, 1)) if axis == 'H' else ((-1, 0), (1, 0))
+        return any((x + dx, y + dy) in area for dx, dy in steps)
+
+    for axis, count in (('H', h_ghosts), ('V', v_ghosts)):
+        for _ in range(count):
+            choices = [cell for cell in free if cell not in near_player and can_move(cell, axis)]
+            cell = choices[-1] if choices else free[-1]
+            free.remove(cell)
+            grid[cell[0]][cell[1]] = axis
+
+    for snack_type, count in (('A', a_snacks), ('B', b_snacks)):
+        for _ in range(count):
+            x, y = free.pop()
+            grid[x][y] = snack_type
+
+    return ["".join(row) for row in grid]
+
+
+def write_map(file_path, rows):
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, "w") as f:
+        f.write("\n".join(rows) + "\n")
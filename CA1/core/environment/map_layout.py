@@ -0,0 +1,113 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+""" Moves in the order solvers try them: (action, (dx, dy)) """
+MOVES = (("U", (-1, 0)), ("D", (1, 0)), ("L", (0, -1)), ("R", (0, 1)))
+
+MAX_CACHED_LAYOUTS = 16
+_layouts = OrderedDict()
+
+
+def wall_key(is_wall):
+    return hashlib.sha1("\n".join("".join("W" if w else " " for w in row) for row in is_wall).encode()).hexdigest()
+
+
+class MapLayout:
+    def __init__(self, is_wall):
+        """
+        The static part of a map in the forms searches need, built once per map by MapLoader.
+
+        Cells are identified by the integer id row * width + col. Free cells also have a dense index
+        0 .. len(free_cells) - 1, used by per-cell arrays such as DistanceTable rows.
+
+        The moves out of every free cell are stored CSR style: the moves of the free cell with index i are
+        entries neighbor_offsets[i] .. neighbor_offsets[i + 1] - 1 of neighbor_cells (target cell ids) and
+        neighbor_actions (indices into MOVES). Only moves that stay on the map and don't hit a wall are
+        stored, so code that walks them needs no bounds or wall checks. 'moves' and 'neighbors' hold the same
+        table as Python tuples/lists, which is what the pure Python hot loops iterate over.
+
+        Args:
+            is_wall (list[list[bool]]): The map walls, as returned by MapLoader.load().
+        """
+        self.height = len(is_wall)
+        self.width = len(is_wall[0]) if self.height > 0 else 0
+
+        self.walls = np.array(is_wall, dtype=bool).reshape(self.height, self.width)
+        flat_walls = self.walls.reshape(-1)
+        """ is_free[cell] as a Python list, for fast scalar lookups """
+        self.is_free = (~flat_walls).tolist()
+        self.free_cells = np.flatnonzero(~flat_walls)
+        """ cell_index[cell] = index of the cell among free cells, or -1 on walls """
+        self.cell_index = np.full(self.height * self.width, -1, dtype=np.int32)
+        self.cell_index[self.free_cells] = np.arange(len(self.free_cells), dtype=np.int32)
+
+        self._build_neighbors()
+
+    def _build_neighbors(self):
+        rows, cols = np.divmod(self.free_cells, self.width)
+        targets, actions = [], []
+        for action, (dx, dy) in enumerate(move for _, move in MOVES):
+            x, y = rows + dx, cols + dy
+            inside = (x >= 0) & (x < self.height) & (y >= 0) & (y < self.width)
+            cell = np.where(inside, x * self.width + y, 0)
+            valid = inside & ~self.walls.reshape(-1)[cell]
+            targets.append(np.where(valid, cell, -1))
+            actions.append(np.full(len(self.free_cells), action))
+
+        """ (free cells, 4) tables; -1 marks a blocked move. Flattening row by row keeps the MOVES order per cell """
+        targets = np.stack(targets, axis=1)
+        actions = np.stack(actions, axis=1)
+        valid = targets >= 0
+        self.neighbor_offsets = np.concatenate(([0], np.cumsum(valid.sum(axis=1)))).astype(np.int32)
+        self.neighbor_cells = targets[valid].astype(np.int32)
+        self.neighbor_actions = actions[valid].astype(np.uint8)
+
+        self.moves = [() for _ in range(self.height * self.width)]
+        self.neighbors = []
+        cells = self.neighbor_cells.tolist()
+        names = [MOVES[a][0] for a in self.neighbor_actions.tolist()]
+        offsets = self.neighbor_offsets.tolist()
+        for i, cell in enumerate(self.free_cells.tolist()):
+            start, end = offsets[i], offsets[i + 1]
+            self.moves[cell] = tuple(zip(names[start:end], cells[start:end]))
+            self.neighbors.append(self.cell_index[cells[start:end]].tolist())
+
+    """ The layout never changes, so copies of games share it """
+    def __deepcopy__(self, memo):
+        return self
+
+    def to_cell(self, x, y):
+        return x * self.width + y
+
+    def to_position(self, cell):
+        return divmod(cell, self.width)
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.height and 0 <= y < self.width
+
+    def is_valid(self, x, y):
+        return 0 <= x < self.height and 0 <= y < self.width and self.is_free[x * self.width + y]
+
+    @staticmethod
+    def register(is_wall, layout):
+        key = wall_key(is_wall)
+        _layouts[key] = layout
+        _layouts.move_to_end(key)
+        while len(_layouts) > MAX_CACHED_LAYOUTS:
+            _layouts.popitem(last=False)
+
+    """
+        Returns the layout registered for these walls (by MapLoader.load), building one if there is none.
+    """
+    @classmethod
+    def for_walls(cls, is_wall):
+        key = wall_key(is_wall)
+        layout = _layouts.get(key)
+        if layout is None:
+            layout = cls(is_wall)
+            cls.register(is_wall, layout)
+        else:
+            _layouts.move_to_end(key)
+        return layout
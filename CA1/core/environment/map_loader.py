@@ -1,6 +1,8 @@
 from ..environment.ghost import Ghost
 from ..environment.snack import Snack
-from config import GHOST_MOVE_LIMIT
+from ..environment.distance_table import DistanceTable
+from ..environment.map_layout import MapLayout
+from config import GHOST_MOVE_LIMIT, DISTANCE_CACHE_DIR
 
 class MapLoader:
     def __init__(self, file_path):
@@ -38,4 +40,13 @@ class MapLoader:
                 else:
                     print(f"Invalid map character {ch}")
 
+        """ Grid arrays and move tables of the map; games built on these walls pick them up from the registry """
+        self.layout = MapLayout(is_wall)
+        MapLayout.register(is_wall, self.layout)
+
+        """ Precompute (or load) the maze distances, so heuristics can look them up during the search """
+        self.distance_table = DistanceTable.load_or_build(
+            self.file_path, is_wall, DISTANCE_CACHE_DIR, extra_cells=[s.x * width + s.y for s in snacks],
+            layout=self.layout)
+
         return is_wall, player, ghosts, snacks
@@ -0,0 +1,194 @@
+from copy import deepcopy
+from .game import PacmanGame
+from .distance_table import DistanceTable
+
+
+class PackedGame:
+    def __init__(self, game: PacmanGame, macro_actions=False):
+        """
+        Builds the static tables used to search a Pacman map on packed states.
+
+        A packed state is an immutable tuple (player_cell, time, snack_mask):
+            player_cell (int): row * width + col of the player.
+            time (int): time step in the ghost schedule; it alone determines where every ghost is.
+            snack_mask (int): bit i is set while the i'th snack of the initial game still exists.
+
+        Successors are generated from these tables without copying any Ghost or Snack object, and states
+        that only differ in how the ghost objects were reached collapse into one.
+
+        With macro_actions=True, get_next_states returns get_macro_next_states instead: moves that run
+        through corridors in one step, with actions like "UUL" and a cost equal to the number of moves.
+        get_unit_next_states always gives single moves.
+
+        Args:
+            game (PacmanGame): The game the search starts from. It is not modified.
+            macro_actions (bool): Make get_next_states jump through corridors.
+        """
+        self.is_wall = game.is_wall
+        self.layout = game.layout
+        self.height = game.height
+        self.width = game.width
+        self.ghosts = deepcopy(game.ghosts)
+
+        """ moves[cell] = ((action, next_cell), ...) for every move that doesn't hit a wall or leave the map """
+        self.moves = self.layout.moves
+
+        self.ghost_schedule = game.get_ghost_schedule()
+
+        self.snacks = [deepcopy(s) for s in game.snacks if s.exists]
+        self.snack_positions = [(s.x, s.y) for s in self.snacks]
+        self.snack_cells = [self.to_cell(s.x, s.y) for s in self.snacks]
+        self.snack_bits = {self.to_cell(s.x, s.y): 1 << i for i, s in enumerate(self.snacks)}
+        self.a_mask = sum(1 << i for i, s in enumerate(self.snacks) if s.type == 'A')
+
+        self.initial_state = (
+            self.to_cell(*game.player),
+            0,
+            (1 << len(self.snacks)) - 1,
+        )
+        """ Games that keep the distances to their snacks (solve_service.py caches them per map) hand them over """
+        self.snack_distances = game.get_snack_distances() if hasattr(game, "get_snack_distances") else None
+
+        """ Cells a ghost is on at some time step; stepping anywhere else can never hit a ghost """
+        self.ghost_cells = frozenset().union(*self.ghost_schedule.occupied)
+        self.macro_actions = macro_actions
+        self.pass_through_cells = frozenset()
+        if macro_actions:
+            self.pass_through_cells = self.find_pass_through_cells()
+            self.get_next_states = self.get_macro_next_states
+
+    """
+        Returns d with d[i][cell] = maze distance from 'cell' to the i'th snack. It is built on first use from
+        the map's DistanceTable, so searches without a heuristic don't pay for it.
+    """
+    def get_snack_distances(self):
+        if self.snack_distances is None:
+            table = DistanceTable.for_walls(self.is_wall)
+            self.snack_distances = [table.get_distances_to(cell) for cell in self.snack_cells]
+        return self.snack_distances
+
+    def to_cell(self, x, y):
+        return x * self.width + y
+
+    def to_position(self, cell):
+        return divmod(cell, self.width)
+
+    def player_position(self, state):
+        return self.to_position(state[0])
+
+    def is_goal(self, state):
+        return state[2] == 0
+
+    """
+        Yields (index, (x, y), type) for every snack that still exists in the given state.
+    """
+    def remaining_snacks(self, state):
+        mask = state[2]
+        for i, snack in enumerate(self.snacks):
+            if mask >> i & 1:
+                yield i, self.snack_positions[i], snack.type
+
+    """
+        Packed equivalent of PacmanGame.get_next_states(). Returns a list of (next_state, action, cost).
+    """
+    def get_next_states(self, state):
+        player, t, mask = state
+        next_t = self.ghost_schedule.next_time[t]
+        occupied = self.ghost_schedule.occupied[next_t]
+        swaps = self.ghost_schedule.swaps[t]
+
+        next_states = []
+        for action, cell in self.moves[player]:
+            if cell in occupied or (player, cell) in swaps:
+                continue
+
+            next_mask = mask
+            bit = self.snack_bits.get(cell, 0)
+            if bit & mask and (bit & self.a_mask or not mask & self.a_mask):
+                next_mask = mask ^ bit
+
+            next_states.append(((cell, next_t, next_mask), action, 1))
+
+        return next_states
+
+    get_unit_next_states = get_next_states
+
+    """
+        Returns the cells a macro move walks through without stopping. A corridor is a run of cells with
+        exactly two exits that hold no snack and that no ghost ever enters; inside it nothing can happen but
+        time passing. The two cells at each end of a corridor are kept as stops, so Pacman can still turn
+        back there: pacing between them (or in and out of the corridor) spends any even number of steps, which
+        is every way of waiting a walk inside the corridor has. Macro moves therefore reach each (cell, time)
+        pair the unit moves reach, at the same cost, and cost-ordered searches stay optimal.
+    """
+    def find_pass_through_cells(self):
+        corridor = {cell for cell, moves in enumerate(self.moves)
+                    if len(moves) == 2 and cell not in self.snack_bits and cell not in self.ghost_cells}
+
+        def is_inner(cell):
+            return all(next_cell in corridor for _, next_cell in self.moves[cell])
+
+        return frozenset(cell for cell in corridor
+                         if is_inner(cell) and all(is_inner(next_cell) for _, next_cell in self.moves[cell]))
+
+    """
+        Tells if a macro move keeps going after reaching 'cell' (see find_pass_through_cells).
+    """
+    def is_pass_through(self, cell):
+        return cell in self.pass_through_cells
+
+    """
+        Like get_next_states(), but after each first move Pacman keeps walking while it is in a corridor
+        (see find_pass_through_cells), until it gets near a junction, a dead end, a snack or a cell a ghost
+        may enter. Every step is checked against the ghost schedule at its own time step, and the snack rule is
+        applied on the way, so the resulting states are exactly the ones the unit moves would reach. A walk
+        around a closed loop of corridor cells stops when it gets back to where it started.
+        Returns a list of (next_state, actions, cost); 'actions' is a string of unit moves and 'cost' its length.
+
+        A macro counts as one edge, so only searches ordered by cost (A*, IDA*, IDS, ...) find shortest paths.
+    """
+    def get_macro_next_states(self, state):
+        next_time = self.ghost_schedule.next_time
+        occupied = self.ghost_schedule.occupied
+        swaps = self.ghost_schedule.swaps
+
+        next_states = []
+        for (cell, t, mask), action, _ in self.get_unit_next_states(state):
+            actions = [action]
+            previous = state[0]
+            while self.is_pass_through(cell) and cell != state[0]:
+                (action, next_cell), = [move for move in self.moves[cell] if move[1] != previous]
+                next_t = next_time[t]
+                if next_cell in occupied[next_t] or (cell, next_cell) in swaps[t]:
+                    break
+
+                bit = self.snack_bits.get(next_cell, 0)
+                if bit & mask and (bit & self.a_mask or not mask & self.a_mask):
+                    mask ^= bit
+                previous, cell, t = cell, next_cell, next_t
+                actions.append(action)
+
+            next_states.append(((cell, t, mask), "".join(actions), len(actions)))
+
+        return next_states
+
+    """
+        Returns the same list as PacmanGame.get_info()[1], except that every snack of the initial game is
+        reported (eaten ones with exists=False), so the GUI always receives a fixed snack count.
+    """
+    def get_info(self, state):
+        player, t, mask = state
+        ghosts_info = self.ghost_schedule.get_positions(t)
+        snacks_info = [(s.x, s.y, s.type, bool(mask >> i & 1)) for i, s in enumerate(self.snacks)]
+        return [self.to_position(player)] + ghosts_info + snacks_info
+
+    """
+        Unpacks a state back into a PacmanGame object.
+    """
+    def to_game(self, state, move_direction=None):
+        player, t, mask = state
+        ghosts = deepcopy(self.ghosts)
+        for ghost, ghost_state in zip(ghosts, self.ghost_schedule.states[t]):
+            ghost.set_state(*ghost_state)
+        snacks = [deepcopy(s) for i, s in enumerate(self.snacks) if mask >> i & 1]
+        return PacmanGame(self.is_wall, self.to_position(player), ghosts, snacks, move_direction)
@@ -0,0 +1,149 @@
+# File: core/solvers/ara_star_solver.py
+
+from ..environment.game import PacmanGame
+from ..environment.packed_game import PackedGame
+from .heuristics import mst_snack_heuristic
+from .frontier import PriorityFrontier
+from .search_node import SearchNode
+from .render_history import RenderHistory
+from .search_stats import SearchStats
+from time import perf_counter
+import math
+import time
+
+
+def ara_star_solver(game: PacmanGame, heuristic_func=mst_snack_heuristic, initial_weight: float = 5,
+                    weight_step: float = 1, timeout: int = 120, stats=None, macro_actions=False):
+    """
+    Anytime Repairing A* (ARA*): a weighted A* that keeps improving its solution until the time limit.
+
+    The first search uses f = g + initial_weight * h and finds a solution quickly. Every next search lowers
+    the weight by 'weight_step' (down to 1) and continues from where the previous one stopped instead of
+    starting over: states whose g improved after they were expanded are kept aside (INCONS) and put back
+    in the open list with the new weight, and nothing else is expanded twice within one search.
+
+    After every search the solution cost is at most 'bound' times the optimal one, with
+    bound = min(weight, cost / min g + h over all open and inconsistent states). The search stops early
+    when the bound reaches 1, i.e. the solution is proven optimal.
+
+    When the time limit is reached the best solution found so far is returned, so the solver only
+    returns None when no solution was found at all. The returned history has two extra attributes:
+    'trace', a list of dicts (time, weight, cost, bound, expanded) with one entry per improvement, and
+    'suboptimality_bound', the bound of the returned solution.
+    """
+    start_time = time.time()
+    stats = stats or SearchStats("ARA*")
+    stats.start()
+
+    packed_game = PackedGame(game, macro_actions)
+    initial_state = packed_game.initial_state
+
+    h_costs = {}
+
+    def h(state):
+        value = h_costs.get(state)
+        if value is None:
+            value = h_costs[state] = stats.heuristic(heuristic_func, packed_game, state)
+        return value
+
+    g_costs = {initial_state: 0}
+    nodes = {initial_state: SearchNode(initial_state)}
+    weight = max(1, initial_weight)
+    open_list = PriorityFrontier(g_costs, decrease_key=True)
+    open_list.push(initial_state, 0, h(initial_state), weight * h(initial_state))
+    inconsistent = set()
+
+    best_state = initial_state if packed_game.is_goal(initial_state) else None
+    best_cost = 0 if best_state is not None else math.inf
+    bound = math.inf
+    previous_cost = math.inf
+    trace = []
+    timed_out = False
+
+    while True:
+        """ ImprovePath: expand states while one of them could still lead to a cheaper goal """
+        closed = set()
+        while open_list and open_list.peek_f() < best_cost:
+            if time.time() - start_time > timeout:
+                timed_out = True
+                break
+
+            entry = open_list.pop()
+            if entry is None:
+                break
+            _, g_cost, current_state, _ = entry
+            closed.add(current_state)
+            node = nodes[current_state]
+
+            for next_state, action, cost in stats.expand(packed_game, current_state):
+                new_g = g_cost + cost
+
+                t = perf_counter()
+                is_better = new_g < g_costs.get(next_state, math.inf)
+                if is_better:
+                    g_costs[next_state] = new_g
+                stats.hash_time += perf_counter() - t
+
+                if not is_better:
+                    stats.duplicates_pruned += 1
+                    continue
+
+                nodes[next_state] = SearchNode(next_state, node, action)
+                if packed_game.is_goal(next_state):
+                    if new_g < best_cost:
+                        best_state, best_cost = next_state, new_g
+                elif next_state in closed:
+                    inconsistent.add(next_state)
+                else:
+                    next_h = h(next_state)
+                    open_list.push(next_state, new_g, next_h, new_g + weight * next_h)
+            stats.observe(len(open_list) + len(inconsistent), len(g_costs))
+
+        if best_state is None:
+            if timed_out:
+                print("ARA*: Timeout reached before a first solution was found.")
+            break
+
+        lower_bound = min((g_costs[state] + h(state) for state in list(open_list.entry_finder) + list(inconsistent)),
+                          default=best_cost)
+        previous_bound = bound
+        bound = min(weight, best_cost / lower_bound) if lower_bound > 0 else 1.0
+        bound = max(1.0, bound)
+
+        if not trace or best_cost < trace[-1]["cost"] or bound < previous_bound:
+            trace.append({"time": time.time() - start_time, "weight": weight, "cost": best_cost, "bound": bound,
+                          "expanded": stats.nodes_expanded})
+            print(f"ARA*: Solution with cost {best_cost} at weight {weight:g} (at most {bound:.3f} x optimal) "
+                  f"after {trace[-1]['time']:.2f}s")
+            if best_cost < previous_cost:
+                stats.report_solution(nodes[best_state].get_path())
+                previous_cost = best_cost
+
+        if timed_out:
+            print("ARA*: Timeout reached, returning the best solution found so far.")
+            break
+        if bound <= 1.0:
+            print("ARA*: Solution is optimal.")
+            break
+
+        """ Lower the weight and move the inconsistent states back to the open list, rebuilt with the new f """
+        weight = max(1, weight - weight_step)
+        states = list(open_list.entry_finder) + list(inconsistent)
+        inconsistent = set()
+        open_list = PriorityFrontier(g_costs, decrease_key=True)
+        for state in states:
+            open_list.push(state, g_costs[state], h(state), g_costs[state] + weight * h(state))
+
+    found_path = nodes[best_state].get_path() if best_state is not None else None
+    stats.finish(found_path)
+    print(stats.summary())
+
+    if found_path is None:
+        print("ARA*: No solution found.")
+        return None
+
+    history = RenderHistory(packed_game, found_path, stats=stats)
+    history.trace = trace
+    history.suboptimality_bound = bound
+    print(f"ARA*: Render history ready ({len(history)} frames).")
+    return history
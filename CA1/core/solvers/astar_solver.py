@@ -1,103 +1,98 @@
 # File: core/solvers/astar_solver.py
 
 from ..environment.game import PacmanGame
-from .heuristics import farthest_snack_heuristic
-from copy import deepcopy
+from ..environment.packed_game import PackedGame
+from .heuristics import mst_snack_heuristic
+from .frontier import PriorityFrontier
+from .search_node import SearchNode
+from .render_history import RenderHistory
+from .search_stats import SearchStats
+from time import perf_counter
 import time
 
-def astar_solver(game: PacmanGame, timeout=120):
+def astar_solver(game: PacmanGame, heuristic_func=mst_snack_heuristic, timeout=120, stats=None, visited=None,
+                 macro_actions=False):
     """
-    A* Search implementation using only Python lists (no heapq).
+    A* Search implementation on a binary-heap open list (see frontier.py).
     Based only on PacmanGame public API.
     Generates GUI-safe render history with fixed snack count.
+    'visited' is the closed set; any set-like container of packed states works, e.g. a ZobristVisitedSet.
     """
     start_time = time.time()
+    stats = stats or SearchStats("A*")
+    stats.start()
 
-    initial_game = deepcopy(game)
-    initial_state = initial_game.get_state()
-    initial_snacks = deepcopy(initial_game.snacks)
-    num_ghosts = len(initial_game.ghosts)
+    packed_game = PackedGame(game, macro_actions)
+    initial_state = packed_game.initial_state
 
     g_costs = {initial_state: 0}
-    h_cost_init = farthest_snack_heuristic(initial_game)
+    h_cost_init = stats.heuristic(heuristic_func, packed_game, initial_state)
     f_cost_init = g_costs[initial_state] + h_cost_init
 
-    open_list = [(f_cost_init, g_costs[initial_state], initial_game, [])]
-    visited = set()
+    open_list = PriorityFrontier(g_costs)
+    open_list.push(initial_state, 0, h_cost_init, f_cost_init, SearchNode(initial_state))
+    visited = set() if visited is None else visited
 
     found_path = None
-    print("A* (simple list): Starting search...")
+    print("A*: Starting search...")
 
     while open_list:
         if time.time() - start_time > timeout:
             print("A*: Timeout reached.")
+            stats.finish()
             return None
 
-        best_index = 0
-        for i in range(1, len(open_list)):
-            if open_list[i][0] < open_list[best_index][0]:
-                best_index = i
-
-        f_cost, g_cost, current_game, path = open_list.pop(best_index)
-        state = current_game.get_state()
-
-        if state in visited:
+        entry = open_list.pop()
+        if entry is None:
+            break
+        f_cost, g_cost, state, node = entry
+
+        t = perf_counter()
+        is_closed = state in visited
+        if not is_closed:
+            visited.add(state)
+        stats.hash_time += perf_counter() - t
+        if is_closed:
+            stats.duplicates_pruned += 1
             continue
-        visited.add(state)
 
-        if current_game.is_goal():
-            found_path = path
+        if packed_game.is_goal(state):
+            found_path = node.get_path()
             print(f"A*: Goal found! Path length = {len(found_path)}")
             break
 
-        for next_game, action, cost in current_game.get_next_states():
-            next_state = next_game.get_state()
+        for next_state, action, cost in stats.expand(packed_game, state):
             new_g = g_cost + cost
-            new_h = farthest_snack_heuristic(next_game)
-            new_f = new_g + new_h
 
-            if next_state not in g_costs or new_g < g_costs[next_state]:
+            t = perf_counter()
+            is_better = new_g < g_costs.get(next_state, new_g + 1)
+            if is_better:
                 g_costs[next_state] = new_g
-                open_list.append((new_f, new_g, next_game, path + [action]))
+            stats.hash_time += perf_counter() - t
+
+            if not is_better:
+                stats.duplicates_pruned += 1
+                continue
+
+            new_h = stats.heuristic(heuristic_func, packed_game, next_state)
+            new_f = new_g + new_h
+            open_list.push(next_state, new_g, new_h, new_f, SearchNode(next_state, node, action))
+        stats.observe(len(open_list), len(visited))
+
+    stats.finish(found_path)
+    print(stats.summary())
+    frontier_stats = open_list.get_stats()
+    print(f"A*: Frontier peak = {frontier_stats['peak_size']}, pushes = {frontier_stats['pushes']}, "
+          f"stale entries skipped = {frontier_stats['stale_skipped']}")
+    if hasattr(heuristic_func, "get_stats"):
+        heuristic_stats = heuristic_func.get_stats()
+        print(f"A*: Heuristic memo hit rate = {heuristic_stats['hit_rate']:.1%} "
+              f"({heuristic_stats['hits']} hits, {heuristic_stats['misses']} misses)")
 
     if found_path is None:
         print("A*: No solution found.")
         return None
 
-    sim_game = deepcopy(initial_game)
-    raw_history = []
-
-    _, info0 = sim_game.get_info()
-    raw_history.append(('', info0))
-
-    for move in found_path:
-        for next_game, action, _ in sim_game.get_next_states():
-            if action == move:
-                sim_game = next_game
-                _, info_next = sim_game.get_info()
-                raw_history.append((action, info_next))
-                break
-
-    final_render_history = []
-    for move, raw_info in raw_history:
-        player_info = raw_info[0]
-        ghosts_info = raw_info[1:1+num_ghosts]
-        current_snacks_tuples = raw_info[1+num_ghosts:]
-
-        snack_map = {(sx, sy): (stype, sexists)
-                     for sx, sy, stype, sexists in current_snacks_tuples}
-
-        ordered_snacks = []
-        for s in initial_snacks:
-            pos = (s.x, s.y)
-            if pos in snack_map:
-                stype, sexists = snack_map[pos]
-                ordered_snacks.append((s.x, s.y, stype, sexists))
-            else:
-                ordered_snacks.append((s.x, s.y, s.type, False))
-
-        final_info = [player_info] + ghosts_info + ordered_snacks
-        final_render_history.append((move, final_info))
-
-    print(f"A*: Render history ready ({len(final_render_history)} frames).")
-    return final_render_history
+    history = RenderHistory(packed_game, found_path, stats=stats)
+    print(f"A*: Render history ready ({len(history)} frames).")
+    return history
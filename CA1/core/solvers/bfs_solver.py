@@ -1,76 +1,85 @@
 
 from collections import deque
 from ..environment.game import PacmanGame
+from ..environment.packed_game import PackedGame
+from .search_node import SearchNode
+from .render_history import RenderHistory
+from .search_stats import SearchStats
+from .vectorized_bfs import can_vectorize, vectorized_bfs
+from time import perf_counter
 import time
-from copy import deepcopy
 
-def bfs_solver(game: PacmanGame, timeout=200):
+def bfs_solver(game: PacmanGame, timeout=200, stats=None, visited=None, vectorized=True,
+               macro_actions=False):
+    """
+    'visited' can be any set-like container of packed states (supporting 'in', add() and len()), e.g. a
+    ZobristVisitedSet to bound memory on big maps. A plain set by default.
+
+    With 'vectorized' (and no custom 'visited'), maps whose states fit the NumPy encoding are searched
+    layer by layer by vectorized_bfs instead; it finds a path of the same, shortest, length.
+
+    'macro_actions' is rejected: BFS counts edges, not moves, so paths made of corridor macros would not be
+    shortest. Use A*, IDA* or IDS, which order by cost.
+    """
+    if macro_actions:
+        raise ValueError("BFS does not support macro_actions; use A*, IDA* or IDS.")
+
     start_time = time.time()
+    stats = stats or SearchStats("BFS")
+    stats.start()
 
-    initial_game_state = game.get_state()
-    initial_snacks = deepcopy(game.snacks)
-    num_ghosts = len(game.ghosts)
-    
-    queue = deque([(game, [])])
-    visited = {initial_game_state}
+    packed_game = PackedGame(game)
+    initial_state = packed_game.initial_state
+
+    if vectorized and visited is None and can_vectorize(packed_game):
+        print("BFS: Searching whole layers with NumPy.")
+        found_path = vectorized_bfs(packed_game, timeout - (time.time() - start_time), stats)
+        stats.finish(found_path)
+        print(stats.summary())
+        if found_path is None:
+            print("BFS search completed. No solution found.")
+            return None
+        print(f"BFS found a solution with path length: {len(found_path)}")
+        return RenderHistory(packed_game, found_path, stats=stats)
+
+    queue = deque([SearchNode(initial_state)])
+    visited = set() if visited is None else visited
+    visited.add(initial_state)
     found_path = None
 
     while queue:
         if time.time() - start_time > timeout:
             print("BFS solver timed out during search.")
+            stats.finish()
             return None
 
-        current_game, path_to_current = queue.popleft()
+        current_node = queue.popleft()
 
-        if current_game.is_goal():
-            found_path = path_to_current
+        if packed_game.is_goal(current_node.state):
+            found_path = current_node.get_path()
             print(f"BFS found a solution with path length: {len(found_path)}")
             break
 
-        for next_game_instance, action, _ in current_game.get_next_states():
-            next_state_tuple = next_game_instance.get_state()
-            if next_state_tuple not in visited:
-                visited.add(next_state_tuple)
-                new_path = path_to_current + [action]
-                queue.append((next_game_instance, new_path))
+        next_states = stats.expand(packed_game, current_node.state)
+
+        t = perf_counter()
+        new_states = []
+        for next_state, action, _ in next_states:
+            if next_state not in visited:
+                visited.add(next_state)
+                new_states.append((next_state, action))
+        stats.hash_time += perf_counter() - t
+        stats.duplicates_pruned += len(next_states) - len(new_states)
+
+        for next_state, action in new_states:
+            queue.append(SearchNode(next_state, current_node, action))
+        stats.observe(len(queue), len(visited))
+
+    stats.finish(found_path)
+    print(stats.summary())
 
     if found_path is None:
         print("BFS search completed. No solution found.")
         return None
 
-    raw_history = []
-    sim_game = deepcopy(game)
-    _, initial_info_list = sim_game.get_info()
-    raw_history.append(('', initial_info_list))
-
-    for move in found_path:
-        for next_game, action, _ in sim_game.get_next_states():
-            if action == move:
-                sim_game = next_game
-                _, next_info_list = sim_game.get_info()
-                raw_history.append((move, next_info_list))
-                break
-    final_render_history = []
-    for move, raw_info in raw_history:
-        player_info = raw_info[0]
-        ghosts_info = raw_info[1 : 1 + num_ghosts]
-        current_snacks_tuples = raw_info[1 + num_ghosts:]
-        
-
-        current_snack_map = {}
-        for s_row, s_col, s_type, s_exists in current_snacks_tuples:
-            current_snack_map[(s_row, s_col)] = (s_type, s_exists)
-
-        formatted_snack_info = []
-        for s in initial_snacks:
-            snack_status = current_snack_map.get((s.x, s.y)) 
-            if snack_status:
-                s_type, s_exists = snack_status
-                formatted_snack_info.append((s.x, s.y, s_type, s_exists))
-            else:
-                formatted_snack_info.append((s.x, s.y, s.type, False))
-                        
-        final_info_list = [player_info] + ghosts_info + formatted_snack_info
-        final_render_history.append((move, final_info_list))
-
-    return final_render_history
+    return RenderHistory(packed_game, found_path, stats=stats)
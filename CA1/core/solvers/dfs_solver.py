@@ -1,20 +1,33 @@
 # File: core/solvers/dfs_solver.py
 
 from ..environment.game import PacmanGame
-from copy import deepcopy
+from ..environment.packed_game import PackedGame
+from .search_node import SearchNode
+from .render_history import RenderHistory
+from .search_stats import SearchStats
+from time import perf_counter
 import time
 
-def dfs_solver(game: PacmanGame, timeout=120):
+def dfs_solver(game: PacmanGame, timeout=120, stats=None, visited=None, macro_actions=False):
+    """
+    'visited' can be any set-like container of packed states (supporting 'in', add() and len()), e.g. a
+    ZobristVisitedSet to bound memory on big maps. A plain set by default.
+
+    'macro_actions' is rejected, as in bfs_solver.
+    """
+    if macro_actions:
+        raise ValueError("DFS does not support macro_actions; use A*, IDA* or IDS.")
 
     start_time = time.time()
+    stats = stats or SearchStats("DFS")
+    stats.start()
 
-    initial_game = deepcopy(game)
-    initial_state = initial_game.get_state()
-    initial_snacks = deepcopy(initial_game.snacks)
-    num_ghosts = len(initial_game.ghosts)
+    packed_game = PackedGame(game)
+    initial_state = packed_game.initial_state
 
-    stack = [(deepcopy(game), [])] 
-    visited = {initial_state}
+    stack = [SearchNode(initial_state)]
+    visited = set() if visited is None else visited
+    visited.add(initial_state)
     found_path = None
 
     print("DFS: Starting search...")
@@ -22,63 +35,38 @@ def dfs_solver(game: PacmanGame, timeout=120):
     while stack:
         if time.time() - start_time > timeout:
             print("DFS: Timeout reached.")
+            stats.finish()
             return None
 
-        current_game, path = stack.pop()
+        current_node = stack.pop()
 
-        if current_game.is_goal():
-            found_path = path
+        if packed_game.is_goal(current_node.state):
+            found_path = current_node.get_path()
             print(f"DFS: Goal found! Path length = {len(found_path)}")
             break
 
-        next_states = current_game.get_next_states()
-        for next_game, action, _ in reversed(next_states):
-            state = next_game.get_state()
-            if state not in visited:
-                visited.add(state)
-                stack.append((next_game, path + [action]))
-
-    if found_path is None:
-        print("DFS: No solution found.")
-        return None
-
-
-    sim_game = deepcopy(initial_game)
-    raw_history = []
+        next_states = stats.expand(packed_game, current_node.state)
 
-    _, first_info = sim_game.get_info()
-    raw_history.append(('', first_info))
+        t = perf_counter()
+        new_states = []
+        for next_state, action, _ in reversed(next_states):
+            if next_state not in visited:
+                visited.add(next_state)
+                new_states.append((next_state, action))
+        stats.hash_time += perf_counter() - t
+        stats.duplicates_pruned += len(next_states) - len(new_states)
 
-    for move in found_path:
-        for next_game, action, _ in sim_game.get_next_states():
-            if action == move:
-                sim_game = next_game
-                _, frame_info = sim_game.get_info()
-                raw_history.append((action, frame_info))
-                break
+        for next_state, action in new_states:
+            stack.append(SearchNode(next_state, current_node, action))
+        stats.observe(len(stack), len(visited))
 
-    print("DFS: Building GUI-safe render history...")
-    final_render_history = []
+    stats.finish(found_path)
+    print(stats.summary())
 
-    for move, raw_info in raw_history:
-        player_info = raw_info[0]
-        ghosts_info = raw_info[1 : 1 + num_ghosts]
-        current_snacks = raw_info[1 + num_ghosts :]
-
-        snack_map = {(sx, sy): (stype, sexists)
-                     for sx, sy, stype, sexists in current_snacks}
-
-        ordered_snacks = []
-        for s in initial_snacks:
-            pos = (s.x, s.y)
-            if pos in snack_map:
-                stype, sexists = snack_map[pos]
-                ordered_snacks.append((s.x, s.y, stype, sexists))
-            else:
-                ordered_snacks.append((s.x, s.y, s.type, False))
-
-        final_info = [player_info] + ghosts_info + ordered_snacks
-        final_render_history.append((move, final_info))
+    if found_path is None:
+        print("DFS: No solution found.")
+        return None
 
-    print(f"DFS: History ready ({len(final_render_history)} frames).")
-    return final_render_history
+    history = RenderHistory(packed_game, found_path, stats=stats)
+    print(f"DFS: History ready ({len(history)} frames).")
+    return history
@@ -0,0 +1,241 @@
+# File: core/solvers/dstar_lite.py
+
+from ..environment.map_layout import MapLayout, MOVES
+from itertools import count
+from time import perf_counter
+import heapq
+import math
+
+
+class DStarLite:
+    def __init__(self, layout: MapLayout, start, targets=(), blocked=()):
+        """
+        Incremental shortest paths on the map grid from a moving start cell to the nearest of a set of target
+        cells (D* Lite, Koenig & Likhachev 2002).
+
+        The search runs backwards from the targets, which all have rhs = 0 (as if they were linked to one
+        virtual goal), towards the start. g and rhs values and the open list are kept between calls, so after
+        the start moves, a target is added, moved or removed, or a cell is blocked or freed, only the vertices
+        whose distance changed are expanded again: replanning cost grows with the size of the change, not of
+        the map. Cells are ids row * width + col as in MapLayout; every move costs 1.
+
+        This plans over cells only. Ghost motion is not part of the state as it is for the offline solvers;
+        callers mark the cells ghosts threaten as blocked and replan when they move.
+
+        Args:
+            layout (MapLayout): The map. Its walls are copied, set_wall() does not change the layout.
+            start (int): Cell the paths start from.
+            targets (iterable[int]): Goal cells.
+            blocked (iterable[int]): Free cells that can't be entered for now.
+        """
+        self.height, self.width = layout.height, layout.width
+        cells = self.height * self.width
+        self.walls = layout.walls.reshape(-1).tolist()
+        """ adjacent[cell] = [(action, neighbour), ...] for every neighbour on the map, walls included """
+        self.adjacent = [[] for _ in range(cells)]
+        for cell in range(cells):
+            x, y = divmod(cell, self.width)
+            for action, (dx, dy) in MOVES:
+                if layout.in_bounds(x + dx, y + dy):
+                    self.adjacent[cell].append((action, (x + dx) * self.width + y + dy))
+
+        self.g = [math.inf] * cells
+        self.rhs = [math.inf] * cells
+        self.open_list = []
+        self.open_entries = {}
+        self.counter = count()
+        self.km = 0
+        self.start = self.last = start
+        self.targets = set()
+        self.blocked = set()
+
+        self.expanded = 0
+        self.last_expanded = 0
+        self.last_replan_time = 0.0
+
+        self.set_targets(targets)
+        self.set_blocked(blocked)
+
+    def is_passable(self, cell):
+        return not self.walls[cell] and cell not in self.blocked
+
+    def heuristic(self, cell):
+        x1, y1 = divmod(cell, self.width)
+        x2, y2 = divmod(self.start, self.width)
+        return abs(x1 - x2) + abs(y1 - y2)
+
+    def key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        return best + self.heuristic(cell) + self.km, best
+
+    """
+        Recomputes rhs(cell) from its neighbours and puts the cell on the open list if it is inconsistent
+        (g != rhs), or takes it off otherwise.
+    """
+    def update_vertex(self, cell):
+        if not self.is_passable(cell):
+            self.rhs[cell] = math.inf
+        elif cell in self.targets:
+            self.rhs[cell] = 0
+        else:
+            g = self.g
+            self.rhs[cell] = 1 + min((g[n] for _, n in self.adjacent[cell] if self.is_passable(n)), default=math.inf)
+
+        if self.g[cell] != self.rhs[cell]:
+            entry_id = next(self.counter)
+            self.open_entries[cell] = entry_id
+            heapq.heappush(self.open_list, (*self.key(cell), entry_id, cell))
+        else:
+            self.open_entries.pop(cell, None)
+
+    """ Drops stale entries and returns the best live one, or None """
+    def peek(self):
+        while self.open_list:
+            entry = self.open_list[0]
+            if self.open_entries.get(entry[3]) == entry[2]:
+                return entry
+            heapq.heappop(self.open_list)
+        return None
+
+    """
+        Expands inconsistent cells until the start is consistent and no open key is below the start's key.
+        Returns the number of expansions.
+    """
+    def compute_shortest_path(self):
+        expanded = 0
+        while True:
+            entry = self.peek()
+            if entry is None:
+                break
+            k_old = entry[:2]
+            if k_old >= self.key(self.start) and self.rhs[self.start] == self.g[self.start]:
+                break
+
+            cell = entry[3]
+            k_new = self.key(cell)
+            if k_old < k_new:
+                entry_id = next(self.counter)
+                self.open_entries[cell] = entry_id
+                heapq.heapreplace(self.open_list, (*k_new, entry_id, cell))
+                continue
+
+            heapq.heappop(self.open_list)
+            del self.open_entries[cell]
+            expanded += 1
+            if self.g[cell] > self.rhs[cell]:
+                self.g[cell] = self.rhs[cell]
+            else:
+                self.g[cell] = math.inf
+                self.update_vertex(cell)
+            for _, neighbour in self.adjacent[cell]:
+                self.update_vertex(neighbour)
+
+        self.expanded += expanded
+        return expanded
+
+    def move_start(self, cell):
+        if cell != self.start:
+            self.start = cell
+            self.km += self.heuristic(self.last)
+            self.last = cell
+
+    def set_targets(self, cells):
+        cells = set(cells)
+        changed = cells ^ self.targets
+        self.targets = cells
+        for cell in changed:
+            self.update_vertex(cell)
+
+    """
+        Blocking or freeing a cell changes the cost of every move into it, so its neighbours are updated too.
+    """
+    def set_blocked(self, cells):
+        cells = set(cells)
+        changed = cells ^ self.blocked
+        self.blocked = cells
+        self.update_cells(changed)
+
+    def set_wall(self, cell, is_wall):
+        if self.walls[cell] != is_wall:
+            self.walls[cell] = is_wall
+            self.update_cells([cell])
+
+    def update_cells(self, cells):
+        for cell in cells:
+            self.update_vertex(cell)
+            for _, neighbour in self.adjacent[cell]:
+                self.update_vertex(neighbour)
+
+    def replan(self, start, targets, blocked=()):
+        """
+        Applies what changed since the last call and repairs the plan. Unchanged inputs cost almost nothing,
+        so this can be called on every frame.
+
+        Args:
+            start (int): Current cell.
+            targets (iterable[int]): Current goal cells.
+            blocked (iterable[int]): Cells that can't be entered right now.
+
+        Returns:
+            int: Number of cells expanded by this call.
+        """
+        t = perf_counter()
+        self.move_start(start)
+        self.set_targets(targets)
+        self.set_blocked(blocked)
+        self.last_expanded = self.compute_shortest_path()
+        self.last_replan_time = perf_counter() - t
+        return self.last_expanded
+
+    """
+        Returns (action, cell) of the first move of a shortest path from the start, or None when the start is
+        a target or no target can be reached.
+    """
+    def next_move(self, cell=None):
+        cell = self.start if cell is None else cell
+        if cell in self.targets or self.g[cell] == math.inf:
+            return None
+        candidates = [(self.g[n], action, n) for action, n in self.adjacent[cell] if self.is_passable(n)]
+        g, action, neighbour = min(candidates, default=(math.inf, None, None))
+        return None if g == math.inf else (action, neighbour)
+
+    """ The moves of a shortest path from the start to the nearest target ([] if there is none) """
+    def path(self):
+        moves = []
+        cell = self.start
+        for _ in range(self.height * self.width):
+            move = self.next_move(cell)
+            if move is None:
+                break
+            moves.append(move[0])
+            cell = move[1]
+        return moves
+
+
+class Autopilot:
+    def __init__(self, layout: MapLayout):
+        """
+        Plays player mode with a DStarLite planner that is repaired, not rebuilt, whenever Pacman, a snack or
+        a ghost moves. It walks to the nearest snack it may eat ('A' snacks first, then 'B') around the cells
+        ghosts threaten. When no snack can be reached it waits, stepping aside if a ghost threatens its cell.
+        """
+        self.layout = layout
+        self.planner = None
+
+    """
+        Returns the next move ("U", "D", "L", "R") or None to wait. Positions are (row, col) pairs.
+    """
+    def next_move(self, player, a_snacks, b_snacks, ghost_cells):
+        to_cell = self.layout.to_cell
+        start = to_cell(*player)
+        targets = [to_cell(*snack) for snack in (a_snacks or b_snacks)]
+        threatened = {to_cell(*cell) for cell in ghost_cells if self.layout.in_bounds(*cell)}
+
+        if self.planner is None:
+            self.planner = DStarLite(self.layout, start)
+        self.planner.replan(start, targets, threatened - {start})
+        move = self.planner.next_move()
+        if move is None and start in threatened:
+            move = next(((action, cell) for action, cell in self.planner.adjacent[start]
+                         if self.planner.is_passable(cell)), None)
+        return None if move is None else move[0]
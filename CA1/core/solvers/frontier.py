@@ -0,0 +1,90 @@
+# File: core/solvers/frontier.py
+
+import heapq
+from itertools import count
+
+REMOVED = object()
+
+
+class PriorityFrontier:
+    def __init__(self, g_costs: dict, decrease_key: bool = False):
+        """
+        Open list for best-first searches, built on a binary heap (heapq).
+
+        Entries are ordered by f, then by h (among equal f, the node closest to the goal is expanded first),
+        then by insertion order, so states never have to be compared with each other.
+
+        When a state is pushed again with a better g, the old entry stays in the heap and is dropped on pop
+        because its g no longer matches g_costs (lazy deletion). With decrease_key=True the old entry is also
+        marked removed, so every state has at most one live entry and len() is exact.
+
+        Args:
+            g_costs (dict): The search's best known g per state. It is only read here.
+            decrease_key (bool): Track the live entry of every state and invalidate it on re-push.
+        """
+        self.heap = []
+        self.g_costs = g_costs
+        self.counter = count()
+        self.entry_finder = {} if decrease_key else None
+
+        self.pushes = 0
+        self.pops = 0
+        self.stale_skipped = 0
+        self.peak_size = 0
+
+    def push(self, state, g, h, f, item=None):
+        entry = [f, h, next(self.counter), g, state, item]
+        if self.entry_finder is not None:
+            old_entry = self.entry_finder.get(state)
+            if old_entry is not None:
+                old_entry[4] = REMOVED
+            self.entry_finder[state] = entry
+
+        heapq.heappush(self.heap, entry)
+        self.pushes += 1
+        if len(self.heap) > self.peak_size:
+            self.peak_size = len(self.heap)
+
+    """
+        Returns (f, g, state, item) of the best live entry, or None when the frontier is empty.
+    """
+    def pop(self):
+        while self.heap:
+            f, h, _, g, state, item = heapq.heappop(self.heap)
+            if state is REMOVED or g > self.g_costs.get(state, g):
+                self.stale_skipped += 1
+                continue
+            if self.entry_finder is not None:
+                del self.entry_finder[state]
+            self.pops += 1
+            return f, g, state, item
+        return None
+
+    """
+        Returns the f of the best live entry without removing it, or None when the frontier is empty.
+    """
+    def peek_f(self):
+        while self.heap:
+            f, _, _, g, state, _ = self.heap[0]
+            if state is REMOVED or g > self.g_costs.get(state, g):
+                heapq.heappop(self.heap)
+                self.stale_skipped += 1
+                continue
+            return f
+        return None
+
+    def __len__(self):
+        if self.entry_finder is not None:
+            return len(self.entry_finder)
+        return len(self.heap)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def get_stats(self):
+        return {
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "stale_skipped": self.stale_skipped,
+            "peak_size": self.peak_size,
+        }
@@ -0,0 +1,271 @@
+# File: core/solvers/hda_star_solver.py
+
+from ..environment.game import PacmanGame
+from ..environment.packed_game import PackedGame
+from .heuristics import mst_snack_heuristic
+from .frontier import PriorityFrontier
+from .render_history import RenderHistory
+from .search_stats import SearchStats
+from queue import Empty
+import math
+import multiprocessing
+import os
+import time
+
+BATCH_SIZE = 64  # nodes a worker expands between two looks at its inbox
+IDLE_WAIT = 0.05  # seconds an idle worker blocks on its inbox
+JOIN_TIMEOUT = 1
+
+WORKER_COUNTERS = ["nodes_expanded", "nodes_generated", "duplicates_pruned", "peak_frontier", "peak_visited",
+                   "successor_time", "heuristic_time"]
+
+
+"""
+    Index of the worker that owns 'state'. Packed states are tuples of ints, whose hash is the same in every
+    process (only str and bytes hashes are randomized), so all workers agree on it.
+"""
+def owner_of(state, workers):
+    return hash(state) % workers
+
+
+def hda_star_worker(worker_id, game, heuristic_func, inboxes, results, macro_actions=False, deadline=math.inf):
+    """
+    Body of one HDA* worker process. It owns the states with owner_of(state) == worker_id and keeps their
+    g costs, parents and open list. Successors owned by other workers are sent to them in batches.
+
+    Messages read from its inbox:
+        ("states", [(state, g, parent, action), ...]): successors generated by another worker.
+        ("incumbent", cost): cost of the best solution found so far; nodes with f >= cost are not expanded.
+        ("probe", wave): termination probe, answered with ("probe", wave, worker_id, sent, received, counters)
+            on 'results' once the worker is idle.
+        ("parent", state): answered with ("parent", state, parent, action) on 'results'.
+        ("exit",): stop.
+
+    Found goals are reported as ("solution", cost, state) on 'results'.
+
+    The worker also stops on its own once 'deadline' (a time.time() value) has passed or the process that
+    started it is gone (e.g. it was killed before it could send "exit"), so it never outlives the search.
+    """
+    packed_game = PackedGame(game, macro_actions)
+    workers = len(inboxes)
+    inbox = inboxes[worker_id]
+    stats = SearchStats("HDA*")
+
+    g_costs = {}
+    parents = {}
+    open_list = PriorityFrontier(g_costs)
+    outbox = [[] for _ in range(workers)]
+    incumbent = math.inf
+    sent = received = 0
+    probe = None
+
+    def add(state, g, parent, action):
+        if g >= g_costs.get(state, math.inf):
+            stats.duplicates_pruned += 1
+            return
+        g_costs[state] = g
+        parents[state] = (parent, action)
+        h = stats.heuristic(heuristic_func, packed_game, state)
+        if g + h < incumbent:
+            open_list.push(state, g, h, g + h)
+
+    if owner_of(packed_game.initial_state, workers) == worker_id:
+        add(packed_game.initial_state, 0, None, None)
+
+    parent_pid = os.getppid()
+
+    def stop():
+        for queue in inboxes + [results]:
+            queue.cancel_join_thread()
+
+    idle = False
+    while True:
+        if time.time() > deadline or os.getppid() != parent_pid:
+            stop()
+            return
+
+        block = idle
+        while True:
+            try:
+                message = inbox.get(timeout=IDLE_WAIT) if block else inbox.get_nowait()
+            except Empty:
+                break
+            block = False
+
+            kind = message[0]
+            if kind == "states":
+                received += 1
+                for state, g, parent, action in message[1]:
+                    add(state, g, parent, action)
+            elif kind == "incumbent":
+                incumbent = min(incumbent, message[1])
+            elif kind == "probe":
+                probe = message[1]
+            elif kind == "parent":
+                results.put(("parent", message[1], *parents[message[1]]))
+            elif kind == "exit":
+                stop()
+                return
+
+        for _ in range(BATCH_SIZE):
+            f = open_list.peek_f()
+            if f is None or f >= incumbent:
+                break
+            _, g, state, _ = open_list.pop()
+
+            if packed_game.is_goal(state):
+                incumbent = g
+                results.put(("solution", g, state))
+                continue
+
+            for next_state, action, cost in stats.expand(packed_game, state):
+                owner = owner_of(next_state, workers)
+                if owner == worker_id:
+                    add(next_state, g + cost, state, action)
+                else:
+                    outbox[owner].append((next_state, g + cost, state, action))
+
+        for owner, batch in enumerate(outbox):
+            if batch:
+                inboxes[owner].put(("states", batch))
+                outbox[owner] = []
+                sent += 1
+        stats.observe(len(open_list), len(g_costs))
+
+        f = open_list.peek_f()
+        idle = f is None or f >= incumbent
+        if idle and probe is not None:
+            counters = {name: getattr(stats, name) for name in WORKER_COUNTERS}
+            results.put(("probe", probe, worker_id, sent, received, counters))
+            probe = None
+
+
+"""
+    Rebuilds the path to 'goal' by asking the owner of every state on it for its parent. Returns None when an
+    owner died or 'deadline' passed before it answered, instead of waiting forever.
+"""
+def rebuild_path(goal, inboxes, results, processes, deadline):
+    workers = len(inboxes)
+    path = []
+    state = goal
+    while True:
+        owner = owner_of(state, workers)
+        inboxes[owner].put(("parent", state))
+        while True:
+            try:
+                message = results.get(timeout=IDLE_WAIT)
+            except Empty:
+                if not processes[owner].is_alive():
+                    print(f"HDA*: Worker {owner} died while the path was rebuilt.")
+                    return None
+                if time.time() > deadline:
+                    print("HDA*: Timeout reached while the path was rebuilt.")
+                    return None
+                continue
+            if message[0] == "parent" and message[1] == state:
+                break
+        _, _, parent, action = message
+        if parent is None:
+            break
+        path.append(action)
+        state = parent
+    path.reverse()
+    return path
+
+
+def hda_star_solver(game: PacmanGame, heuristic_func=mst_snack_heuristic, workers=None, timeout=120, stats=None,
+                    macro_actions=False):
+    """
+    Hash Distributed A* (HDA*): A* spread over 'workers' processes (one per CPU by default).
+
+    Every state belongs to one worker, picked by its hash. Workers expand their own best nodes and send
+    successors to their owners, so each state is only stored and deduplicated in one place. When a worker
+    pops a goal it reports its cost, and this process broadcasts it so everyone stops expanding nodes with
+    f >= that cost. With an admissible heuristic the solution is optimal once every worker is idle and no
+    message is in flight.
+
+    Termination is detected with Mattern's four-counter method: this process sends probe waves, every
+    worker answers once idle with how many batches it has sent and received, and the search is over when
+    two waves in a row report the same totals with sent == received. The path is then rebuilt by asking
+    the owner of every state on it for its parent.
+
+    Single core machines get no speedup from this, only the messaging overhead.
+    """
+    start_time = time.time()
+    stats = stats or SearchStats("HDA*")
+    stats.start()
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    packed_game = PackedGame(game, macro_actions)
+
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+    deadline = start_time + timeout
+    processes = [context.Process(target=hda_star_worker, args=(i, game, heuristic_func, inboxes, results, macro_actions,
+                                                               deadline), daemon=True) for i in range(workers)]
+    print(f"HDA*: Starting search with {workers} workers...")
+    for process in processes:
+        process.start()
+
+    best_cost, best_state = math.inf, None
+    worker_counters = {}
+    wave, replies, previous_totals = 0, {}, None
+    found_path = None
+    try:
+        for inbox in inboxes:
+            inbox.put(("probe", wave))
+
+        terminated = False
+        while not terminated:
+            if time.time() - start_time > timeout:
+                print("HDA*: Timeout reached.")
+                break
+            try:
+                message = results.get(timeout=IDLE_WAIT)
+            except Empty:
+                continue
+
+            if message[0] == "solution" and message[1] < best_cost:
+                best_cost, best_state = message[1], message[2]
+                print(f"HDA*: Found a solution of cost {best_cost} after {time.time() - start_time:.2f}s")
+                for inbox in inboxes:
+                    inbox.put(("incumbent", best_cost))
+            elif message[0] == "probe" and message[1] == wave:
+                _, _, worker_id, sent, received, counters = message
+                replies[worker_id] = (sent, received)
+                worker_counters[worker_id] = counters
+                if len(replies) == workers:
+                    totals = tuple(map(sum, zip(*replies.values())))
+                    terminated = totals[0] == totals[1] and totals == previous_totals
+                    previous_totals = totals
+                    wave, replies = wave + 1, {}
+                    if not terminated:
+                        for inbox in inboxes:
+                            inbox.put(("probe", wave))
+
+        if terminated and best_state is not None:
+            found_path = rebuild_path(best_state, inboxes, results, processes, deadline)
+    finally:
+        for inbox in inboxes:
+            inbox.put(("exit",))
+        for process in processes:
+            process.join(JOIN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    for counters in worker_counters.values():
+        for name in WORKER_COUNTERS:
+            setattr(stats, name, getattr(stats, name) + counters[name])
+    stats.finish(found_path)
+    print(stats.summary())
+
+    if found_path is None:
+        print("HDA*: No solution found.")
+        return None
+
+    print(f"HDA*: Goal reached. Path length = {len(found_path)}")
+    history = RenderHistory(packed_game, found_path, stats=stats)
+    print(f"HDA*: Render history ready ({len(history)} frames).")
+    return history
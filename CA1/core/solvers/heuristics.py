@@ -1,5 +1,6 @@
 
-from ..environment.game import PacmanGame
+from ..environment.packed_game import PackedGame
+from collections import OrderedDict
 import math
 """
 Heuristic functions for informed search algorithms.
@@ -8,54 +9,191 @@ Heuristic functions for informed search algorithms.
 def manhattan_distance(pos1, pos2):
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
-def farthest_snack_heuristic(game: PacmanGame):
+def farthest_snack_heuristic(game: PackedGame, state):
 
-    player_pos = game.player 
-    remaining_snacks = [s for s in game.snacks if s.exists]
+    player_pos = game.player_position(state)
+    remaining_snacks = [pos for _, pos, _ in game.remaining_snacks(state)]
 
     if not remaining_snacks:
         return 0  
 
     max_dist = 0
     for snack in remaining_snacks:
-        snack_pos = (snack.y, snack.x)
-        dist = manhattan_distance(player_pos, snack_pos)
+        dist = manhattan_distance(player_pos, snack)
         if dist > max_dist:
             max_dist = dist
             
     return max_dist
 
 
-def manhattan_to_nearest_snack(game: PacmanGame):
+def manhattan_to_nearest_snack(game: PackedGame, state):
 
-    player_pos = game.player
-    remaining_snacks = [s for s in game.snacks if s.exists]
+    player_pos = game.player_position(state)
+    remaining_snacks = [pos for _, pos, _ in game.remaining_snacks(state)]
 
     if not remaining_snacks:
         return 0  
 
     min_dist = float("inf")
     for snack in remaining_snacks:
-        snack_pos = (snack.y, snack.x)
-        dist = manhattan_distance(player_pos, snack_pos)
+        dist = manhattan_distance(player_pos, snack)
         if dist < min_dist:
             min_dist = dist
 
     return min_dist
-def straight_line_towards_goal(game: PacmanGame):
+def straight_line_towards_goal(game: PackedGame, state):
 
-    player_pos = game.player
-    remaining_snacks = [s for s in game.snacks if s.exists]
+    player_pos = game.player_position(state)
+    remaining_snacks = [pos for _, pos, _ in game.remaining_snacks(state)]
 
     if not remaining_snacks:
         return 0
 
     min_dist = float("inf")
     for snack in remaining_snacks:
-        dy = player_pos[0] - snack.y
-        dx = player_pos[1] - snack.x
+        dy = player_pos[0] - snack[0]
+        dx = player_pos[1] - snack[1]
         dist = math.sqrt(dy * dy + dx * dx)
         if dist < min_dist:
             min_dist = dist
 
-    return min_dist
\ No newline at end of file
+    return min_dist
+
+
+"""
+Maze-distance heuristics. They read the distances PackedGame.get_snack_distances() precomputes from
+the map's DistanceTable, so every lookup is O(1) and walls are taken into account.
+"""
+
+def maze_farthest_snack_heuristic(game: PackedGame, state):
+
+    player = state[0]
+    snack_distances = game.get_snack_distances()
+
+    return max((snack_distances[i][player] for i, _, _ in game.remaining_snacks(state)), default=0)
+
+
+def maze_ordered_snack_heuristic(game: PackedGame, state):
+    """
+    Like maze_farthest_snack_heuristic, but knows that every 'A' is eaten before any 'B': Pacman has to
+    reach the farthest 'A', and after its last 'A' still has to walk to the farthest 'B' from there.
+    """
+    player = state[0]
+    snack_distances = game.get_snack_distances()
+
+    a_left, b_left = [], []
+    for i, _, snack_type in game.remaining_snacks(state):
+        (a_left if snack_type == 'A' else b_left).append(i)
+
+    if not a_left or not b_left:
+        return max((snack_distances[i][player] for i in a_left + b_left), default=0)
+
+    to_all_a = max(snack_distances[i][player] for i in a_left)
+    after_last_a = min(max(snack_distances[j][game.snack_cells[i]] for j in b_left) for i in a_left)
+    return to_all_a + after_last_a
+
+
+class MSTSnackHeuristic:
+    def __init__(self, max_size=200_000):
+        """
+        Admissible heuristic: the walk to the closest snack Pacman may eat next, plus a minimum spanning tree
+        (by maze distance) over the remaining snacks.
+
+        Every 'A' is eaten before any 'B', so the snacks form two groups: Pacman walks to the first 'A', at
+        least an MST of the 'A's while eating them, from the last 'A' to the first 'B' (at least the closest
+        A-B pair) and at least an MST of the 'B's after that. Only the walk to the first snack depends on
+        where Pacman is; the rest depends on the remaining snacks alone and is memoized in an LRU cache
+        keyed by the snack bitmask. The cache and its hit/miss counters start over for every new game.
+
+        Args:
+            max_size (int): Maximum number of snack bitmasks kept in the cache.
+        """
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.game = None
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, game: PackedGame, state):
+        if game is not self.game:
+            self.game = game
+            self.cache.clear()
+            self.hits = self.misses = 0
+
+        player, _, mask = state
+        if mask == 0:
+            return 0
+
+        snack_distances = game.get_snack_distances()
+        first_group = mask & game.a_mask or mask
+        to_first = min(snack_distances[i][player] for i in self._bits(first_group))
+
+        return to_first + self._snacks_cost(game, mask)
+
+    def _snacks_cost(self, game, mask):
+        cost = self.cache.get(mask)
+        if cost is not None:
+            self.hits += 1
+            self.cache.move_to_end(mask)
+            return cost
+
+        self.misses += 1
+        snack_distances = game.get_snack_distances()
+        a_left = self._bits(mask & game.a_mask)
+        b_left = self._bits(mask & ~game.a_mask)
+
+        cost = self._mst(game, a_left) + self._mst(game, b_left)
+        if a_left and b_left:
+            cost += min(snack_distances[j][game.snack_cells[i]] for i in a_left for j in b_left)
+
+        self.cache[mask] = cost
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        return cost
+
+    @staticmethod
+    def _bits(mask):
+        bits = []
+        i = 0
+        while mask:
+            if mask & 1:
+                bits.append(i)
+            mask >>= 1
+            i += 1
+        return bits
+
+    """
+        Prim's algorithm on the complete graph of the given snacks, weighted by maze distance.
+    """
+    @staticmethod
+    def _mst(game, snacks):
+        if len(snacks) < 2:
+            return 0
+        snack_distances = game.get_snack_distances()
+        cells = [game.snack_cells[i] for i in snacks]
+
+        best = [snack_distances[snacks[0]][cell] for cell in cells]
+        in_tree = [False] * len(snacks)
+        in_tree[0] = True
+        total = 0
+        for _ in range(len(snacks) - 1):
+            k = min((j for j in range(len(snacks)) if not in_tree[j]), key=best.__getitem__)
+            in_tree[k] = True
+            total += best[k]
+            row = snack_distances[snacks[k]]
+            for j, cell in enumerate(cells):
+                if not in_tree[j] and row[cell] < best[j]:
+                    best[j] = row[cell]
+        return total
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.cache),
+        }
+
+
+mst_snack_heuristic = MSTSnackHeuristic()
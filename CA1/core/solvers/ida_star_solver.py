@@ -0,0 +1,30 @@
+# File: core/solvers/ida_star_solver.py
+
+from ..environment.game import PacmanGame
+from ..environment.packed_game import PackedGame
+from .heuristics import mst_snack_heuristic
+from .iterative_deepening import iterative_deepening
+from .render_history import RenderHistory
+from .search_stats import SearchStats
+
+def ida_star_solver(game: PacmanGame, heuristic_func=mst_snack_heuristic, timeout=120, stats=None, macro_actions=False):
+    """
+    IDA*: iterative deepening on f = g + h. It finds optimal solutions (with an admissible heuristic)
+    while only keeping the current path and a bounded transposition table in memory.
+    """
+    stats = stats or SearchStats("IDA*")
+    stats.start()
+    packed_game = PackedGame(game, macro_actions)
+
+    print("IDA*: Starting search...")
+    found_path = iterative_deepening(packed_game, heuristic_func, timeout=timeout, label="IDA*", stats=stats)
+    stats.finish(found_path)
+    print(stats.summary())
+
+    if found_path is None:
+        print("IDA*: No solution found.")
+        return None
+
+    history = RenderHistory(packed_game, found_path, stats=stats)
+    print(f"IDA*: Render history ready ({len(history)} frames).")
+    return history
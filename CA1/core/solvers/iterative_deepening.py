@@ -0,0 +1,128 @@
+# File: core/solvers/iterative_deepening.py
+
+from ..environment.packed_game import PackedGame
+from .search_stats import SearchStats
+from time import perf_counter
+import math
+import time
+
+MAX_TRANSPOSITION_TABLE_SIZE = 2_000_000
+TIME_CHECK_INTERVAL = 1024
+
+
+def bounded_dfs(game: PackedGame, bound, heuristic_func=None, deadline=None, transposition_table=None,
+                max_table_size=MAX_TRANSPOSITION_TABLE_SIZE, stats=None):
+    """
+    One iteration of IDS / IDA*: a depth-first search that skips every node with f = g + h > bound.
+
+    The search uses an explicit stack, so deep maps don't hit Python's recursion limit. The current path is
+    kept in a set that is updated in place while backtracking, so cycles are cut without copying anything.
+    'transposition_table' remembers the smallest g every state was reached with in this iteration; a state
+    reached again with a g that is not smaller can't lead to anything new and is skipped. Once it holds
+    'max_table_size' states, no new states are added (known ones are still updated).
+
+    Args:
+        game (PackedGame): The packed game to search.
+        bound (int): f limit of this iteration (the depth limit when heuristic_func is None).
+        heuristic_func (callable, optional): h(game, state). None means h = 0, i.e. plain IDS.
+        deadline (float, optional): time.time() value after which the search gives up.
+        transposition_table (dict, optional): Table to use; it is cleared first. A new one by default.
+        stats (SearchStats, optional): Counters to add this iteration's work to.
+
+    Returns:
+        tuple: (path, next_bound, expanded, timed_out). 'path' is the list of moves to the goal or None,
+        'next_bound' the smallest f that was over the bound (math.inf if nothing was cut).
+    """
+    h = heuristic_func or (lambda _game, _state: 0)
+    stats = stats or SearchStats()
+    table = {} if transposition_table is None else transposition_table
+    table.clear()
+
+    root = game.initial_state
+    if game.is_goal(root):
+        return [], bound, 0, False
+
+    next_bound = math.inf
+    expanded = 0
+
+    path = []
+    on_path = {root}
+    table[root] = 0
+    stack = [(root, 0, iter(stats.expand(game, root)))]
+
+    while stack:
+        state, g, successors = stack[-1]
+
+        next_entry = next(successors, None)
+        if next_entry is None:
+            stack.pop()
+            on_path.discard(state)
+            if path:
+                path.pop()
+            continue
+
+        next_state, action, cost = next_entry
+        next_g = g + cost
+        t = perf_counter()
+        is_duplicate = next_state in on_path or table.get(next_state, math.inf) <= next_g
+        stats.hash_time += perf_counter() - t
+        if is_duplicate:
+            stats.duplicates_pruned += 1
+            continue
+
+        f = next_g + stats.heuristic(h, game, next_state)
+        if f > bound:
+            next_bound = min(next_bound, f)
+            continue
+
+        if next_state in table or len(table) < max_table_size:
+            table[next_state] = next_g
+
+        if game.is_goal(next_state):
+            return path + [action], next_bound, expanded, False
+
+        expanded += 1
+        stats.observe(len(stack), len(table))
+        if deadline is not None and expanded % TIME_CHECK_INTERVAL == 0 and time.time() > deadline:
+            return None, next_bound, expanded, True
+
+        path.append(action)
+        on_path.add(next_state)
+        stack.append((next_state, next_g, iter(stats.expand(game, next_state))))
+
+    return None, next_bound, expanded, False
+
+
+def iterative_deepening(game: PackedGame, heuristic_func=None, timeout=120, label="IDS", stats=None):
+    """
+    Runs bounded_dfs with growing bounds until it finds a solution. IDS (heuristic_func=None) starts at
+    depth 1, IDA* at h(initial state); every next iteration uses the smallest f that was cut off, which for
+    IDS is one level deeper. Both reuse one transposition table dict between iterations.
+
+    Returns the list of moves, or None on timeout or when the search space is exhausted.
+    """
+    deadline = time.time() + timeout
+    transposition_table = {}
+
+    bound = 1 if heuristic_func is None else heuristic_func(game, game.initial_state)
+    stats = stats or SearchStats(label)
+    while bound < math.inf:
+        if time.time() > deadline:
+            print(f"{label}: Timeout reached.")
+            return None
+
+        print(f"{label}: Trying bound {bound}...")
+        path, next_bound, expanded, timed_out = bounded_dfs(
+            game, bound, heuristic_func, deadline, transposition_table, stats=stats)
+
+        if timed_out:
+            print(f"{label}: Timeout reached.")
+            return None
+        if path is not None:
+            print(f"{label}: Found a solution at bound {bound} with {len(path)} moves ({expanded} nodes expanded).")
+            return path
+
+        bound = next_bound
+
+    print(f"{label}: Search space exhausted. No solution found.")
+    return None
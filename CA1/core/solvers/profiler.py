@@ -0,0 +1,177 @@
+# File: core/solvers/profiler.py
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+
+TOP_ALLOCATIONS = 30  # allocation sites listed in the .allocations.txt report
+TRACEMALLOC_FRAMES = 8  # stack depth tracemalloc records per allocation
+MEMORY_SAMPLE_INTERVAL = 0.5  # seconds between two looks at the traced memory
+MIN_STACK_TIME = 1e-6  # stacks that took less than this many seconds are left out
+MAX_STACK_DEPTH = 64
+
+
+"""
+    File name prefix for the reports of one (map, solver) run, e.g. ("maps/map4.txt", "Weighted A*") gives
+    "map4_Weighted_Astar".
+"""
+def profile_name(file_path, solver_mode):
+    name = f"{os.path.splitext(os.path.basename(file_path))[0]}_{solver_mode.replace('*', 'star')}"
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+def profile_solver(solver, game, output_dir, name, timeout=10, stats=None, trace_memory=True):
+    """
+    Runs solver(game, timeout=timeout, stats=stats) under cProfile and tracemalloc and writes its reports to
+    'output_dir':
+        <name>.pstats: the raw cProfile data, for pstats, snakeviz, gprof2dot, ...
+        <name>.collapsed: collapsed stacks ("caller;callee;... microseconds" per line), the input format of
+            flamegraph.pl, speedscope and inferno. See write_collapsed_stacks.
+        <name>.allocations.txt: the TOP_ALLOCATIONS source lines holding the most memory at the largest heap
+            seen while the solver ran (see MemorySampler), which is when its frontier and visited set are
+            full, not after it returned and freed them.
+
+    Both profilers slow the solver down (tracemalloc by several times), so times measured here are only
+    meaningful relative to each other. Work done in other processes (HDA* workers) is not seen.
+
+    Args:
+        solver (callable): A solver function from SOLVERS.
+        game (PacmanGame): The game to solve. It is passed as is, copy it first if it must not change.
+        output_dir (str): Directory the reports are written to. It is created if needed.
+        name (str): File name prefix of the reports, see profile_name.
+        timeout (int): Time limit passed to the solver.
+        stats (SearchStats, optional): Passed to the solver.
+        trace_memory (bool): Also run tracemalloc.
+
+    Returns:
+        tuple: (the solver's output, elapsed seconds, list of written report paths)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    profiler = cProfile.Profile()
+    if trace_memory:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    sampler = MemorySampler() if trace_memory else None
+    t1 = time.time()
+    profiler.enable()
+    try:
+        result = solver(game, timeout=timeout, stats=stats)
+    finally:
+        profiler.disable()
+        elapsed = time.time() - t1
+        if sampler is not None:
+            sampler.stop()
+            tracemalloc.stop()
+
+    base = os.path.join(output_dir, name)
+    paths = [base + ".pstats", base + ".collapsed"]
+    profiler.dump_stats(paths[0])
+    write_collapsed_stacks(pstats.Stats(profiler), paths[1])
+    if sampler is not None:
+        paths.append(base + ".allocations.txt")
+        write_allocations(sampler.snapshot, sampler.snapshot_size, sampler.peak, paths[2])
+    return result, elapsed, paths
+
+
+class MemorySampler:
+    def __init__(self):
+        """
+        Keeps a tracemalloc snapshot of the largest heap seen. A thread looks at the traced memory every
+        MEMORY_SAMPLE_INTERVAL seconds and takes a new snapshot whenever it grew by more than 10% since the
+        last one, so a solver that keeps growing is snapshotted O(log(size)) times. tracemalloc must be running.
+        """
+        self.snapshot = tracemalloc.take_snapshot()
+        self.snapshot_size = tracemalloc.get_traced_memory()[0]
+        self.peak = self.snapshot_size
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.done.wait(MEMORY_SAMPLE_INTERVAL):
+            self.sample()
+
+    def sample(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        if current > self.snapshot_size * 1.1:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    """ Stops the thread, taking a last sample; call it before tracemalloc.stop() """
+    def stop(self):
+        self.done.set()
+        self.thread.join()
+        self.sample()
+
+
+def function_label(function):
+    file_name, line, function_name = function
+    if file_name == "~":
+        return function_name
+    return f"{function_name} ({os.path.basename(file_name)}:{line})"
+
+
+"""
+    Writes 'stats' (a pstats.Stats) as collapsed stacks, one "root;...;function microseconds" line per stack.
+
+    cProfile only records caller -> callee edges, not whole stacks, so stacks are rebuilt top down from the
+    functions nobody called: a callee gets the share of its cumulative time that went through each caller
+    edge, and its own time is split in the same proportions. This is exact for call trees and a good estimate
+    for functions called from many places. Recursive calls are folded into the first frame of the function,
+    and stacks shorter than MIN_STACK_TIME are dropped.
+"""
+def write_collapsed_stacks(stats, file_path):
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[function] = edge[3]
+
+    lines = {}
+
+    def walk(function, stack, share):
+        _, _, own_time, total_time, _ = stats.stats[function]
+        stack = stack + [function_label(function)]
+        key = ";".join(stack)
+        lines[key] = lines.get(key, 0) + own_time * share
+        if len(stack) >= MAX_STACK_DEPTH or total_time <= 0:
+            return
+        for callee, edge_time in callees.get(function, {}).items():
+            callee_total = stats.stats[callee][3]
+            if function_label(callee) in stack or share * edge_time < MIN_STACK_TIME:
+                continue
+            walk(callee, stack, share * edge_time / callee_total)
+
+    roots = [function for function, (_, _, _, _, callers) in stats.stats.items() if not callers]
+    for root in roots:
+        walk(root, [], 1.0)
+
+    with open(file_path, "w") as f:
+        for stack, seconds in lines.items():
+            microseconds = round(seconds * 1e6)
+            if microseconds > 0:
+                f.write(f"{stack} {microseconds}\n")
+
+
+def write_allocations(snapshot, snapshot_size, peak, file_path):
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, threading.__file__)))
+    top = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+    with open(file_path, "w") as f:
+        f.write(f"Peak traced memory: {peak / 2**20:.1f} MB\n")
+        f.write(f"Traced memory when the snapshot was taken: {snapshot_size / 2**20:.1f} MB\n\n")
+        f.write(f"Top {len(top)} allocation sites:\n")
+        for stat in top:
+            frame = stat.traceback[0]
+            f.write(f"{stat.size / 2**10:12.1f} KB {stat.count:10} blocks  {frame.filename}:{frame.lineno}\n")
+
+
+"""
+    Prints the 'limit' functions with the highest own time from a .pstats file.
+"""
+def print_hot_spots(pstats_path, limit=10):
+    pstats.Stats(pstats_path).sort_stats(pstats.SortKey.TIME).print_stats(limit)
@@ -0,0 +1,69 @@
+# File: core/solvers/registry.py
+
+from collections.abc import MutableMapping
+from importlib import import_module, metadata
+
+""" Installed packages can add solvers by declaring entry points in this group """
+ENTRY_POINT_GROUP = "pacman.solvers"
+
+
+class SolverRegistry(MutableMapping):
+    def __init__(self, solvers=None):
+        """
+        Maps solver modes ("BFS", "A*", ...) to solver functions, importing each solver module only when its
+        mode is first looked up, so importing config.py (and everything that imports it) stays cheap.
+
+        Entries are either solver functions or import paths "package.module:function". Iterating, 'in' and
+        len() only look at the names and never import anything.
+
+        Args:
+            solvers (dict, optional): Initial entries, mode -> function or import path.
+        """
+        self.entries = dict(solvers or {})
+
+    def __getitem__(self, mode):
+        entry = self.entries[mode]
+        if isinstance(entry, str):
+            module_name, _, attribute = entry.partition(":")
+            entry = getattr(import_module(module_name), attribute)
+            self.entries[mode] = entry
+        elif isinstance(entry, metadata.EntryPoint):
+            entry = entry.load()
+            self.entries[mode] = entry
+        return entry
+
+    def __setitem__(self, mode, solver):
+        self.entries[mode] = solver
+
+    def __delitem__(self, mode):
+        del self.entries[mode]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    """
+        Tells if the solver of 'mode' has been imported yet.
+    """
+    def is_loaded(self, mode):
+        return not isinstance(self.entries[mode], (str, metadata.EntryPoint))
+
+    """
+        Adds the solvers declared by installed packages in the 'group' entry point group, e.g. in a plugin's
+        pyproject.toml:
+
+            [project.entry-points."pacman.solvers"]
+            "Greedy" = "pacman_greedy.solver:greedy_solver"
+
+        The entry point name is the solver mode shown in menus and tables. Plugins are not imported here,
+        and modes that are already registered are kept. Returns the list of added modes.
+    """
+    def load_plugins(self, group=ENTRY_POINT_GROUP):
+        added = []
+        for entry_point in metadata.entry_points(group=group):
+            if entry_point.name not in self.entries:
+                self.entries[entry_point.name] = entry_point
+                added.append(entry_point.name)
+        return added
@@ -0,0 +1,56 @@
+# File: core/solvers/render_history.py
+
+from ..environment.packed_game import PackedGame
+
+
+class RenderHistory:
+    def __init__(self, game: PackedGame, path: list, initial_state=None, stats=None):
+        """
+        The GUI history of a solution, built lazily from its moves.
+
+        Iterating yields the same (move, info) frames the solvers used to return as a list: ('', info) for
+        the initial state, then (move, info) after every move, where info is PackedGame.get_info(). Frames
+        are produced one at a time while replaying the moves, so the renderer can start with the first
+        frame right away and only one frame is in memory at a time.
+
+        Args:
+            game (PackedGame): The packed game the solution was found on.
+            path (list[str]): The moves of the solution. Macro actions are strings of several moves.
+            initial_state (tuple, optional): State the moves start from. Defaults to game.initial_state.
+            stats (SearchStats, optional): Statistics of the search that found the solution.
+        """
+        self.game = game
+        self.path = path
+        self.initial_state = game.initial_state if initial_state is None else initial_state
+        self.stats = stats
+
+    """
+        Number of frames, including the initial one. Macro actions ("UUL") count one frame per unit move.
+    """
+    def __len__(self):
+        return sum(len(move) for move in self.path) + 1
+
+    def __iter__(self):
+        return self.iter_frames()
+
+    def iter_states(self):
+        state = self.initial_state
+        yield '', state
+        for move in (unit_move for macro in self.path for unit_move in macro):
+            for next_state, action, _ in self.game.get_unit_next_states(state):
+                if action == move:
+                    state = next_state
+                    break
+            else:
+                raise ValueError(f"Could not simulate move '{move}' during history generation.")
+            yield move, state
+
+    def iter_frames(self):
+        for move, state in self.iter_states():
+            yield move, self.game.get_info(state)
+
+    """
+        Builds every frame at once, in the list format returned by the solvers before RenderHistory.
+    """
+    def to_list(self):
+        return list(self.iter_frames())
@@ -0,0 +1,226 @@
+# File: core/solvers/replay.py
+
+from ..environment.game import PacmanGame
+from ..environment.ghost import Ghost
+from ..environment.snack import Snack
+from ..environment.packed_game import PackedGame
+from ..environment.map_layout import MOVES
+import struct
+import numpy as np
+
+REPLAY_MAGIC = b"PACREPLY"
+REPLAY_VERSION = 1
+KEYFRAME_INTERVAL = 64  # frames between two stored states; seeking replays at most this many moves
+
+HEADER = struct.Struct("<8sHHHHHII")  # magic, version, height, width, snacks, ghosts, keyframe interval, moves
+SNACK = struct.Struct("<HHc")  # x, y, type
+GHOST = struct.Struct("<HHHHcbH")  # x, y, center x, center y, axis, direction, radius (NO_RADIUS for None)
+KEYFRAME = struct.Struct("<II")  # player cell, time step; followed by the snack mask
+EATEN = struct.Struct("<IH")  # frame, snack index
+COUNT = struct.Struct("<I")
+NO_RADIUS = 0xFFFF
+
+MOVE_CODES = {action: code for code, (action, _) in enumerate(MOVES)}
+
+
+class Replay:
+    def __init__(self, game: PackedGame, moves, initial_state=None, keyframe_interval=KEYFRAME_INTERVAL, stats=None,
+                 keyframes=None, eaten=None):
+        """
+        A solution stored as its moves, with the snacks eaten on the way and a keyframe (the packed state)
+        every 'keyframe_interval' frames. Ghost positions are never stored, they follow from the time step
+        through the game's GhostSchedule.
+
+        A frame is rebuilt from the keyframe before it by replaying at most keyframe_interval - 1 moves, so
+        seeking costs O(keyframe_interval) whatever the length of the solution, and memory is one byte per
+        move plus one packed state per keyframe instead of a full get_info() list per frame.
+
+        It can be used wherever a RenderHistory is: iterating yields the same ('', info), (move, info) frames
+        and len() is the number of frames. save() and Replay.load() store it in a binary file together with
+        the map, so it can be played again without the map file or a solver.
+
+        Args:
+            game (PackedGame): The game the moves are played on.
+            moves (iterable[str]): The moves; macro actions ("UUL") are split into unit moves.
+            initial_state (tuple, optional): State the moves start from. Defaults to game.initial_state.
+            keyframe_interval (int): Frames between two keyframes.
+            stats (SearchStats, optional): Statistics of the search that found the solution (not saved).
+            keyframes (list[tuple], optional): Known keyframes (as read by load()); computed when None.
+            eaten (dict, optional): Known eaten snacks, frame -> snack index; computed with the keyframes.
+
+        Raises:
+            ValueError: If a move runs into a wall or a ghost.
+        """
+        self.game = game
+        self.moves = "".join(moves)
+        self.initial_state = game.initial_state if initial_state is None else initial_state
+        self.keyframe_interval = keyframe_interval
+        self.stats = stats
+
+        self.keyframes = keyframes
+        """ eaten[frame] = index of the snack eaten by the move leading to 'frame' """
+        self.eaten = eaten
+        if keyframes is None:
+            self.build_keyframes()
+
+    def build_keyframes(self):
+        keyframe_interval = self.keyframe_interval
+        self.keyframes = []
+        self.eaten = {}
+        state = self.initial_state
+        for frame, move in enumerate(self.moves, start=1):
+            if (frame - 1) % keyframe_interval == 0:
+                self.keyframes.append(state)
+            next_state = self.step(state, move)
+            if next_state[2] != state[2]:
+                self.eaten[frame] = (state[2] ^ next_state[2]).bit_length() - 1
+            state = next_state
+        if len(self.moves) % keyframe_interval == 0:
+            self.keyframes.append(state)
+
+    """ Builds the replay of a solver's RenderHistory """
+    @classmethod
+    def from_history(cls, history, keyframe_interval=KEYFRAME_INTERVAL):
+        return cls(history.game, history.path, history.initial_state, keyframe_interval, history.stats)
+
+    def step(self, state, move):
+        for next_state, action, _ in self.game.get_unit_next_states(state):
+            if action == move:
+                return next_state
+        raise ValueError(f"Could not simulate move '{move}' in replay.")
+
+    def __len__(self):
+        return len(self.moves) + 1
+
+    def __iter__(self):
+        return self.iter_frames()
+
+    """ Packed state at 'frame' (0 is the initial state) """
+    def state_at(self, frame):
+        if not 0 <= frame < len(self):
+            raise IndexError(f"Frame {frame} out of range 0 .. {len(self) - 1}")
+        keyframe = frame // self.keyframe_interval
+        state = self.keyframes[keyframe]
+        for move in self.moves[keyframe * self.keyframe_interval:frame]:
+            state = self.step(state, move)
+        return state
+
+    """ The (move, info) frame at index 'frame', as produced by iterating """
+    def frame(self, frame):
+        return (self.moves[frame - 1] if frame > 0 else ''), self.game.get_info(self.state_at(frame))
+
+    """ Yields the frames from 'start' on; start = len(self) yields nothing """
+    def iter_frames(self, start=0):
+        if start == len(self):
+            return
+        state = self.state_at(start)
+        yield (self.moves[start - 1] if start > 0 else ''), self.game.get_info(state)
+        for move in self.moves[start:]:
+            state = self.step(state, move)
+            yield move, self.game.get_info(state)
+
+    @property
+    def path(self):
+        return list(self.moves)
+
+    """
+        The map of the replay in the text format MapLoader reads, with Pacman, the snacks and the ghosts
+        where they are at frame 0.
+    """
+    def map_rows(self):
+        game = self.game
+        rows = [["W" if wall else " " for wall in row] for row in game.is_wall]
+        for i, (x, y) in enumerate(game.snack_positions):
+            if self.initial_state[2] >> i & 1:
+                rows[x][y] = game.snacks[i].type
+        for ghost, (x, y) in zip(game.ghosts, game.ghost_schedule.get_positions(self.initial_state[1])):
+            rows[x][y] = ghost.axis
+        x, y = game.to_position(self.initial_state[0])
+        rows[x][y] = "P"
+        return ["".join(row) for row in rows]
+
+    def save(self, file_path):
+        """
+        Writes the replay to 'file_path': a header, the walls as a bitmap, the snacks and the ghosts at time
+        step 0, the moves at two bits each, the (frame, snack) pairs of eaten snacks and the keyframes.
+        Statistics are not saved.
+        """
+        game = self.game
+        mask_bytes = (len(game.snacks) + 7) // 8
+        codes = np.array([MOVE_CODES[move] for move in self.moves], dtype=np.uint8)
+        packed_moves = np.packbits(np.unpackbits(codes[:, None], axis=1)[:, -2:].reshape(-1)).tobytes()
+
+        parts = [
+            HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, game.height, game.width, len(game.snacks),
+                        len(game.ghosts), self.keyframe_interval, len(self.moves)),
+            np.packbits(np.array(game.is_wall, dtype=bool).reshape(-1)).tobytes(),
+            *(SNACK.pack(s.x, s.y, s.type.encode()) for s in game.snacks),
+            *(GHOST.pack(g.x, g.y, g.center[0], g.center[1], g.axis.encode(), g.direction,
+                         NO_RADIUS if g.radius is None else g.radius) for g in game.ghosts),
+            packed_moves,
+            COUNT.pack(len(self.eaten)),
+            *(EATEN.pack(frame, snack) for frame, snack in sorted(self.eaten.items())),
+            COUNT.pack(len(self.keyframes)),
+            *(KEYFRAME.pack(cell, t) + mask.to_bytes(mask_bytes, "little") for cell, t, mask in self.keyframes),
+        ]
+        with open(file_path, "wb") as f:
+            f.write(b"".join(parts))
+
+    """
+        Reads a replay written by save(). The game is rebuilt from the file, so no map file is needed.
+        Raises ValueError if the file is not a replay of this version.
+    """
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+        magic, version, height, width, snack_count, ghost_count, interval, move_count = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{file_path} is not a version {REPLAY_VERSION} replay file.")
+        offset = HEADER.size
+
+        wall_bytes = (height * width + 7) // 8
+        walls = np.unpackbits(np.frombuffer(data, np.uint8, wall_bytes, offset))[:height * width]
+        is_wall = walls.astype(bool).reshape(height, width).tolist()
+        offset += wall_bytes
+
+        snacks = []
+        for _ in range(snack_count):
+            x, y, snack_type = SNACK.unpack_from(data, offset)
+            snacks.append(Snack(x, y, snack_type.decode()))
+            offset += SNACK.size
+        ghosts = []
+        for _ in range(ghost_count):
+            x, y, center_x, center_y, axis, direction, radius = GHOST.unpack_from(data, offset)
+            ghost = Ghost(center_x, center_y, axis.decode(), None if radius == NO_RADIUS else radius)
+            ghost.set_state(x, y, direction)
+            ghosts.append(ghost)
+            offset += GHOST.size
+
+        move_bytes = (move_count + 3) // 4
+        bits = np.unpackbits(np.frombuffer(data, np.uint8, move_bytes, offset))[:2 * move_count].reshape(-1, 2)
+        moves = "".join(MOVES[code][0] for code in (bits[:, 0] * 2 + bits[:, 1]).tolist())
+        offset += move_bytes
+
+        (eaten_count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        eaten = {}
+        for _ in range(eaten_count):
+            frame, snack = EATEN.unpack_from(data, offset)
+            eaten[frame] = snack
+            offset += EATEN.size
+
+        (keyframe_count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        mask_bytes = (snack_count + 7) // 8
+        keyframes = []
+        for _ in range(keyframe_count):
+            cell, t = KEYFRAME.unpack_from(data, offset)
+            offset += KEYFRAME.size
+            keyframes.append((cell, t, int.from_bytes(data[offset:offset + mask_bytes], "little")))
+            offset += mask_bytes
+
+        player = divmod(keyframes[0][0], width)
+        game = PackedGame(PacmanGame(is_wall, player, ghosts, snacks))
+        return cls(game, moves, keyframes[0], interval, keyframes=keyframes, eaten=eaten)
@@ -0,0 +1,26 @@
+# File: core/solvers/search_node.py
+
+
+class SearchNode:
+    """
+    A state reached by a search, linked to the node it was expanded from.
+
+    Solvers keep one node per frontier entry instead of the full list of moves, so pushing a successor
+    costs O(1) memory; the moves are only collected once, by following the parents of the goal node.
+    """
+    __slots__ = ("state", "parent", "action", "depth")
+
+    def __init__(self, state, parent=None, action=None):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.depth = parent.depth + 1 if parent is not None else 0
+
+    def get_path(self):
+        path = []
+        node = self
+        while node.parent is not None:
+            path.append(node.action)
+            node = node.parent
+        path.reverse()
+        return path
@@ -0,0 +1,136 @@
+# File: core/solvers/search_stats.py
+
+from time import perf_counter
+
+
+class SearchStats:
+    def __init__(self, algorithm=""):
+        """
+        Counters and timers a solver fills in while it searches.
+
+        Every solver accepts a 'stats' argument (a new SearchStats is made when it is None) and attaches it to
+        the history it returns as 'history.stats'. Solvers return None when they fail, so callers that want the
+        numbers in that case too should pass their own SearchStats.
+
+        Time is split between generating successors, hashing states (visited / g_costs lookups and inserts)
+        and evaluating the heuristic; whatever is left is bookkeeping of the search itself.
+
+        Anytime solvers call report_solution() with every solution they improve on before they return;
+        'on_solution' (e.g. set by a background solve to stream them to the GUI) receives the path.
+        """
+        self.algorithm = algorithm
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.duplicates_pruned = 0
+        self.peak_frontier = 0
+        self.peak_visited = 0
+        """ Frontier size at the last observe() call, for progress displays """
+        self.frontier = 0
+        self.solution_length = None
+
+        self.successor_time = 0.0
+        self.hash_time = 0.0
+        self.heuristic_time = 0.0
+        self.start_time = None
+        self.end_time = None
+        self.on_solution = None
+
+    def start(self):
+        self.start_time = perf_counter()
+        self.end_time = None
+
+    def finish(self, path=None):
+        self.end_time = perf_counter()
+        self.solution_length = None if path is None else len(path)
+
+    def report_solution(self, path):
+        if self.on_solution is not None:
+            self.on_solution(path)
+
+    """
+        Calls game.get_next_states(state), counting one expansion and its successors and timing the call.
+    """
+    def expand(self, game, state):
+        t = perf_counter()
+        next_states = game.get_next_states(state)
+        self.successor_time += perf_counter() - t
+        self.nodes_expanded += 1
+        self.nodes_generated += len(next_states)
+        return next_states
+
+    def heuristic(self, heuristic_func, game, state):
+        t = perf_counter()
+        h = heuristic_func(game, state)
+        self.heuristic_time += perf_counter() - t
+        return h
+
+    def observe(self, frontier_size, visited_size):
+        self.frontier = frontier_size
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if visited_size > self.peak_visited:
+            self.peak_visited = visited_size
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or perf_counter()) - self.start_time
+
+    @property
+    def states_per_second(self):
+        return self.nodes_expanded / self.elapsed if self.elapsed > 0 else 0.0
+
+    """
+        The b* for which a uniform tree of the solution's depth has as many nodes as were generated:
+        nodes_generated + 1 = 1 + b* + b*^2 + ... + b*^d. None until a solution of length >= 1 is found.
+    """
+    @property
+    def effective_branching_factor(self):
+        d = self.solution_length
+        if not d or self.nodes_generated == 0:
+            return None
+
+        def tree_size(b):
+            size, level = 0.0, 1.0
+            for _ in range(d):
+                level *= b
+                size += level
+                if size >= self.nodes_generated:
+                    break
+            return size
+
+        low, high = 0.0, max(1.0, self.nodes_generated ** (1 / d))
+        for _ in range(100):
+            mid = (low + high) / 2
+            if tree_size(mid) < self.nodes_generated:
+                low = mid
+            else:
+                high = mid
+        return (low + high) / 2
+
+    def as_dict(self):
+        return {
+            "algorithm": self.algorithm,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "duplicates_pruned": self.duplicates_pruned,
+            "peak_frontier": self.peak_frontier,
+            "peak_visited": self.peak_visited,
+            "solution_length": self.solution_length,
+            "effective_branching_factor": self.effective_branching_factor,
+            "states_per_second": self.states_per_second,
+            "elapsed": self.elapsed,
+            "successor_time": self.successor_time,
+            "hash_time": self.hash_time,
+            "heuristic_time": self.heuristic_time,
+        }
+
+    def summary(self):
+        ebf = self.effective_branching_factor
+        return (f"{self.algorithm}: expanded {self.nodes_expanded}, generated {self.nodes_generated}, "
+                f"duplicates pruned {self.duplicates_pruned}, peak frontier {self.peak_frontier}, "
+                f"peak visited {self.peak_visited}, b* {'-' if ebf is None else f'{ebf:.3f}'}, "
+                f"{self.states_per_second:,.0f} states/s | time: successors {self.successor_time:.2f}s, "
+                f"hashing {self.hash_time:.2f}s, heuristic {self.heuristic_time:.2f}s, "
+                f"total {self.elapsed:.2f}s")
@@ -0,0 +1,153 @@
+# File: core/solvers/solution_cache.py
+
+from .replay import Replay
+import config
+import hashlib
+import inspect
+import json
+import os
+
+""" Solver sources that are part of every key: editing any of them invalidates the cached solutions """
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+""" Settings of config.py that change what a map means (MapLoader gives every ghost GHOST_MOVE_LIMIT as its radius) """
+GAME_CONFIG_KEYS = ("GHOST_MOVE_LIMIT",)
+_code_version = None
+_module_versions = {}
+
+
+"""
+    SHA-1 of every .py file under core/ (solvers, heuristics and the game model), computed once per process.
+"""
+def code_version():
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha1()
+        for root, dirs, files in sorted(os.walk(SOURCE_DIR)):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    with open(os.path.join(root, name), "rb") as f:
+                        digest.update(name.encode() + f.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+"""
+    SHA-1 of the source file of the module that defines 'solver', so solvers outside core/ (plugins from the
+    registry) are versioned too. Solvers without a readable source file are named by their module instead.
+"""
+def solver_version(solver):
+    module = inspect.getmodule(solver)
+    name = getattr(module, "__name__", repr(solver))
+    if name not in _module_versions:
+        try:
+            with open(inspect.getsourcefile(module), "rb") as f:
+                _module_versions[name] = hashlib.sha1(f.read()).hexdigest()
+        except (OSError, TypeError):
+            _module_versions[name] = name
+    return _module_versions[name]
+
+
+""" The GAME_CONFIG_KEYS settings as they are in this process """
+def game_config_key():
+    return json.dumps({name: getattr(config, name) for name in GAME_CONFIG_KEYS}, sort_keys=True, default=repr)
+
+
+"""
+    Makes solver keyword arguments JSON-able for the key: functions (e.g. heuristic_func) are named by
+    their module and qualified name.
+"""
+def parameter_key(options):
+    def encode(value):
+        if callable(value):
+            return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+        return repr(value)
+    return json.dumps(options or {}, sort_keys=True, default=encode)
+
+
+class SolutionCache:
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Solutions of earlier runs on disk, as replay files (see replay.py) named by a content hash of
+        everything the solution depends on: the map file's bytes, the solver mode, its keyword arguments,
+        the time limit (anytime solvers return better solutions with more time), the solver code (core/ and
+        the solver's own module) and the settings of config.py that change the game (GAME_CONFIG_KEYS).
+        A changed map, parameter, setting or solver therefore simply misses; stale entries age out.
+
+        Entries are evicted least recently used first (by file mtime, refreshed on every hit) once the
+        directory holds more than 'max_bytes'. Only solutions are cached, never timeouts or failures.
+
+        Args:
+            cache_dir (str): Directory of the entries. Created on the first store.
+            max_bytes (int): Size budget of the directory.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, file_path, solver_mode, timeout, options=None):
+        with open(file_path, "rb") as f:
+            map_digest = hashlib.sha256(f.read()).hexdigest()
+        parts = [map_digest, solver_mode, str(timeout), parameter_key(options), code_version(),
+                 solver_version(config.SOLVERS[solver_mode]), game_config_key()]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.replay")
+
+    """
+        Returns the cached solution of 'key' as a Replay (it renders and measures like a RenderHistory),
+        or None on a miss. Unreadable entries count as misses and are removed.
+    """
+    def get(self, key):
+        path = self.path(key)
+        try:
+            replay = Replay.load(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, IndexError, KeyError):
+            self.misses += 1
+            self.remove(path)
+            return None
+        os.utime(path)
+        self.hits += 1
+        return replay
+
+    """
+        Stores the solution 'history' (a RenderHistory or Replay) under 'key', then evicts old entries.
+        Returns False when there was nothing to store (no solution or a timeout).
+    """
+    def put(self, key, history):
+        if history is None or len(history) <= 1:
+            return False
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        Replay.from_history(history).save(temp_path)
+        os.replace(temp_path, path)
+        self.evict()
+        return True
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".replay"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def summary(self):
+        return f"Solution cache: {self.hits} hits, {self.misses} misses ({self.cache_dir})"
@@ -0,0 +1,183 @@
+# File: core/solvers/vectorized_bfs.py
+
+from ..environment.packed_game import PackedGame
+from ..environment.map_layout import MOVES
+from .search_stats import SearchStats
+from time import perf_counter
+import numpy as np
+import time
+
+""" Encoded states must fit in an int64 """
+MAX_ENCODED_BITS = 62
+""" Largest (time steps x cells) ghost occupancy table to build, in bytes """
+MAX_OCCUPANCY_CELLS = 64_000_000
+""" Up to this many encodable states, visited states are marked in a dense bool array instead of a sorted one """
+MAX_DENSE_STATES = 1 << 27
+
+
+"""
+    Tells if vectorized_bfs can search this game: its encoded states have to fit in an int64 and its ghost
+    occupancy table in memory. Maps with too many snacks or very long ghost cycles use the normal BFS.
+"""
+def can_vectorize(game: PackedGame):
+    cells = game.height * game.width
+    times = len(game.ghost_schedule)
+    bits = (cells * times - 1).bit_length() + len(game.snacks)
+    return bits <= MAX_ENCODED_BITS and cells * times <= MAX_OCCUPANCY_CELLS
+
+
+class VisitedStore:
+    def __init__(self, size):
+        """
+        Visited encoded states. With at most MAX_DENSE_STATES possible codes this is a bool array indexed by
+        code. Otherwise it is a list of sorted int64 runs, newest last: every layer adds a run, and runs are
+        merged while the newest is at least half as big as the one before it, so there are only O(log n)
+        runs to binary search and every code is copied O(log n) times in total.
+        """
+        self.dense = np.zeros(size, dtype=bool) if size <= MAX_DENSE_STATES else None
+        self.runs = []
+        self.size = 0
+
+    def contains(self, codes):
+        if self.dense is not None:
+            return self.dense[codes]
+        found = np.zeros(len(codes), dtype=bool)
+        for run in self.runs:
+            i = np.searchsorted(run, codes)
+            i[i == len(run)] = 0
+            found |= run[i] == codes
+        return found
+
+    """ 'codes' must be sorted and not visited yet """
+    def add(self, codes):
+        self.size += len(codes)
+        if self.dense is not None:
+            self.dense[codes] = True
+            return
+        self.runs.append(codes)
+        while len(self.runs) > 1 and 2 * len(self.runs[-1]) >= len(self.runs[-2]):
+            merged = np.concatenate((self.runs.pop(-2), self.runs.pop()))
+            merged.sort(kind="stable")
+            self.runs.append(merged)
+
+    def __len__(self):
+        return self.size
+
+
+def vectorized_bfs(game: PackedGame, timeout=200, stats=None):
+    """
+    Level-synchronous BFS on NumPy arrays. Returns the list of moves of a shortest solution, or None.
+
+    A state (cell, time, mask) is encoded as ((mask * times) + time) * cells + cell. Every layer of the
+    search is one int64 array of codes; it is decoded, moved in all four directions at once through the
+    dense (cell, move) table of the map layout, filtered against a (time, cell) ghost occupancy table and a
+    sorted array of forbidden swap moves, and has its snacks eaten with bit operations. The new codes are
+    deduplicated with np.unique and against the VisitedStore, and become the next layer.
+
+    Only the current layer's codes are kept. For older layers only the index of each state's parent in the
+    previous layer (int32) and the move that reached it (uint8) are kept, which is enough to read the path
+    backwards from the goal once one shows up.
+    """
+    start_time = time.time()
+    stats = stats or SearchStats("BFS")
+
+    layout = game.layout
+    schedule = game.ghost_schedule
+    cells = layout.height * layout.width
+    times = len(schedule)
+
+    """ move_table[cell, move] = target cell, or -1 (also for moves out of walls) """
+    move_table = np.full((cells, len(MOVES)), -1, dtype=np.int64)
+    counts = np.diff(layout.neighbor_offsets)
+    move_table[np.repeat(layout.free_cells, counts), layout.neighbor_actions] = layout.neighbor_cells
+
+    next_time = np.array(schedule.next_time, dtype=np.int64)
+    occupied = np.zeros((times, cells), dtype=bool)
+    for t, ghost_cells in enumerate(schedule.occupied):
+        occupied[t, list(ghost_cells)] = True
+    swap_keys = np.array(sorted((t * cells + future) * cells + now
+                                for t, swaps in enumerate(schedule.swaps) for future, now in swaps if future >= 0),
+                         dtype=np.int64)
+
+    snack_bits = np.zeros(cells, dtype=np.int64)
+    for cell, bit in game.snack_bits.items():
+        snack_bits[cell] = bit
+    a_mask = np.int64(game.a_mask)
+
+    def encode(cell, t, mask):
+        return (mask * times + t) * cells + cell
+
+    root = encode(*(np.array([value], dtype=np.int64) for value in game.initial_state))
+    visited = VisitedStore(cells * times << len(game.snacks))
+    visited.add(root)
+    codes = root
+    layers = []
+
+    goal_index = 0 if game.is_goal(game.initial_state) else None
+    while goal_index is None:
+        if time.time() - start_time > timeout:
+            print("BFS solver timed out during search.")
+            return None
+
+        if len(codes) == 0:
+            return None
+
+        t0 = perf_counter()
+        cell = codes % cells
+        rest = codes // cells
+        t = rest % times
+        mask = rest // times
+        nt = next_time[t]
+
+        candidates, parents, actions = [], [], []
+        for action in range(len(MOVES)):
+            nc = move_table[cell, action]
+            valid = nc >= 0
+            nc_safe = np.where(valid, nc, 0)
+            valid &= ~occupied[nt, nc_safe]
+            if len(swap_keys):
+                keys = (t * cells + cell) * cells + nc_safe
+                i = np.searchsorted(swap_keys, keys)
+                i[i == len(swap_keys)] = 0
+                valid &= swap_keys[i] != keys
+
+            index = np.flatnonzero(valid)
+            nc, m = nc[index], mask[index]
+            bit = snack_bits[nc]
+            eat = ((bit & m) != 0) & (((bit & a_mask) != 0) | ((m & a_mask) == 0))
+            next_mask = np.where(eat, m ^ bit, m)
+
+            candidates.append(encode(nc, nt[index], next_mask))
+            parents.append(index)
+            actions.append(np.full(len(index), action, dtype=np.uint8))
+
+        candidates = np.concatenate(candidates)
+        parents = np.concatenate(parents)
+        actions = np.concatenate(actions)
+        stats.successor_time += perf_counter() - t0
+        stats.nodes_expanded += len(codes)
+        stats.nodes_generated += len(candidates)
+
+        t0 = perf_counter()
+        unique, first = np.unique(candidates, return_index=True)
+        new = ~visited.contains(unique)
+        unique, first = unique[new], first[new]
+        visited.add(unique)
+        stats.hash_time += perf_counter() - t0
+        stats.duplicates_pruned += len(candidates) - len(unique)
+
+        layers.append((parents[first].astype(np.int32), actions[first]))
+        codes = unique
+        stats.observe(len(codes), len(visited))
+
+        goals = np.flatnonzero(codes // (cells * times) == 0)
+        if len(goals):
+            goal_index = int(goals[0])
+
+    path = []
+    index = goal_index
+    for parent_index, action in reversed(layers):
+        path.append(MOVES[int(action[index])][0])
+        index = int(parent_index[index])
+    path.reverse()
+    return path
@@ -0,0 +1,275 @@
+# File: core/solvers/visited_set.py
+
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+MASK_64 = (1 << 64) - 1
+
+""" Approximate bytes one in-memory entry costs, measured with tracemalloc (exact / hash-only mode) """
+ENTRY_BYTES = {True: 105, False: 72}
+
+""" A partition with more spilled runs than this gets them merged into one """
+MAX_RUNS_PER_PARTITION = 4
+
+MAX_MASK_KEYS = 1_000_000
+
+
+def splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return x ^ (x >> 31)
+
+
+class ZobristHasher:
+    def __init__(self, seed=0):
+        """
+        64-bit Zobrist hashes of packed states (player_cell, time, snack_mask).
+
+        The hash is the XOR of one random key for the player cell, one for the time step and one for every
+        snack that is still on the map. The random keys come from splitmix64 of (seed, kind, index), so they
+        don't depend on the map and every process computes the same hash for the same state.
+
+        The snack part is memoized per mask and built from the mask with one less snack, so hashing a
+        successor costs two lookups and, only when a snack was eaten, one XOR.
+        """
+        self.seed = seed
+        self.cell_keys = {}
+        self.time_keys = {}
+        self.snack_keys = []
+        self.mask_keys = {0: 0}
+
+    def _key(self, kind, index):
+        return splitmix64(splitmix64(self.seed * 3 + kind) ^ index)
+
+    def mask_key(self, mask):
+        key = self.mask_keys.get(mask)
+        if key is not None:
+            return key
+
+        missing = []
+        while key is None:
+            missing.append(mask)
+            low = mask & -mask
+            mask ^= low
+            key = self.mask_keys.get(mask)
+
+        if len(self.mask_keys) > MAX_MASK_KEYS:
+            self.mask_keys = {0: 0}
+        for mask in reversed(missing):
+            low = (mask & -mask).bit_length() - 1
+            while len(self.snack_keys) <= low:
+                self.snack_keys.append(self._key(2, len(self.snack_keys)))
+            key ^= self.snack_keys[low]
+            self.mask_keys[mask] = key
+        return key
+
+    def hash(self, state):
+        cell, t, mask = state
+        cell_key = self.cell_keys.get(cell)
+        if cell_key is None:
+            cell_key = self.cell_keys[cell] = self._key(0, cell)
+        time_key = self.time_keys.get(t)
+        if time_key is None:
+            time_key = self.time_keys[t] = self._key(1, t)
+        return cell_key ^ time_key ^ self.mask_key(mask)
+
+
+class ZobristVisitedSet:
+    def __init__(self, exact=True, memory_limit_mb=None, spill_dir=None, partitions=256, hasher=None):
+        """
+        A drop-in replacement for the visited set of packed states used by BFS, DFS and A*
+        (supports 'in', add() and len()), keyed by 64-bit Zobrist hashes.
+
+        Entries are split into 'partitions' by the low bits of their hash. Each partition keeps its newest
+        entries in memory; in exact mode they map the hash to the whole state packed into one int, so a hash
+        collision is detected and the colliding state kept in a small side set. With exact=False only the
+        hashes are stored, which halves memory but makes two states with the same 64-bit hash look visited.
+
+        With 'memory_limit_mb', once the in-memory entries are estimated to use more than the limit, the
+        least recently used partitions are written to disk as sorted NumPy arrays and opened memory-mapped
+        (8 bytes per entry, 24+ in exact mode). Lookups then binary search the spilled runs of the state's
+        partition after its in-memory entries; runs of a partition are merged once there are too many.
+
+        Args:
+            exact (bool): Verify states on hash matches.
+            memory_limit_mb (float, optional): Spill to disk above this many MB of in-memory entries.
+            spill_dir (str, optional): Directory for spilled runs. A temporary one, removed with the set,
+                by default.
+            partitions (int): Number of partitions, a power of two.
+            hasher (ZobristHasher, optional): The hash function. A new one by default.
+        """
+        if partitions & (partitions - 1):
+            raise ValueError("The number of partitions must be a power of two.")
+
+        self.exact = exact
+        self.hasher = hasher or ZobristHasher()
+        self.partition_mask = partitions - 1
+        self.partitions = [{} if exact else set() for _ in range(partitions)]
+        self.runs = [[] for _ in range(partitions)]
+        self.recent = OrderedDict()
+        self.collisions = set()
+
+        self.max_in_memory = None if memory_limit_mb is None else int(memory_limit_mb * 2 ** 20 / ENTRY_BYTES[exact])
+        self.spill_dir = spill_dir
+        self.spill_files = 0
+        self.size = 0
+        self.in_memory = 0
+        self.spilled = 0
+        self._last = (None, None)
+
+    @staticmethod
+    def pack(state):
+        cell, t, mask = state
+        return cell | t << 32 | mask << 64
+
+    def _hash(self, state):
+        last_state, key = self._last
+        if last_state != state:
+            key = self.hasher.hash(state)
+            self._last = (state, key)
+        return key
+
+    """
+        Returns 0 if the key isn't in the partition's spilled runs, 1 if it is with this state (always in
+        hash-only mode) and -1 if it is there with another state.
+    """
+    def _find_spilled(self, p, key, packed):
+        for run in self.runs[p]:
+            keys = run["key"]
+            i = int(np.searchsorted(keys, np.uint64(key)))
+            if i < len(keys) and int(keys[i]) == key:
+                if not self.exact:
+                    return 1
+                row = run[i]
+                stored = int(row["low"]) | sum(int(word) << (64 * (j + 1)) for j, word in enumerate(row["mask"]))
+                return 1 if stored == packed else -1
+        return 0
+
+    def __contains__(self, state):
+        key = self._hash(state)
+        p = key & self.partition_mask
+        partition = self.partitions[p]
+
+        if not self.exact:
+            return key in partition or (bool(self.runs[p]) and self._find_spilled(p, key, None) == 1)
+
+        packed = self.pack(state)
+        stored = partition.get(key)
+        if stored is not None:
+            return stored == packed or packed in self.collisions
+        if self.runs[p]:
+            found = self._find_spilled(p, key, packed)
+            if found:
+                return found == 1 or packed in self.collisions
+        return False
+
+    def add(self, state):
+        if state in self:
+            return
+        key = self._hash(state)
+        p = key & self.partition_mask
+        partition = self.partitions[p]
+
+        if not self.exact:
+            partition.add(key)
+        else:
+            packed = self.pack(state)
+            if key in partition or (self.runs[p] and self._find_spilled(p, key, packed)):
+                self.collisions.add(packed)
+                self.size += 1
+                return
+            partition[key] = packed
+
+        self.size += 1
+        self.in_memory += 1
+        self.recent[p] = None
+        self.recent.move_to_end(p)
+        if self.max_in_memory is not None and self.in_memory > self.max_in_memory:
+            self._spill()
+
+    def __len__(self):
+        return self.size
+
+    def _new_spill_path(self, p):
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="visited-")
+            weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self.spill_files += 1
+        return os.path.join(self.spill_dir, f"p{p}-{self.spill_files}.npy")
+
+    def _write_run(self, p, rows):
+        path = self._new_spill_path(p)
+        run = np.lib.format.open_memmap(path, mode="w+", dtype=rows.dtype, shape=rows.shape)
+        run[:] = rows
+        run.flush()
+        del run
+        return np.load(path, mmap_mode="r")
+
+    def _run_rows(self, partition):
+        if not self.exact:
+            rows = np.fromiter(partition, dtype=np.uint64, count=len(partition))
+            rows = rows.view([("key", np.uint64)])
+        else:
+            words = max(1, (max(partition.values()).bit_length() - 64 + 63) // 64)
+            rows = np.zeros(len(partition), dtype=[("key", np.uint64), ("low", np.uint64), ("mask", np.uint64, (words,))])
+            rows["key"] = np.fromiter(partition.keys(), dtype=np.uint64, count=len(partition))
+            rows["low"] = np.fromiter((v & MASK_64 for v in partition.values()), dtype=np.uint64, count=len(partition))
+            for j in range(words):
+                rows["mask"][:, j] = np.fromiter((v >> (64 * (j + 1)) & MASK_64 for v in partition.values()),
+                                                 dtype=np.uint64, count=len(partition))
+        rows.sort(order="key")
+        return rows
+
+    def _merge_runs(self, p):
+        runs = self.runs[p]
+        words = max(run.dtype["mask"].shape[0] for run in runs) if self.exact else 0
+        if self.exact:
+            dtype = [("key", np.uint64), ("low", np.uint64), ("mask", np.uint64, (words,))]
+            rows = np.zeros(sum(len(run) for run in runs), dtype=dtype)
+            start = 0
+            for run in runs:
+                rows["key"][start:start + len(run)] = run["key"]
+                rows["low"][start:start + len(run)] = run["low"]
+                rows["mask"][start:start + len(run), :run.dtype["mask"].shape[0]] = run["mask"]
+                start += len(run)
+        else:
+            rows = np.concatenate([np.asarray(run) for run in runs])
+        rows.sort(order="key")
+
+        paths = [run.filename for run in runs]
+        self.runs[p] = [self._write_run(p, rows)]
+        for path in paths:
+            os.remove(path)
+
+    """
+        Writes the least recently used partitions to disk until the in-memory entries are down to half the limit.
+    """
+    def _spill(self):
+        while self.in_memory > self.max_in_memory // 2 and self.recent:
+            p, _ = self.recent.popitem(last=False)
+            partition = self.partitions[p]
+            if not partition:
+                continue
+
+            self.runs[p].append(self._write_run(p, self._run_rows(partition)))
+            self.in_memory -= len(partition)
+            self.spilled += len(partition)
+            self.partitions[p] = {} if self.exact else set()
+            if len(self.runs[p]) > MAX_RUNS_PER_PARTITION:
+                self._merge_runs(p)
+
+    def get_stats(self):
+        return {
+            "entries": self.size,
+            "in_memory": self.in_memory,
+            "spilled": self.spilled,
+            "runs": sum(len(runs) for runs in self.runs),
+            "collisions": len(self.collisions),
+        }
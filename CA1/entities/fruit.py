@@ -2,6 +2,9 @@ import pygame
 import random
 from config import *
 
+""" Translucent copies of fruit images, (image, alpha) -> surface, shared by all fruits """
+_alpha_images = {}
+
 
 class Fruit:
     def __init__(self, x, y, type="normal", image=None):
@@ -9,6 +12,7 @@ class Fruit:
         self.type = type
         self.base_image = image
         self.image = image
+        self.alpha = 255
         self.rect = pygame.Rect(*grid_to_pixel(x, y), CELL_SIZE, CELL_SIZE)
         self.points = 10 if type == "normal" else 30
         if type == "special":
@@ -20,8 +24,17 @@ class Fruit:
         self.rect.topleft = grid_to_pixel(self.grid_x, self.grid_y)
 
     def set_alpha(self, alpha):
-        self.image = self.base_image.copy()
-        self.image.set_alpha(alpha)
+        if alpha == self.alpha:
+            return
+        self.alpha = alpha
+        if alpha == 255:
+            self.image = self.base_image
+            return
+        image = _alpha_images.get((self.base_image, alpha))
+        if image is None:
+            image = _alpha_images[(self.base_image, alpha)] = self.base_image.copy()
+            image.set_alpha(alpha)
+        self.image = image
 
     def draw(self, screen):
         screen.blit(self.image, self.rect.topleft)
\ No newline at end of file
@@ -14,7 +14,11 @@ class Ghost:
         self.move_counter = 0
 
 
-    def update(self, walls, dt):
+    """
+        Moves the ghost one cell on its axis when its timer is up, turning around at walls and at
+        GHOST_MOVE_LIMIT. 'grid' is the GridIndex of the game, which is told about the move.
+    """
+    def update(self, grid, dt):
         self.slow_counter += dt
         move_interval = 1.0 / self.speed
         if self.slow_counter < move_interval:
@@ -24,12 +28,12 @@ class Ghost:
         if self.move_dir == "horizontal": dx = self.direction
         else: dy = self.direction
         new_x, new_y = self.grid_x + dx, self.grid_y + dy
-        new_rect = pygame.Rect(*grid_to_pixel(new_x, new_y), CELL_SIZE, CELL_SIZE)
         self.move_counter += self.direction
-        if any(new_rect.colliderect(w.rect) for w in walls) or abs(self.move_counter) == GHOST_MOVE_LIMIT:
+        if grid.is_wall(new_x, new_y) or abs(self.move_counter) == GHOST_MOVE_LIMIT:
             self.direction *= -1
-            self.update(walls, dt)
+            self.update(grid, dt)
         else:
+            grid.move_ghost(self, (self.grid_x, self.grid_y), (new_x, new_y))
             self.grid_x, self.grid_y = new_x, new_y
             self.rect.topleft = grid_to_pixel(self.grid_x, self.grid_y)
 
@@ -0,0 +1,51 @@
+class GridIndex:
+    def __init__(self, width, height, walls=(), fruits=(), ghosts=()):
+        """
+        Who is on which cell in player mode, so collision checks are lookups instead of scans over every
+        wall, fruit and ghost. Every entity sits on exactly one cell (rect = grid cell), so two entities
+        overlap exactly when they share a cell.
+
+        Walls never move and are kept in a flat bytearray. Fruits and ghosts are kept by cell and must be
+        kept up to date through remove_fruit() and move_ghost() (Ghost.update does the latter).
+
+        Args:
+            width (int): Number of columns of the map.
+            height (int): Number of rows of the map.
+            walls (list[Wall]): The walls.
+            fruits (list[Fruit]): The fruits.
+            ghosts (list[Ghost]): The ghosts.
+        """
+        self.width = width
+        self.height = height
+        self.walls = bytearray(width * height)
+        for wall in walls:
+            self.walls[wall.grid_y * width + wall.grid_x] = 1
+        """ (x, y) -> fruit; fruits never share a cell """
+        self.fruits = {(fruit.grid_x, fruit.grid_y): fruit for fruit in fruits}
+        """ (x, y) -> list of ghosts; ghosts can pass through each other """
+        self.ghosts = {}
+        for ghost in ghosts:
+            self.ghosts.setdefault((ghost.grid_x, ghost.grid_y), []).append(ghost)
+
+    """
+        Cells outside the map are not walls, as with the rect collisions this replaces.
+    """
+    def is_wall(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self.walls[y * self.width + x] == 1
+
+    def fruit_at(self, x, y):
+        return self.fruits.get((x, y))
+
+    def ghosts_at(self, x, y):
+        return self.ghosts.get((x, y), ())
+
+    def remove_fruit(self, fruit):
+        if self.fruits.get((fruit.grid_x, fruit.grid_y)) is fruit:
+            del self.fruits[(fruit.grid_x, fruit.grid_y)]
+
+    def move_ghost(self, ghost, old_cell, new_cell):
+        ghosts = self.ghosts[old_cell]
+        ghosts.remove(ghost)
+        if not ghosts:
+            del self.ghosts[old_cell]
+        self.ghosts.setdefault(new_cell, []).append(ghost)
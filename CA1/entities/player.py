@@ -13,7 +13,8 @@ class Player:
         self.speed = speed
         self.counter = 0
 
-    def update(self, walls, dt):
+    """ 'grid' is the GridIndex of the game, used to stop at walls """
+    def update(self, grid, dt):
             self.counter += dt
             move_interval = 1 / self.speed
 
@@ -40,8 +41,7 @@ class Player:
                 elif keys[pygame.K_d] or keys[pygame.K_RIGHT]: dx = 1; self.direction = "right"
 
             new_x, new_y = self.grid_x + dx, self.grid_y + dy
-            new_rect = pygame.Rect(*grid_to_pixel(new_x, new_y), CELL_SIZE, CELL_SIZE)
-            if not any(new_rect.colliderect(w.rect) for w in walls):
+            if not grid.is_wall(new_x, new_y):
                 self.grid_x, self.grid_y = new_x, new_y
                 self.rect.topleft = grid_to_pixel(self.grid_x, self.grid_y)
                 
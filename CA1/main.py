@@ -1,4 +1,5 @@
 import pygame
+import argparse
 import random
 import time
 from copy import deepcopy
@@ -17,11 +18,12 @@ from entities.wall import Wall
 from entities.player import Player
 from entities.fruit import Fruit
 from entities.ghost import Ghost
+from entities.grid_index import GridIndex
+from renderer import FrameRenderer
 
-from core.environment.map_loader import MapLoader
-from core.environment.game import PacmanGame
+from core.solvers.profiler import profile_name, profile_solver
 
-def run_solver(solver, game, timeout=10):
+def run_solver(solver, game, timeout=10, profile_dir=None, report_name="profile"):
     """
         In AI mode:
         This function takes a solver function and runs it on a game object, the result is a history of movement information
@@ -29,7 +31,14 @@ def run_solver(solver, game, timeout=10):
         This info contains the direction of pacman so we can render the correct information, the fruit type (and if it's been eaten or not)
         so we can render the correct picture of fruit, and the positions of pacman and ghosts and fruits to know where to render them in
         the map. We don't need walls positions to be returned because it's static and we have it in main :)
+        With 'profile_dir' (PROFILE_DIR in config.py), the solver runs under cProfile and tracemalloc and its
+        reports are written there as '<report_name>.*'.
     """
+    if profile_dir is not None:
+        info_history, elapsed, paths = profile_solver(solver, deepcopy(game), profile_dir, report_name, timeout=timeout)
+        print(f"Solver done! It took {elapsed:.2f} seconds (profiled, reports: {', '.join(paths)})")
+        return info_history, elapsed
+
     t1 = time.time()
     info_history = solver(deepcopy(game), timeout=timeout)
     t2 = time.time()
@@ -39,16 +48,111 @@ def run_solver(solver, game, timeout=10):
         print(f"Solver done! It took {t2-t1:.2f} seconds")
     return info_history, t2 - t1
 
+def get_solution_cache(solver_mode, file_path):
+    """
+        Returns (cache, key) for the solution of 'solver_mode' on 'file_path' in the solution cache
+        (SOLUTION_CACHE_DIR), or (None, None) when the cache is off. Profiled runs always search.
+    """
+    if SOLUTION_CACHE_DIR is None or PROFILE_DIR is not None:
+        return None, None
+    from core.solvers.solution_cache import SolutionCache
+    cache = SolutionCache(SOLUTION_CACHE_DIR, SOLUTION_CACHE_MAX_BYTES)
+    return cache, cache.key(file_path, solver_mode, TIME_LIMITS[solver_mode])
+
 def get_map_history_info(solver_mode, file_path):
     """
         This function takes a solver function and a map's path, calls Maploader on the map's path
         and builds the game object using it's information.
+        The search code (and NumPy) is imported here, once a solver is picked, so the menu opens faster.
+        A solution found before for the same map, solver and solver code is read from the solution cache
+        instead. This runs the solver in this process and blocks until it is done; the window uses
+        start_background_solve unless it profiles.
     """
-    is_wall, player, ghosts, snacks = MapLoader(file_path=file_path).load()
-    game = PacmanGame(player=player, ghosts=ghosts, snacks=snacks, is_wall=is_wall, move_direction="")
-    info_history, _ = run_solver(SOLVERS[solver_mode], game=deepcopy(game), timeout=TIME_LIMITS[solver_mode])
+    from solve import load_game
+    cache, key = get_solution_cache(solver_mode, file_path)
+    if cache is not None:
+        info_history = cache.get(key)
+        if info_history is not None:
+            print(f"Loaded the solution from the cache. {cache.summary()}")
+            return info_history
+
+    game = load_game(file_path)
+    info_history, _ = run_solver(SOLVERS[solver_mode], game=deepcopy(game), timeout=TIME_LIMITS[solver_mode],
+                                 profile_dir=PROFILE_DIR, report_name=profile_name(file_path, solver_mode))
+    if cache is not None:
+        cache.put(key, info_history)
+        print(cache.summary())
     return info_history
 
+def start_background_solve(solver_mode, file_path):
+    """
+        Starts the solver in a worker process (background_solve.py), so the window keeps drawing and
+        handling events while it searches. Progress and solutions are read with poll() every frame.
+    """
+    from background_solve import BackgroundSolve
+    return BackgroundSolve(file_path, solver_mode).start()
+
+def read_map_lines(file_path):
+    with open(file_path, 'r') as f:
+        return [line.strip() for line in f.readlines() if line.strip()]
+
+def get_replay(history):
+    """
+        Turns a solver's history into a Replay (core/solvers/replay.py): the moves plus a keyframe every
+        few frames, from which any frame is rebuilt on demand, so a solution can be scrubbed without keeping
+        every frame in memory.
+    """
+    from core.solvers.replay import Replay
+    return history if isinstance(history, Replay) else Replay.from_history(history)
+
+def load_replay(file_path):
+    """
+        Loads a replay file written by 'python solve.py MAP SOLVER --save-replay FILE'. The map is stored in
+        the file, so neither the map file nor a solver is needed to watch it.
+    """
+    from core.solvers.replay import Replay
+    return Replay.load(file_path)
+
+def game_over_overlays(renderer, font):
+    """
+        The centered game over messages, as overlays for draw_all.
+    """
+    messages = ["GAME OVER!", "Press Enter or Space to restart"]
+    overlays = []
+    for i, msg in enumerate(messages):
+        text_surface = renderer.text(msg, RED)
+        text_x = (COLS * CELL_SIZE) // 2 - text_surface.get_width() // 2
+        text_y = (ROWS * CELL_SIZE) // 2 - (len(messages) * font.get_height()) // 2 + i * font.get_height()
+        overlays.append((f"game_over_{i}", text_surface, (text_x, text_y)))
+    return overlays
+
+def get_autopilot(lines):
+    """
+        In Autopilot mode the player is driven by a D* Lite planner (core/solvers/dstar_lite.py) which is
+        repaired every frame from the positions of the player, the fruits and the ghosts.
+    """
+    from core.environment.map_layout import MapLayout
+    from core.solvers.dstar_lite import Autopilot
+    return Autopilot(MapLayout.for_walls([[cell == "W" for cell in row] for row in lines]))
+
+def autopilot_move(autopilot, player, fruits, ghosts, is_wall):
+    """
+        Asks the autopilot for the player's next move. Entities use grid_x = column and grid_y = row, the
+        planner uses (row, col). Ghosts tick at their own times, so while the player stands on a cell a ghost
+        can be on its own cell or the one it moves to next, found the way Ghost.update does (on a tick where
+        it would hit a wall or GHOST_MOVE_LIMIT it only turns around). Both are kept off the plan.
+    """
+    a_snacks = [(f.grid_y, f.grid_x) for f in fruits if f.type == "normal"]
+    b_snacks = [(f.grid_y, f.grid_x) for f in fruits if f.type == "special"]
+    ghost_cells = []
+    for ghost in ghosts:
+        dx, dy = (ghost.direction, 0) if ghost.move_dir == "horizontal" else (0, ghost.direction)
+        ghost_cells.append((ghost.grid_y, ghost.grid_x))
+        if not is_wall(ghost.grid_y + dy, ghost.grid_x + dx) and \
+                abs(ghost.move_counter + ghost.direction) != GHOST_MOVE_LIMIT:
+            ghost_cells.append((ghost.grid_y + dy, ghost.grid_x + dx))
+    return autopilot.next_move((player.grid_y, player.grid_x), a_snacks, b_snacks, ghost_cells)
+
 def update_render_state(player, ghosts, fruits, direction, info):
     """
         This function extracts the information above and renders them 
@@ -57,7 +161,8 @@ def update_render_state(player, ghosts, fruits, direction, info):
     py, px = info[0]
     player.grid_x, player.grid_y = px, py
     player.rect.topleft = (px * CELL_SIZE, py * CELL_SIZE)
-    player.direction = {"U": "up", "D": "down", "L": "left", "R": "right"}[direction]
+    if direction:  # the first frame has no move
+        player.direction = {"U": "up", "D": "down", "L": "left", "R": "right"}[direction]
 
     # Ghosts info
     for i, ghost in enumerate(ghosts):
@@ -73,44 +178,35 @@ def update_render_state(player, ghosts, fruits, direction, info):
         fruit.exists = fexists
 
 
-def draw_all(screen, camera_offset, walls, fruits, ghosts, player):
+def draw_all(renderer, camera_offset, fruits, ghosts, player, overlays=()):
     """
-    Draws all game entities (walls, fruits, ghosts, player) offset by camera position.
+    Draws all game entities (walls, fruits, ghosts, player) offset by camera position, then the text overlays,
+    and updates the display. The walls come from the renderer's cached layer and only the parts of the
+    screen that changed are redrawn (see renderer.py).
 
     Args:
-        screen (pygame.Surface): The game window surface.
+        renderer (FrameRenderer): The renderer of the window.
         camera_offset (tuple): (cam_x, cam_y) offset values for the camera.
-        walls (list): List of Wall objects.
         fruits (list): List of Fruit objects.
         ghosts (list): List of Ghost objects.
         player (Player): The player object.
+        overlays (list): (name, text surface, (x, y) position on the screen) of the texts to show.
 
     Returns:
         None
     """
     cam_x, cam_y = camera_offset
 
-    for wall in walls:
-        pygame.draw.rect(screen, BLUE, (wall.rect.x - cam_x,
-                         wall.rect.y - cam_y, wall.rect.width, wall.rect.height))
-
-    normal_left = False
-    for fruit in fruits:
-        if getattr(fruit, "exists", True):
-            if fruit.type == "normal":
-                normal_left = True
-            screen.blit(fruit.image, (fruit.rect.x -
-                        cam_x, fruit.rect.y - cam_y))
-
-    if not normal_left:
+    fruits = [fruit for fruit in fruits if getattr(fruit, "exists", True)]
+    if not any(fruit.type == "normal" for fruit in fruits):
         for f in fruits:
             f.set_alpha(255)
-                
-    for ghost in ghosts:
-        screen.blit(ghost.image, (ghost.rect.x - cam_x, ghost.rect.y - cam_y))
 
-    screen.blit(player.images[player.direction],
-                (player.rect.x - cam_x, player.rect.y - cam_y))
+    sprites = [(id(fruit), fruit.image, fruit.rect.topleft) for fruit in fruits]
+    sprites += [(id(ghost), ghost.image, ghost.rect.topleft) for ghost in ghosts]
+    sprites.append((id(player), player.images[player.direction], player.rect.topleft))
+    sprites += [(name, surface, (x + cam_x, y + cam_y)) for name, surface, (x, y) in overlays]
+    renderer.render(camera_offset, sprites)
 
 
 def calculate_camera_offset(player, screen_width, screen_height):
@@ -132,9 +228,10 @@ def calculate_camera_offset(player, screen_width, screen_height):
     return cam_x, cam_y
 
 
-def main():
+def main(replay_path=None):
     """
-    pygame is the graphics library used in this project
+    pygame is the graphics library used in this project.
+    With 'replay_path', the menu is skipped and the saved replay is played instead of running a solver.
     """
     pygame.init()
     screen = pygame.display.set_mode((COLS * CELL_SIZE, ROWS * CELL_SIZE))
@@ -153,7 +250,19 @@ def main():
     font = pygame.font.SysFont(None, 30)
 
     """
-        load images from assets 
+        menu returns the selected mode (Player, BFS , ...), player_speed and the path of map.
+    """
+    if replay_path is None:
+        mode, player_speed, map_path = main_menu(screen, clock, font)
+        map_lines = read_map_lines(map_path)
+        replay = None
+    else:
+        replay = load_replay(replay_path)
+        mode, player_speed, map_path = "Replay", PLAYER_SPEED, replay_path
+        map_lines = replay.map_rows()
+
+    """
+        load images from assets, once the menu is done so it shows up sooner
     """
     player_images = {
         "up": pygame.transform.scale(pygame.image.load("assets/pacman-up/1.png").convert_alpha(), (PLAYER_SIZE, PLAYER_SIZE)),
@@ -172,20 +281,14 @@ def main():
         pygame.transform.scale(pygame.image.load("assets/ghosts/pinky.png").convert_alpha(), (GHOST_SIZE, GHOST_SIZE)),
     ]
 
-    """
-        menu returns the selected mode (Player, BFS , ...), player_speed and the path of map.
-    """
-    mode, player_speed, map_path = main_menu(screen, clock, font)
-
-    def setup_game(map_path):
+    def setup_game(lines):
         """
             In Player mode:
-            This function is used to parse the map and create the objects inside the game.
+            This function is used to parse the map (its lines) and create the objects inside the game.
+            'grid' (a GridIndex) tells which entity is on which cell; player mode keeps it up to date.
         """
         walls, free_cells, fruits, ghosts = [], [], [], []
         player = None
-        with open(map_path, 'r') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
         ROWS = len(lines)
         COLS = len(lines[0]) 
         for y, row in enumerate(lines):
@@ -214,37 +317,69 @@ def main():
                     ghosts.append(Ghost(x, y, "vertical", random.sample(
                         ghost_images, 2), speed=player_speed / P2G_SPEED))
                     free_cells.remove((x, y))
-        return walls, free_cells, fruits, ghosts, player
+        grid = GridIndex(COLS, ROWS, walls, fruits, ghosts)
+        return walls, free_cells, fruits, ghosts, player, grid
 
-    walls, free_cells, fruits, ghosts, player = setup_game(map_path)
+    walls, free_cells, fruits, ghosts, player, grid = setup_game(map_lines)
+    renderer = FrameRenderer(screen, walls, font, AI_MODE_FPS if mode not in PLAYER_MODES else PLAYER_MODE_FPS)
     score, game_over = 0, False
     running = True
 
     """
         Load AI solution.
     """
-    moves = []
+    frames = None
+    last_frame = None
     frame_index = 0
     total_frames = 0
+    stats_text = None
+    background, cache, cache_key, replay_version = None, None, None, 0
     
-    if mode != "Player":
-        print("Running solver...")
-        moves = get_map_history_info(solver_mode=mode, file_path=map_path)
-        if moves is not None and moves:
-            moves.pop(0)
-        else:
-            print("Couldn't find a solution. Either the algorithm reached time limit or the search problem was unsolvable!")
-            return
+    if mode not in PLAYER_MODES:
+        if replay is None:
+            cache, cache_key = get_solution_cache(mode, map_path)
+            if cache is not None:
+                replay = cache.get(cache_key)
+                if replay is not None:
+                    print(f"Loaded the solution from the cache. {cache.summary()}")
+
+        if replay is None and PROFILE_DIR is not None:
+            print("Running solver...")
+            history = get_map_history_info(solver_mode=mode, file_path=map_path)
+            if history is None or len(history) == 0:
+                print("Couldn't find a solution. Either the algorithm reached time limit or the search problem was unsolvable!")
+                return
+            replay = get_replay(history)
+        elif replay is None:
+            """
+                The solver runs in a worker process; the loop below shows its progress and starts playing
+                the first solution that arrives (anytime solvers send better ones later).
+            """
+            print("Running solver in the background...")
+            background = start_background_solve(mode, map_path)
+
+        """
+            Frames are built lazily while playing; the first one is the initial state which setup_game already shows.
+            LEFT and RIGHT seek in the replay.
+        """
+        if replay is not None:
+            frames = replay.iter_frames(1)
+            total_frames = len(replay) - 1
+            print("Frames:", total_frames)
 
-        total_frames = len(moves) 
-        print("Frames:", len(moves))
+            stats = replay.stats
+            if stats is not None:
+                stats_text = font.render(f"Expanded: {stats.nodes_expanded:,} ({stats.states_per_second:,.0f} states/s)",
+                                         True, WHITE)
 
 
+    autopilot = get_autopilot(map_lines) if mode == "Autopilot" else None
+
     score = 0
     game_over = False
     running = True
     # PLAYER MODE
-    if mode == "Player":
+    if mode in PLAYER_MODES:
         while running:
             dt = clock.tick(PLAYER_MODE_FPS) / 1000.0
             for event in pygame.event.get():
@@ -253,62 +388,62 @@ def main():
                 elif event.type == pygame.KEYDOWN:
                     if game_over and (event.key == pygame.K_RETURN or event.key == pygame.K_SPACE):
                         # restart game
-                        walls, free_cells, fruits, ghosts, player = setup_game(map_path)
+                        walls, free_cells, fruits, ghosts, player, grid = setup_game(map_lines)
+                        renderer.invalidate()
                         score = 0
                         game_over = False
 
-            screen.fill(BLACK)
-
             if not game_over:
                 player_prev = (player.grid_x, player.grid_y)
-                ghost_prev_positions = [(g.grid_x, g.grid_y) for g in ghosts]
+                ghost_prev_positions = {id(g): (g.grid_x, g.grid_y) for g in ghosts}
+
+                if autopilot is not None:
+                    move = autopilot_move(autopilot, player, fruits, ghosts, lambda row, col: not autopilot.layout.is_valid(row, col))
+                    player.move_string, player.move_index = move or "", 0
 
                 # update player and ghost positions
-                player.update(walls, dt)
+                player.update(grid, dt)
                 for ghost in ghosts:
-                    ghost.update(walls, dt)
-
-                for fruit in fruits[:]:
-                    # graphically checks collision between player and fruit
-                    if player.rect.colliderect(fruit.rect):
-                        if fruit.type == "normal":
+                    ghost.update(grid, dt)
+
+                player_cell = (player.grid_x, player.grid_y)
+                fruit = grid.fruit_at(*player_cell)
+                # entities fill whole cells, so the player touches a fruit or a ghost only on its own cell
+                if fruit is not None:
+                    if fruit.type == "normal":
+                        score += fruit.points
+                        fruits.remove(fruit)
+                        grid.remove_fruit(fruit)
+
+                    elif fruit.type == "special":
+                        normal_left = any(f.type == "normal" for f in fruits)
+                        if not normal_left:
                             score += fruit.points
                             fruits.remove(fruit)
+                            grid.remove_fruit(fruit)
 
-                        elif fruit.type == "special":
-                            normal_left = any(f.type == "normal" for f in fruits)
-                            if not normal_left:
-                                score += fruit.points
-                                fruits.remove(fruit)
-                        break
+                if grid.ghosts_at(*player_cell):
+                    game_over = True
+                elif any(ghost_prev_positions[id(ghost)] == player_cell for ghost in grid.ghosts_at(*player_prev)):
+                    # the player and a ghost swapped cells
+                    game_over = True
 
-                for ghost, ghost_prev in zip(ghosts, ghost_prev_positions):
-                    if player.rect.colliderect(ghost.rect): # graphically checks collision between player and ghost
-                        game_over = True
-                    elif (player_prev == (ghost.grid_x, ghost.grid_y) and
-                        ghost_prev == (player.grid_x, player.grid_y)):
-                        game_over = True
 
+            overlays = [("score", renderer.text(f"Score: {score}", WHITE), (10, 10))]
 
-            # draw all the objects inside the game
-            camera_offset = calculate_camera_offset(
-                player, COLS * CELL_SIZE, ROWS * CELL_SIZE)
-            draw_all(screen, camera_offset, walls, fruits, ghosts, player)
-
-            score_text = font.render(f"Score: {score}", True, WHITE)
-            screen.blit(score_text, (10, 10))
+            if autopilot is not None and autopilot.planner is not None:
+                planner = autopilot.planner
+                replan_text = renderer.text(f"Replan: {planner.last_expanded} expanded, "
+                                            f"{planner.last_replan_time * 1000:.2f} ms", WHITE)
+                overlays.append(("replan", replan_text, (10, 40)))
 
             if game_over:
-                messages = ["GAME OVER!", "Press Enter or Space to restart"]
-                for i, msg in enumerate(messages):
-                    text_surface = font.render(msg, True, RED)
-                    text_x = (COLS * CELL_SIZE) // 2 - \
-                        text_surface.get_width() // 2
-                    text_y = (ROWS * CELL_SIZE) // 2 - (len(messages) *
-                                                        font.get_height()) // 2 + i * font.get_height()
-                    screen.blit(text_surface, (text_x, text_y))
+                overlays += game_over_overlays(renderer, font)
 
-            pygame.display.flip()
+            # draw all the objects inside the game
+            camera_offset = calculate_camera_offset(
+                player, COLS * CELL_SIZE, ROWS * CELL_SIZE)
+            draw_all(renderer, camera_offset, fruits, ghosts, player, overlays)
 
         pygame.quit()
 
@@ -316,60 +451,98 @@ def main():
     else:
         while running:
             dt = clock.tick(AI_MODE_FPS) / 1000.0
+
+            if background is not None and not background.done:
+                background.poll()
+                if background.version != replay_version:
+                    # A (better) solution arrived: play it from the current frame on
+                    replay, replay_version = background.replay, background.version
+                    total_frames = len(replay) - 1
+                    frame_index = min(frame_index, total_frames)
+                    frames = replay.iter_frames(frame_index + 1)
+                    print(f"Solution with {total_frames} moves received after {background.wall_time:.2f}s")
+
+                if background.done:
+                    if background.error is not None:
+                        print(f"{mode} failed:\n{background.error}")
+                    else:
+                        print(f"Solver done! It took {background.elapsed:.2f} seconds")
+                        stats = background.stats
+                        stats_text = font.render(f"Expanded: {stats['nodes_expanded']:,} "
+                                                 f"({stats['states_per_second']:,.0f} states/s)", True, WHITE)
+                    if replay is None:
+                        print("Couldn't find a solution. Either the algorithm reached time limit or the search problem was unsolvable!")
+                        running = False
+                    elif cache is not None and background.error is None:
+                        """ A solution streamed before a crash may not be the one a full run returns """
+                        cache.put(cache_key, replay)
+                        print(cache.summary())
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-                elif event.type == pygame.KEYDOWN:
+                    if background is not None and not background.done:
+                        background.cancel()
+                        print("Solver cancelled.")
+                elif event.type == pygame.KEYDOWN and replay is not None:
                     if game_over and (event.key == pygame.K_RETURN or event.key == pygame.K_SPACE):
                         # Restart game
-                        walls, free_cells, fruits, ghosts, player = setup_game(map_path)
+                        walls, free_cells, fruits, ghosts, player, grid = setup_game(map_lines)
+                        renderer.invalidate()
                         score = 0
                         game_over = False
                         frame_index = 0
-
-            screen.fill(BLACK)
+                        frames = replay.iter_frames(1)
+                        last_frame = None
+                    elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                        # Seek: the frame is rebuilt from the keyframe before it, then playback goes on from there
+                        step = REPLAY_SEEK_FRAMES if event.key == pygame.K_RIGHT else -REPLAY_SEEK_FRAMES
+                        frame_index = min(max(frame_index + step, 0), total_frames)
+                        last_frame = replay.frame(frame_index)
+                        frames = replay.iter_frames(frame_index + 1)
 
             if not game_over:
 
-                if total_frames > 0 and frame_index < len(moves):
+                if frame_index < total_frames:
                     """
-                        extract the information of "frame_index" step in history, this information is passed
+                        extract the information of the next step in history, this information is passed
                         to update_render_state to parse and render the informatiion
                     """
-                    direction, info = moves[frame_index]
-                    update_render_state(player, ghosts, fruits, direction, info)
+                    last_frame = next(frames)
                     frame_index += 1
-                    
-                elif moves and len(moves) > 0:
-                    # Stay on last frame
-                    direction, info = moves[-1]
+
+                if last_frame is not None:
+                    # Stay on last frame once the history is over
+                    direction, info = last_frame
                     update_render_state(player, ghosts, fruits, direction, info)
 
 
-            # Draw all entities
-            camera_offset = calculate_camera_offset(
-                player, COLS * CELL_SIZE, ROWS * CELL_SIZE)
-            draw_all(screen, camera_offset, walls, fruits, ghosts, player)
-
             # Display game info
-            score_text = font.render(f"Score: {score}", True, WHITE)
-            screen.blit(score_text, (10, 10))
-        
-            frame_text = font.render(f"Frame: {frame_index}/{len(moves)}", True, WHITE)
-            screen.blit(frame_text, (10, 40))
+            overlays = [("score", renderer.text(f"Score: {score}", WHITE), (10, 10)),
+                        ("frame", renderer.text(f"Frame: {frame_index}/{total_frames}", WHITE), (10, 40))]
+
+            if stats_text is not None:
+                overlays.append(("stats", stats_text, (10, 70)))
+
+            if background is not None and not background.done:
+                progress = background.progress
+                lines = [f"Solving with {mode}... {background.wall_time:.1f}s (close the window to cancel)",
+                         f"Expanded: {progress['expanded']:,}  Frontier: {progress['frontier']:,} "
+                         f"(peak {progress['peak_frontier']:,})  Visited: {progress['visited']:,}"]
+                for i, line in enumerate(lines):
+                    overlays.append((f"progress_{i}", renderer.text(line, YELLOW), (10, 70 + i * 30)))
 
             if game_over:
-                messages = ["GAME OVER!", "Press Enter or Space to restart"]
-                for i, msg in enumerate(messages):
-                    text_surface = font.render(msg, True, RED)
-                    text_x = (COLS * CELL_SIZE) // 2 - text_surface.get_width() // 2
-                    text_y = (ROWS * CELL_SIZE) // 2 - (len(messages) * font.get_height()) // 2 + i * font.get_height()
-                    screen.blit(text_surface, (text_x, text_y))
+                overlays += game_over_overlays(renderer, font)
 
-            pygame.display.flip()
+            # Draw all entities
+            camera_offset = calculate_camera_offset(
+                player, COLS * CELL_SIZE, ROWS * CELL_SIZE)
+            draw_all(renderer, camera_offset, fruits, ghosts, player, overlays)
 
         pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pac-Man AI Visualizer")
+    parser.add_argument("--replay", metavar="FILE", help="play a saved replay instead of opening the menu")
+    main(parser.parse_args().replay)
\ No newline at end of file
@@ -94,11 +94,13 @@ def choose_map(screen, clock, font):
 
 
 def main_menu(screen, clock, font):
-    """Main menu — choose Player or one of the AI solvers, map, and speed."""
-    options = SOLVER_MODES + ["Player"]
+    """Main menu — choose Player, Autopilot or one of the AI solvers, map, and speed."""
+    options = SOLVER_MODES + PLAYER_MODES
     selected = 0
     player_speed = PLAYER_SPEED
     running = True
+    speed_y = ROWS * CELL_SIZE - 60
+    option_spacing = min(60, (speed_y - 150) // len(options))  # ✅ Keep every solver above the speed control
 
     # 🎨 Background and fonts
     background = load_background("assets/menu_bg/PACMAN_MENU.jpg", screen.get_size())
@@ -115,11 +117,11 @@ def main_menu(screen, clock, font):
         for i, opt in enumerate(options):
             color = GREEN if i == selected else RED
             text = menu_font.render(opt, True, color)
-            screen.blit(text, (COLS * CELL_SIZE // 2 - text.get_width() // 2, 150 + i * 60))
+            screen.blit(text, (COLS * CELL_SIZE // 2 - text.get_width() // 2, 150 + i * option_spacing))
 
         # ⚙️ Speed control
         speed_text = menu_font.render(f"Game Speed: {player_speed} (A/D)", True, WHITE)
-        screen.blit(speed_text, (COLS * CELL_SIZE // 2 - speed_text.get_width() // 2, 500))
+        screen.blit(speed_text, (COLS * CELL_SIZE // 2 - speed_text.get_width() // 2, speed_y))
 
         pygame.display.flip()
         clock.tick(PLAYER_MODE_FPS)
@@ -0,0 +1,180 @@
+import pygame
+from collections import OrderedDict, deque
+from time import perf_counter
+from config import *
+
+"""
+    Rendering helpers for main.py: the walls are drawn once into cached tiles instead of one rect per wall per
+    frame, and only the parts of the screen that changed since the last frame are redrawn and sent to the
+    display with pygame.display.update(rects).
+"""
+
+WALL_TILE_CELLS = 16  # cells per side of a cached wall tile
+MAX_WALL_TILES = 64  # tiles kept in memory; big maps rebuild the least recently seen ones
+FRAME_TIME_SAMPLES = 60  # frames averaged by the frame time readout
+MAX_CACHED_TEXTS = 128
+
+
+class WallLayer:
+    def __init__(self, walls):
+        """
+        The static part of the map (black floor, blue walls) pre-rendered in square tiles. Tiles are built
+        the first time the camera shows them, so a 200x200 map never needs one huge surface.
+
+        Args:
+            walls (list[Wall]): The walls of the map.
+        """
+        self.wall_cells = {(wall.rect.x // CELL_SIZE, wall.rect.y // CELL_SIZE) for wall in walls}
+        self.tile_size = WALL_TILE_CELLS * CELL_SIZE
+        self.tiles = OrderedDict()
+
+    def get_tile(self, tile_x, tile_y):
+        tile = self.tiles.get((tile_x, tile_y))
+        if tile is None:
+            tile = pygame.Surface((self.tile_size, self.tile_size)).convert()
+            tile.fill(BLACK)
+            for x in range(tile_x * WALL_TILE_CELLS, (tile_x + 1) * WALL_TILE_CELLS):
+                for y in range(tile_y * WALL_TILE_CELLS, (tile_y + 1) * WALL_TILE_CELLS):
+                    if (x, y) in self.wall_cells:
+                        pygame.draw.rect(tile, BLUE, ((x - tile_x * WALL_TILE_CELLS) * CELL_SIZE,
+                                                      (y - tile_y * WALL_TILE_CELLS) * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            self.tiles[(tile_x, tile_y)] = tile
+            while len(self.tiles) > MAX_WALL_TILES:
+                self.tiles.popitem(last=False)
+        self.tiles.move_to_end((tile_x, tile_y))
+        return tile
+
+    """
+        Draws the background under the screen rect 'area' for the given camera offset.
+    """
+    def draw(self, screen, area, camera_offset):
+        cam_x, cam_y = camera_offset
+        world = area.move(cam_x, cam_y)
+        size = self.tile_size
+        screen.set_clip(area)
+        for tile_y in range(world.top // size, (world.bottom - 1) // size + 1):
+            for tile_x in range(world.left // size, (world.right - 1) // size + 1):
+                screen.blit(self.get_tile(tile_x, tile_y), (tile_x * size - cam_x, tile_y * size - cam_y))
+        screen.set_clip(None)
+
+
+class FrameRenderer:
+    def __init__(self, screen, walls, font, target_fps):
+        """
+        Draws frames made of the wall layer and a list of sprites, updating only dirty rects.
+
+        A sprite is redrawn when its image or position changed, when it appeared or disappeared, or when it
+        overlaps such a change (its whole rect is restored first, so translucent images are never blended
+        twice). When the camera moves every pixel changes and the frame is drawn in full.
+
+        Args:
+            screen (pygame.Surface): The window surface.
+            walls (list[Wall]): The walls of the map.
+            font (pygame.font.Font): Font of the frame time readout.
+            target_fps (int): The FPS the loop asks clock.tick() for, shown next to the measured one.
+        """
+        self.screen = screen
+        self.wall_layer = WallLayer(walls)
+        self.font = font
+        self.target_fps = target_fps
+        self.camera_offset = None
+        """ key -> (image, screen rect) of the sprites drawn last frame """
+        self.sprites = {}
+        """ (text, color) -> surface, so overlays that did not change are the same image and stay clean """
+        self.texts = OrderedDict()
+        self.frame_intervals = deque(maxlen=FRAME_TIME_SAMPLES)
+        self.render_times = deque(maxlen=FRAME_TIME_SAMPLES)
+        self.last_frame = None
+
+    """ Makes the next frame a full redraw, e.g. after the game was set up again """
+    def invalidate(self):
+        self.camera_offset = None
+
+    def text(self, text, color):
+        surface = self.texts.get((text, color))
+        if surface is None:
+            surface = self.texts[(text, color)] = self.font.render(text, True, color)
+            while len(self.texts) > MAX_CACHED_TEXTS:
+                self.texts.popitem(last=False)
+        self.texts.move_to_end((text, color))
+        return surface
+
+    def frame_time_text(self):
+        if not self.frame_intervals:
+            return None
+        fps = len(self.frame_intervals) / sum(self.frame_intervals)
+        render_ms = 1000 * sum(self.render_times) / len(self.render_times)
+        return self.font.render(f"FPS {fps:.1f}/{self.target_fps}  render {render_ms:.2f} ms "
+                                f"(max {1000 * max(self.render_times):.2f})", True, GREEN)
+
+    def render(self, camera_offset, sprites):
+        """
+        Draws a frame and sends the changed parts of it to the display.
+
+        Args:
+            camera_offset (tuple): (cam_x, cam_y), subtracted from the sprite positions.
+            sprites (list): (key, image, (x, y) world position) in drawing order. Keys identify a sprite
+                across frames (entity ids, overlay names).
+
+        Returns:
+            list[pygame.Rect]: The rects that were updated.
+        """
+        t = perf_counter()
+        screen = self.screen
+        screen_rect = screen.get_rect()
+        cam_x, cam_y = camera_offset
+
+        if SHOW_FRAME_TIME:
+            readout = self.frame_time_text()
+            if readout is not None:
+                sprites = [*sprites, ("frame_time", readout, (cam_x + 10, cam_y + screen_rect.height - 30))]
+
+        current = {}
+        for key, image, (x, y) in sprites:
+            rect = image.get_rect(topleft=(x - cam_x, y - cam_y))
+            if rect.colliderect(screen_rect):
+                current[key] = (image, rect)
+
+        if camera_offset != self.camera_offset:
+            self.wall_layer.draw(screen, screen_rect, camera_offset)
+            for image, rect in current.values():
+                screen.blit(image, rect)
+            dirty = [screen_rect]
+        else:
+            dirty = []
+            for key, (image, rect) in current.items():
+                previous = self.sprites.get(key)
+                if previous is None or previous[0] is not image or previous[1] != rect:
+                    dirty.append(rect)
+                    if previous is not None:
+                        dirty.append(previous[1])
+            dirty.extend(rect for key, (_, rect) in self.sprites.items() if key not in current)
+
+            """ Sprites touching a dirty rect are redrawn whole, so their rects become dirty too """
+            redrawn = set()
+            grown = True
+            while grown:
+                grown = False
+                for key, (_, rect) in current.items():
+                    if key not in redrawn and rect.collidelist(dirty) != -1:
+                        redrawn.add(key)
+                        dirty.append(rect)
+                        grown = True
+
+            dirty = [rect.clip(screen_rect) for rect in dirty]
+            for rect in dirty:
+                self.wall_layer.draw(screen, rect, camera_offset)
+            for key, (image, rect) in current.items():
+                if key in redrawn:
+                    screen.blit(image, rect)
+
+        pygame.display.update(dirty)
+        self.sprites = current
+        self.camera_offset = camera_offset
+
+        now = perf_counter()
+        self.render_times.append(now - t)
+        if self.last_frame is not None:
+            self.frame_intervals.append(now - self.last_frame)
+        self.last_frame = now
+        return dirty
@@ -0,0 +1,58 @@
+from core.environment.map_loader import MapLoader
+from core.environment.game import PacmanGame
+from core.solvers.search_stats import SearchStats
+import argparse
+import time
+from config import SOLVERS, SOLVER_MODES, TIME_LIMITS
+
+"""
+    Headless entry point: solves maps without pygame, pandas or any solver but the chosen one being imported.
+    Batch jobs and services should import from here rather than from main.py.
+"""
+
+
+def load_game(file_path):
+    is_wall, player, ghosts, snacks = MapLoader(file_path=file_path).load()
+    return PacmanGame(player=player, ghosts=ghosts, snacks=snacks, is_wall=is_wall, move_direction="")
+
+
+def solve(file_path, solver_mode, timeout=None, stats=None, **solver_options):
+    """
+    Loads the map at 'file_path' and runs the solver of 'solver_mode' on it.
+
+    Args:
+        file_path (str): Path of the map file.
+        solver_mode (str): A key of config.SOLVERS, e.g. "A*".
+        timeout (int, optional): Time limit in seconds. Defaults to TIME_LIMITS[solver_mode].
+        stats (SearchStats, optional): Filled in by the solver.
+        **solver_options: Extra keyword arguments for the solver (e.g. macro_actions=True).
+
+    Returns:
+        tuple: (the solver's output (a RenderHistory, or None when no solution was found), elapsed seconds)
+    """
+    solver = SOLVERS[solver_mode]
+    game = load_game(file_path)
+    t1 = time.time()
+    history = solver(game, timeout=timeout or TIME_LIMITS[solver_mode], stats=stats, **solver_options)
+    return history, time.time() - t1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve one map without the GUI and print the moves.")
+    parser.add_argument("map", help="map file")
+    parser.add_argument("solver", choices=SOLVER_MODES, help="solver to run")
+    parser.add_argument("--timeout", type=int, help="time limit in seconds (default: from config.py)")
+    parser.add_argument("--save-replay", metavar="FILE", help="write the solution as a replay file for main.py --replay")
+    args = parser.parse_args()
+
+    stats = SearchStats(args.solver)
+    history, elapsed = solve(args.map, args.solver, args.timeout, stats)
+    if history is None:
+        print(f"No solution found ({elapsed:.2f}s).")
+    else:
+        print(f"Solved in {elapsed:.2f}s, {len(history) - 1} moves:")
+        print("".join(history.path))
+        if args.save_replay:
+            from core.solvers.replay import Replay
+            Replay.from_history(history).save(args.save_replay)
+            print(f"Replay saved to {args.save_replay}")
@@ -0,0 +1,239 @@
+from solve import load_game
+from core.environment.packed_game import PackedGame
+from core.solvers.search_stats import SearchStats
+from tester import classify_result
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from copy import deepcopy
+import argparse
+import asyncio
+import contextlib
+import http.client
+import json
+import os
+import time
+import traceback
+from config import SOLVERS, SOLVER_MODES, TIME_LIMITS, SOLVE_SERVICE_HOST, SOLVE_SERVICE_PORT
+
+"""
+    A long running solve service: a small HTTP/1.0 server on localhost (asyncio) in front of a pool of
+    worker processes. Workers stay alive between requests and keep the maps they loaded (walls, layout,
+    ghost schedule, distance tables) in memory, so after the first request on a map a solve costs only
+    the search itself instead of a Python start, the imports and the map parsing.
+
+    Endpoints:
+        POST /solve   body {"map": path, "solver": mode, "timeout": seconds (optional),
+                            "options": {solver keyword arguments} (optional), "frames": bool (optional)}
+                      answers {"map", "algorithm", "result", "moves", "path", "time", "stats"} and "frames"
+                      (the render history as a list of (move, get_info) pairs) when asked for.
+        GET /health   answers {"status": "ok", "workers", "requests", "uptime"}.
+"""
+
+MAX_CACHED_GAMES = 32  # maps a worker keeps loaded
+MAX_BODY_BYTES = 1 << 20
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+                500: "Internal Server Error"}
+
+""" Maps loaded by this worker process: (absolute path, mtime, size) -> WarmMap """
+_games = OrderedDict()
+
+
+class WarmMap:
+    def __init__(self, file_path):
+        """
+        A loaded map with the tables every solve on it needs: the ghost schedule and the maze distances to
+        the snacks. The layout and the DistanceTable are already shared per process by their own caches.
+
+        Args:
+            file_path (str): Path of the map file.
+        """
+        self.game = load_game(file_path)
+        packed_game = PackedGame(self.game)
+        self.ghost_schedule = packed_game.ghost_schedule
+        self.snack_distances = packed_game.get_snack_distances()
+
+    """
+        Returns a copy of the game that solvers may change freely. PackedGame takes the cached schedule and
+        distances from it instead of building them again.
+    """
+    def new_game(self):
+        game = deepcopy(self.game)
+        game.get_ghost_schedule = lambda: self.ghost_schedule
+        game.get_snack_distances = lambda: self.snack_distances
+        return game
+
+
+"""
+    Returns the WarmMap of the map in 'file_path', loading it only the first time this process sees this
+    version of the file (an edited map is loaded again).
+"""
+def load_warm_map(file_path):
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    warm_map = _games.get(key)
+    if warm_map is None:
+        warm_map = WarmMap(file_path)
+        _games[key] = warm_map
+        while len(_games) > MAX_CACHED_GAMES:
+            _games.popitem(last=False)
+    _games.move_to_end(key)
+    return warm_map
+
+
+""" Pool initializer: loads 'map_paths' in every worker before the first request arrives """
+def preload_maps(map_paths):
+    for file_path in map_paths:
+        load_warm_map(file_path)
+
+
+"""
+    Runs one solve request in a worker process and returns the JSON-ready answer. The cached game is copied
+    so nothing a solver does to it can leak into later requests.
+"""
+def solve_job(request):
+    mode = request["solver"]
+    stats = SearchStats(mode)
+    game = load_warm_map(request["map"]).new_game()
+    t1 = time.time()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        history = SOLVERS[mode](game, timeout=request.get("timeout") or TIME_LIMITS[mode], stats=stats,
+                                 **(request.get("options") or {}))
+    elapsed = time.time() - t1
+
+    result, moves = classify_result(history)
+    answer = {"map": request["map"], "algorithm": mode, "result": result, "moves": moves, "time": elapsed,
+              "path": None if history is None else list(history.path), "stats": stats.as_dict()}
+    if request.get("frames") and history is not None:
+        answer["frames"] = history.to_list()
+    return answer
+
+
+class SolveService:
+    def __init__(self, host=SOLVE_SERVICE_HOST, port=SOLVE_SERVICE_PORT, workers=None, preload=()):
+        """
+        Args:
+            host (str): Address to listen on. Keep it local, requests name files on this machine.
+            port (int): Port to listen on.
+            workers (int, optional): Number of solver processes. Defaults to the CPU count.
+            preload (list[str]): Map files every worker loads when it starts.
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.preload = list(preload)
+        self.pool = None
+        self.requests = 0
+        self.start_time = time.time()
+
+    def start_pool(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=preload_maps,
+                                        initargs=(self.preload,))
+
+    async def serve_forever(self):
+        self.start_pool()
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"Solve service listening on http://{self.host}:{self.port} with {self.workers} workers")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            status, answer = await self.handle_request(reader)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as error:
+            status, answer = 400, {"error": f"Malformed request: {error}"}
+
+        body = json.dumps(answer).encode()
+        writer.write(f"HTTP/1.0 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+        writer.close()
+
+    async def handle_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise ValueError("bad request line")
+        method, target, _ = request_line
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if target == "/health":
+            return 200, {"status": "ok", "workers": self.workers, "requests": self.requests,
+                         "uptime": time.time() - self.start_time}
+        if target != "/solve":
+            return 404, {"error": f"Unknown path {target}"}
+        if method != "POST":
+            return 405, {"error": "Use POST /solve"}
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            return 413, {"error": "Request too large"}
+        request = json.loads(await reader.readexactly(length))
+        return await self.solve(request)
+
+    async def solve(self, request):
+        if not isinstance(request, dict) or request.get("solver") not in SOLVER_MODES or "map" not in request:
+            return 400, {"error": f"Expected {{\"map\": path, \"solver\": one of {SOLVER_MODES}}}"}
+        if not os.path.isfile(request["map"]):
+            return 404, {"error": f"No map file {request['map']}"}
+
+        self.requests += 1
+        try:
+            answer = await asyncio.get_running_loop().run_in_executor(self.pool, solve_job, request)
+        except BrokenProcessPool:
+            """ A worker died (e.g. killed for using too much memory): the whole pool has to be replaced """
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.start_pool()
+            return 500, {"error": "A solver process crashed, the worker pool was restarted."}
+        except Exception:
+            return 500, {"error": traceback.format_exc()}
+        return 200, answer
+
+
+def request_solve(map_path, solver_mode, timeout=None, frames=False, host=SOLVE_SERVICE_HOST,
+                  port=SOLVE_SERVICE_PORT, **options):
+    """
+    Client side of POST /solve. Solver keyword arguments (e.g. macro_actions=True) go in 'options'.
+
+    Returns:
+        dict: The service's answer (see the top of this file).
+
+    Raises:
+        RuntimeError: When the service answers with an error.
+    """
+    body = json.dumps({"map": map_path, "solver": solver_mode, "timeout": timeout, "options": options,
+                       "frames": frames})
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        connection.request("POST", "/solve", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        answer = json.loads(response.read())
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"Solve service error {response.status}: {answer.get('error')}")
+    return answer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve solve requests over HTTP on localhost.")
+    parser.add_argument("--host", default=SOLVE_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SOLVE_SERVICE_PORT)
+    parser.add_argument("--workers", type=int, help="number of solver processes (default: CPU count)")
+    parser.add_argument("--preload", nargs="+", default=[], metavar="MAP", help="maps to load in every worker")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(SolveService(args.host, args.port, args.workers, args.preload).serve_forever())
+    except KeyboardInterrupt:
+        print("Solve service stopped.")
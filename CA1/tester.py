@@ -1,59 +1,363 @@
 from core.environment.map_loader import MapLoader
 from core.environment.game import PacmanGame
+from core.solvers.search_stats import SearchStats
+from core.solvers.profiler import profile_name, profile_solver
+from core.solvers.solution_cache import SolutionCache
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import re
+import resource
+import signal
+import sys
 import time
-import pandas as pd
+import traceback
 from copy import deepcopy
-from tabulate import tabulate
 from config import *
 
+BENCHMARK_OUTPUT_DIR = "benchmark_results"
+KILL_GRACE_PERIOD = 5  # seconds a solver may run past its time limit before it is killed
+STATS_FIELDS = ["nodes_expanded", "nodes_generated", "duplicates_pruned", "peak_frontier", "peak_visited",
+                "effective_branching_factor", "states_per_second", "successor_time", "hash_time", "heuristic_time"]
+
 """
     Runs a given 'solver' on a given 'game' and returns output of the 'solver'.
     It sets a time limit on the solver to terminate after reaching it. Change it from config.py
+    With 'profile_dir', the run is profiled and its reports are written there as '<report_name>.*'
+    (see core/solvers/profiler.py).
 """
-def run_solver(solver, game, timeout=1):
+def run_solver(solver, game, timeout=1, stats=None, profile_dir=None, report_name="profile"):
+    if profile_dir is not None:
+        moves, elapsed, _ = profile_solver(solver, deepcopy(game), profile_dir, report_name, timeout=timeout,
+                                           stats=stats)
+        return moves, elapsed
     t1 = time.time()
-    moves = solver(deepcopy(game), timeout=timeout)
+    moves = solver(deepcopy(game), timeout=timeout, stats=stats)
     t2 = time.time()
     return moves, t2-t1
 
 """
     Runs each solver on the given map and returns the result in a Pandas.DataFrame.
+    pandas is imported here rather than at the top, it is slow to import and only this mode uses it.
+    With a SolutionCache 'cache', solutions found before are read from it instead of searched again
+    (their Time is the load time and Expanded is 0); profiled runs always search.
 """
-def run_test(file_path):
-    df = pd.DataFrame(columns=['Algorithm', 'Time', 'Numof Moves', "Result"])
+def run_test(file_path, profile_dir=None, cache=None):
+    import pandas as pd
+    df = pd.DataFrame(columns=['Algorithm', 'Time', 'Numof Moves', "Result", 'Expanded', 'States/s', 'Cache'])
+    if profile_dir is not None:
+        cache = None
 
     is_wall, player, ghosts, snacks = MapLoader(file_path=file_path).load()
     game = PacmanGame(player=player, ghosts=ghosts, snacks=snacks, is_wall=is_wall, move_direction="")
 
     for solver_mode in SOLVER_MODES:
+        t1 = time.time()
+        stats = SearchStats(solver_mode)
+        moves, cache_status = None, "-"
+        if cache is not None:
+            key = cache.key(file_path, solver_mode, TIME_LIMITS[solver_mode])
+            moves = cache.get(key)
+            cache_status = "miss" if moves is None else "hit"
         try:
-            moves, time = run_solver(solver=SOLVERS[solver_mode], game=deepcopy(game), timeout=TIME_LIMITS[solver_mode])
-        except:
-            algorithm = solver_mode
-            df.loc[len(df)] = [algorithm, time, 0, "Error"]
+            if moves is None:
+                moves, elapsed = run_solver(solver=SOLVERS[solver_mode], game=deepcopy(game),
+                                            timeout=TIME_LIMITS[solver_mode], stats=stats, profile_dir=profile_dir,
+                                            report_name=profile_name(file_path, solver_mode))
+                if cache is not None:
+                    cache.put(key, moves)
+            else:
+                elapsed = time.time() - t1
+        except Exception:
+            print(f"{solver_mode} failed on {file_path}:")
+            traceback.print_exc()
+            df.loc[len(df)] = [solver_mode, time.time() - t1, 0, "Error", stats.nodes_expanded,
+                               f"{stats.states_per_second:,.0f}", cache_status]
             continue
-        algorithm = solver_mode
-        if moves is None:
-            df.loc[len(df)] = [algorithm, time, 0, "NotFound"]
-        elif len(moves) == 1:
-            df.loc[len(df)] = [algorithm, time, 0           , "Timeout"]
-        else:
-            df.loc[len(df)] = [algorithm, time, len(moves)-1, "Success"]
+        result, num_moves = classify_result(moves)
+        df.loc[len(df)] = [solver_mode, elapsed, num_moves, result, stats.nodes_expanded,
+                           f"{stats.states_per_second:,.0f}", cache_status]
 
     df['Time'] = df['Time'].apply(lambda x: f"{x:.2f}")
     return df
 
+"""
+    Maps a solver's output to the (Result, Numof Moves) pair shown in the tables.
+"""
+def classify_result(moves):
+    if moves is None:
+        return "NotFound", 0
+    if len(moves) == 1:
+        return "Timeout", 0
+    return "Success", len(moves) - 1
+
+
+"""
+    Body of a benchmark worker process: runs one solver on one map and sends a result dict through 'connection'.
+    'memory_limit_mb' caps the address space of the worker, so a solver that blows up memory fails alone.
+    With 'profile_dir', the solver is profiled (see run_solver).
+"""
+def run_job(file_path, solver_mode, timeout, connection, memory_limit_mb=None, verbose=False, profile_dir=None):
+    """ terminate() raises SystemExit here, so solvers with worker processes (HDA*) get to stop them """
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    if memory_limit_mb is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    job = {"map": file_path, "algorithm": solver_mode, "time_limit": timeout, "error": None}
+    stats = SearchStats(solver_mode)
+    t1 = time.time()
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(None if verbose else devnull):
+            is_wall, player, ghosts, snacks = MapLoader(file_path=file_path).load()
+            game = PacmanGame(player=player, ghosts=ghosts, snacks=snacks, is_wall=is_wall, move_direction="")
+            moves, elapsed = run_solver(solver=SOLVERS[solver_mode], game=game, timeout=timeout, stats=stats,
+                                        profile_dir=profile_dir, report_name=profile_name(file_path, solver_mode))
+        job["result"], job["moves"] = classify_result(moves)
+        job["time"] = elapsed
+        job["trace"] = getattr(moves, "trace", None)
+    except MemoryError:
+        job.update(result="OutOfMemory", moves=0, time=time.time() - t1)
+    except Exception:
+        job.update(result="Error", moves=0, time=time.time() - t1, error=traceback.format_exc())
+
+    job["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    job["stats"] = stats.as_dict()
+    connection.send(job)
+    connection.close()
+
+
+"""
+    Reads the peak resident set size of a running process (Linux only), so killed workers still report memory.
+"""
+def read_peak_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def run_benchmark(map_paths, solver_modes=None, workers=None, memory_limit_mb=None, verbose=False, time_limit=None,
+                  profile_dir=None):
+    """
+    Runs every (map, solver) pair in its own worker process, 'workers' at a time (one per CPU by default).
+
+    Solvers only check their time limit cooperatively, so a worker that is still running KILL_GRACE_PERIOD
+    seconds after its time limit ('time_limit' if given, else its TIME_LIMITS entry) is killed and reported
+    as "Killed". A worker that dies without reporting (e.g. killed by the OS for using too much memory) is
+    reported as "Crashed".
+
+    With 'profile_dir', every pair is profiled and writes <map>_<solver>.pstats, .collapsed and
+    .allocations.txt there (see core/solvers/profiler.py). Profiled solvers run several times slower, and a
+    killed worker writes no reports.
+
+    Returns:
+        list[dict]: One result per pair with keys map, algorithm, result, moves, time, time_limit,
+        peak_rss_mb, error and stats (SearchStats.as_dict(), None for killed workers), in the order the pairs
+        were given.
+    """
+    solver_modes = solver_modes or SOLVER_MODES
+    limits = {mode: time_limit or TIME_LIMITS[mode] for mode in solver_modes}
+    workers = workers or os.cpu_count() or 1
+    pending = [(file_path, mode) for file_path in map_paths for mode in solver_modes]
+    order = {job: i for i, job in enumerate(pending)}
+    pending.reverse()
+
+    running = {}
+    results = []
+    while pending or running:
+        while pending and len(running) < workers:
+            file_path, mode = pending.pop()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=run_job, args=(file_path, mode, limits[mode], sender, memory_limit_mb, verbose, profile_dir))
+            process.start()
+            sender.close()
+            running[process] = (file_path, mode, receiver, time.time(), 0.0)
+
+        time.sleep(0.05)
+        for process, (file_path, mode, receiver, started, peak) in list(running.items()):
+            elapsed = time.time() - started
+            peak = max(peak, read_peak_rss_mb(process.pid) or 0.0)
+            running[process] = (file_path, mode, receiver, started, peak)
+
+            job = None
+            if receiver.poll():
+                try:
+                    job = receiver.recv()
+                except EOFError:
+                    job = None
+            if job is None and process.is_alive() and elapsed <= limits[mode] + KILL_GRACE_PERIOD:
+                continue
+
+            if job is None:
+                result = "Killed" if process.is_alive() else "Crashed"
+                if process.is_alive():
+                    process.terminate()
+                    process.join(1)
+                    if process.is_alive():
+                        process.kill()
+                job = {"map": file_path, "algorithm": mode, "result": result, "moves": 0, "time": elapsed,
+                       "time_limit": limits[mode], "peak_rss_mb": peak or None,
+                       "error": None if result == "Killed" else f"exit code {process.exitcode}", "stats": None}
+
+            process.join()
+            receiver.close()
+            del running[process]
+            results.append(job)
+            print(f"[{len(results)}/{len(order)}] {os.path.basename(file_path)} {mode}: {job['result']} "
+                  f"({job['time']:.2f}s)")
+
+    results.sort(key=lambda job: order[(job["map"], job["algorithm"])])
+    return results
+
+
+"""
+    Writes benchmark results to 'output_dir' as benchmark.json and benchmark.csv.
+"""
+def write_results(results, output_dir=BENCHMARK_OUTPUT_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "benchmark.json"), "w") as f:
+        json.dump(results, f, indent=2)
+
+    fields = ["map", "algorithm", "result", "moves", "time", "time_limit", "peak_rss_mb", "error"] + STATS_FIELDS
+    with open(os.path.join(output_dir, "benchmark.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for job in results:
+            writer.writerow({**job, **(job.get("stats") or {})})
+    print(f"Results written to {output_dir}/benchmark.json and {output_dir}/benchmark.csv")
+
+    """ Anytime solvers (ARA*) report every improvement, so solution quality can be charted against time """
+    traces = [{"map": job["map"], "algorithm": job["algorithm"], **point}
+              for job in results for point in job.get("trace") or []]
+    if traces:
+        with open(os.path.join(output_dir, "anytime_trace.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["map", "algorithm", "time", "weight", "cost", "bound", "expanded"])
+            writer.writeheader()
+            writer.writerows(traces)
+        print(f"Anytime traces written to {output_dir}/anytime_trace.csv")
+
+
+"""
+    Prints benchmark results as one table per map, like run_all_tests.
+"""
+def print_results(results):
+    from tabulate import tabulate
+    for file_path in dict.fromkeys(job["map"] for job in results):
+        rows = []
+        for job in results:
+            if job["map"] != file_path:
+                continue
+            stats = job.get("stats") or {}
+            rows.append([job["algorithm"], f"{job['time']:.2f}", job["moves"], job["result"],
+                         "-" if job["peak_rss_mb"] is None else f"{job['peak_rss_mb']:.1f}",
+                         stats.get("nodes_expanded", "-"), stats.get("peak_frontier", "-"),
+                         f"{stats['states_per_second']:,.0f}" if stats else "-"])
+        print(f"Results on {os.path.splitext(os.path.basename(file_path))[0]}:")
+        print(tabulate(rows, headers=['Algorithm', 'Time', 'Numof Moves', 'Result', 'Peak RSS (MB)', 'Expanded',
+                                      'Peak Frontier', 'States/s'], tablefmt='fancy_grid'))
+        print()
+
+
+"""
+    Times serial A* against HDA* with every worker count in 'worker_counts' on each map, in this process,
+    and prints the speedups. HDA* is called directly because its time limit and worker count are not fixed.
+"""
+def run_speedup(map_paths, worker_counts, output_dir=BENCHMARK_OUTPUT_DIR):
+    from core.solvers.hda_star_solver import hda_star_solver
+    from tabulate import tabulate
+    rows = []
+    for file_path in map_paths:
+        is_wall, player, ghosts, snacks = MapLoader(file_path=file_path).load()
+        game = PacmanGame(player=player, ghosts=ghosts, snacks=snacks, is_wall=is_wall, move_direction="")
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            serial_moves, serial_time = run_solver(SOLVERS["A*"], game, timeout=TIME_LIMITS["A*"])
+        row = {"map": file_path, "serial_moves": classify_result(serial_moves)[1], "serial_time": serial_time}
+        for workers in worker_counts:
+            solver = lambda game, timeout, stats: hda_star_solver(game, workers=workers, timeout=timeout, stats=stats)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                moves, elapsed = run_solver(solver, game, timeout=TIME_LIMITS["HDA*"])
+            row[f"hda_{workers}_moves"] = classify_result(moves)[1]
+            row[f"hda_{workers}_time"] = elapsed
+            row[f"hda_{workers}_speedup"] = serial_time / elapsed if elapsed > 0 else None
+        rows.append(row)
+        print(f"{os.path.basename(file_path)}: A* {serial_time:.2f}s, " + ", ".join(
+            f"HDA* x{workers} {row[f'hda_{workers}_time']:.2f}s" for workers in worker_counts))
+
+    print(f"Speedup of HDA* over A* ({os.cpu_count()} CPUs):")
+    headers = ["Map", "A* Time", "Numof Moves"] + [f"HDA* x{workers}" for workers in worker_counts]
+    print(tabulate([[os.path.splitext(os.path.basename(row["map"]))[0], f"{row['serial_time']:.2f}", row["serial_moves"]]
+                    + [f"{row[f'hda_{workers}_time']:.2f}s ({row[f'hda_{workers}_speedup']:.2f}x)"
+                       for workers in worker_counts] for row in rows], headers=headers, tablefmt='fancy_grid'))
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "speedup.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["map"])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Speedups written to {output_dir}/speedup.csv")
+
+
+def natural_map_order(file_path):
+    return [int(text) if text.isdigit() else text for text in re.split(r'(\d+)', file_path)]
+
+
 """
     Calls 'run_test' on every test and prints the result of each one.
 """
-def run_all_tests():
+def run_all_tests(profile_dir=None, cache=None):
+    from tabulate import tabulate
     for i in range(1, 11):
-        result_df = run_test(file_path=f"./maps/map{i}.txt") 
+        result_df = run_test(file_path=f"./maps/map{i}.txt", profile_dir=profile_dir, cache=cache)
         print(f"Results on map{i}:")       
         print(tabulate(result_df, headers='keys', tablefmt='fancy_grid', showindex=False))
         print()
+    if cache is not None:
+        print(cache.summary())
 
 if __name__ == "__main__":
     from multiprocessing import freeze_support
     freeze_support()
-    run_all_tests()
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Run every solver on every map.")
+    parser.add_argument("--sequential", action="store_true", help="run everything in this process, one by one")
+    parser.add_argument("--maps", nargs="+", help="map files to run (default: maps/*.txt)")
+    parser.add_argument("--solvers", nargs="+", choices=SOLVER_MODES, help="solvers to run (default: all)")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--memory-limit", type=int, help="address space limit per worker, in MB")
+    parser.add_argument("--output-dir", default=BENCHMARK_OUTPUT_DIR, help="where to write JSON/CSV results")
+    parser.add_argument("--verbose", action="store_true", help="show the solvers' own output")
+    parser.add_argument("--speedup", type=int, nargs="+", metavar="WORKERS",
+                        help="time HDA* with these worker counts against A* instead of running the benchmark")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="with --sequential, search every map again instead of reading the solution cache")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile every run with cProfile and tracemalloc, reports go to <output-dir>/profiles")
+    args = parser.parse_args()
+    profile_dir = os.path.join(args.output_dir, "profiles") if args.profile else None
+
+    if args.sequential:
+        use_cache = SOLUTION_CACHE_DIR is not None and not args.no_cache
+        run_all_tests(profile_dir, SolutionCache(SOLUTION_CACHE_DIR, SOLUTION_CACHE_MAX_BYTES) if use_cache else None)
+    elif args.speedup:
+        map_paths = args.maps or sorted(glob.glob("./maps/*.txt"), key=natural_map_order)
+        run_speedup(map_paths, args.speedup, args.output_dir)
+    else:
+        map_paths = args.maps or sorted(glob.glob("./maps/*.txt"), key=natural_map_order)
+        results = run_benchmark(map_paths, args.solvers, args.workers, args.memory_limit, args.verbose,
+                                profile_dir=profile_dir)
+        print()
+        print_results(results)
+        write_results(results, args.output_dir)
+        if profile_dir is not None:
+            print(f"Profiles written to {profile_dir}")
\ No newline at end of file